@@ -10,12 +10,17 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 import os
 
 # Django Libraries
-from django.core.asgi import get_asgi_application
+import django
+
+# Project Libraries
+from base_app.handlers import StreamingASGIHandler
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.local")
 
-application = get_asgi_application()
+# As `get_asgi_application()`, with exports streamed off the event loop.
+django.setup(set_prefix=False)
+application = StreamingASGIHandler()
 
 # Import websocket application here, so apps from application are loaded first
 from base_app.websocket import websocket_application  # noqa isort:skip
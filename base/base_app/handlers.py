@@ -0,0 +1,50 @@
+"""ASGI handler streaming responses read from the database."""
+# Django Libraries
+from django.core.handlers.asgi import ASGIHandler
+
+# 3rd Party Libraries
+from asgiref.sync import sync_to_async
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """`ASGIHandler` iterating streaming responses off the event loop.
+
+    Django 4.1 iterates the content of a `StreamingHttpResponse` on the event
+    loop, where the ORM raises `SynchronousOnlyOperation`, after the headers
+    were already sent. Each part is read in the sync thread of the request
+    instead, the one the view ran in, so a cursor opened by the view keeps
+    its connection, and sent once it is ready.
+    """
+
+    async def send_response(self, response, send):
+        """Encode and send a response out over ASGI."""
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        headers = [
+            (header.encode("ascii"), value.encode("latin1"))
+            for header, value in response.items()
+        ]
+        for cookie in response.cookies.values():
+            headers.append(
+                (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+        # Access `__iter__` rather than `streaming_content`, like Django does.
+        parts = iter(response)
+        next_part = sync_to_async(next, thread_sensitive=True)
+        try:
+            while (part := await next_part(parts, None)) is not None:
+                for chunk, _ in self.chunk_bytes(part):
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+            await send({"type": "http.response.body"})
+        finally:
+            await sync_to_async(response.close, thread_sensitive=True)()
@@ -0,0 +1,93 @@
+"""Test for the ASGI application."""
+# Standard Library
+import csv
+import io
+
+from datetime import date
+
+# Django Libraries
+from django.test import TransactionTestCase
+
+# 3rd Party Libraries
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Project Libraries
+from base_app.asgi import app
+from weather.load_weather_data import OrmWeatherLoader
+
+
+RECORDS = [
+    ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+    ("USC00110072.txt", date(1985, 1, 2), -122, -217, 0),
+    ("USC00110187.txt", date(1985, 1, 1), 33, -33, 10),
+]
+
+
+# Requests are served in threads of their own, which only see committed data.
+class AsgiExportTests(TransactionTestCase):
+    """Test exports stream from the database under the ASGI application."""
+
+    def setUp(self):
+        OrmWeatherLoader().load(RECORDS)
+
+    async def get(self, path, query=""):
+        """Send a GET request to `app`, returning its status and body."""
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await app(
+            {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": query.encode(),
+                "headers": [(b"host", b"testserver")],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            },
+            receive,
+            send,
+        )
+        self.assertEqual(messages[0]["type"], "http.response.start")
+        self.assertFalse(messages[-1].get("more_body", False))
+        return messages[0]["status"], b"".join(
+            message.get("body", b"") for message in messages[1:]
+        )
+
+    async def test_csv_export(self):
+        """Test CSV exports are streamed through the ASGI handler"""
+        status, body = await self.get("/api/weather/export/", "format=csv")
+        self.assertEqual(status, 200)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(
+            [(row["weather_station"], row["max_temp"]) for row in rows],
+            [("00110072", "-2.2"), ("00110072", "-12.2"), ("00110187", "3.3")],
+        )
+
+        status, body = await self.get("/api/weather/stats/export/", "format=csv")
+        self.assertEqual(status, 200)
+        self.assertTrue(body.startswith(b"id,weather_station,year"))
+
+    async def test_columnar_export(self):
+        """Test Arrow and Parquet batches are read through the ASGI handler"""
+        status, body = await self.get("/api/weather/export/", "format=arrow")
+        self.assertEqual(status, 200)
+        table = pa.ipc.open_stream(body).read_all()
+        self.assertEqual(table.column("max_temp").to_pylist(), [-2.2, -12.2, 3.3])
+
+        status, body = await self.get(
+            "/api/weather/export/", "format=parquet&weather_station=00110187"
+        )
+        self.assertEqual(status, 200)
+        table = pq.read_table(io.BytesIO(body))
+        self.assertEqual(table.column("weather_station").to_pylist(), ["00110187"])
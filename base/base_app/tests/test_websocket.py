@@ -0,0 +1,180 @@
+"""Test for the websocket live feed."""
+# Standard Library
+import asyncio
+import json
+
+from datetime import date
+from unittest import mock
+
+# Django Libraries
+from django.db import DatabaseError
+from django.test import TestCase
+
+# Project Libraries
+from base_app.websocket import OVERFLOW_CLOSE_CODE, websocket_application
+from core.models import IngestBatch
+from weather.analyze_weather_data import rebuild_weather_stats
+from weather.live_feed import Subscription, weather_feed
+from weather.load_weather_data import OrmWeatherLoader
+from weather.serializer import WeatherDetailsValuesSerializer
+
+
+RECORDS = [
+    ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+    ("USC00110187.txt", date(1985, 1, 1), 33, -33, 10),
+]
+
+
+class WebsocketTestCase(TestCase):
+    async def connect(self):
+        """Run the websocket application, returning its input and output queues."""
+        received, sent = asyncio.Queue(), asyncio.Queue()
+        task = asyncio.create_task(
+            websocket_application({"path": "/ws/"}, received.get, sent.put)
+        )
+        await received.put({"type": "websocket.connect"})
+        self.assertEqual((await sent.get())["type"], "websocket.accept")
+        return received, sent, task
+
+
+class WebsocketFeedTests(WebsocketTestCase):
+    """Test subscriptions receive the new data of their stations only."""
+
+    def setUp(self):
+        OrmWeatherLoader().load(RECORDS)
+        rebuild_weather_stats()
+
+    async def test_subscription_feed(self):
+        """Test records and stats are pushed to subscribers of their stations"""
+        received, sent, task = await self.connect()
+        await received.put({"type": "websocket.receive", "text": "ping"})
+        self.assertEqual((await sent.get())["text"], "pong!")
+
+        message = {"type": "subscribe", "stations": ["00110072"]}
+        await received.put({"type": "websocket.receive", "text": json.dumps(message)})
+        reply = json.loads((await sent.get())["text"])
+        self.assertEqual(reply, {"type": "subscribed", "stations": ["00110072"]})
+
+        batch = (await IngestBatch.objects.alatest("id")).pk
+        await weather_feed.publish(
+            {
+                "type": "weather_details",
+                "batch": batch,
+                "stations": ["00110072", "00110187"],
+                "start": "1985-01-01",
+                "end": "1985-01-01",
+            }
+        )
+        message = json.loads((await sent.get())["text"])
+        self.assertEqual(message["type"], "weather_details")
+        self.assertEqual(
+            [record["weather_station"] for record in message["records"]], ["00110072"]
+        )
+
+        await weather_feed.publish(
+            {"type": "weather_stats", "generation": 1, "stations": None}
+        )
+        message = json.loads((await sent.get())["text"])
+        self.assertEqual(message["stats"][0]["max_temp_avg"], -2.2)
+
+        await received.put({"type": "websocket.disconnect"})
+        await task
+        self.assertFalse(weather_feed.subscriptions)
+
+    async def test_slow_client_overflow(self):
+        """Test a full queue drops the client instead of blocking the feed"""
+        subscription = Subscription(["00110072"], queue_size=2)
+        for index in range(3):
+            subscription.push({"type": "weather_details", "records": [index]})
+        self.assertTrue(subscription.overflowed)
+        self.assertIsNone(subscription.queue.get_nowait())
+
+        received, sent, task = await self.connect()
+        (subscription,) = weather_feed.subscriptions
+        subscription.push(None)
+        self.assertEqual(json.loads((await sent.get())["text"])["type"], "overflow")
+        self.assertEqual((await sent.get())["code"], OVERFLOW_CLOSE_CODE)
+        await received.put({"type": "websocket.disconnect"})
+        await task
+
+
+class WebsocketQueryTests(WebsocketTestCase):
+    """Test queries stream their results in chunks, as credits allow."""
+
+    def setUp(self):
+        OrmWeatherLoader().load(
+            [
+                ("USC00110072.txt", date(1985, 1, day), -22, -128, 94)
+                for day in (1, 2, 3)
+            ]
+            + RECORDS[1:]
+        )
+
+    async def request(self, received, sent, message):
+        await received.put({"type": "websocket.receive", "text": json.dumps(message)})
+        return json.loads((await sent.get())["text"])
+
+    async def test_query_chunks(self):
+        """Test chunks are only sent for granted credits, until done"""
+        received, sent, task = await self.connect()
+        query = {
+            "type": "query",
+            "id": "q1",
+            "filters": {"weather_station": "00110072"},
+            "chunk_size": 2,
+        }
+        chunk = await self.request(received, sent, query)
+        self.assertEqual((chunk["type"], chunk["seq"]), ("chunk", 0))
+        self.assertEqual(
+            [record["record_date"] for record in chunk["records"]],
+            ["1985-01-01", "1985-01-02"],
+        )
+        self.assertTrue(sent.empty())
+
+        credit = {"type": "credit", "id": "q1", "credits": 5}
+        chunk = await self.request(received, sent, credit)
+        self.assertEqual(len(chunk["records"]), 1)
+        self.assertEqual(
+            json.loads((await sent.get())["text"]),
+            {"type": "done", "id": "q1", "records": 3},
+        )
+        await received.put({"type": "websocket.disconnect"})
+        await task
+
+    async def test_query_errors_and_cancel(self):
+        """Test invalid filters are reported and queries can be cancelled"""
+        received, sent, task = await self.connect()
+        query = {"type": "query", "id": 1, "filters": {"record_date": "x"}}
+        error = await self.request(received, sent, query)
+        self.assertEqual(
+            (error["type"], list(error["detail"])), ("error", ["record_date"])
+        )
+
+        chunk = await self.request(
+            received, sent, {**query, "filters": {}, "chunk_size": 1}
+        )
+        self.assertEqual(chunk["seq"], 0)
+        cancelled = await self.request(received, sent, {"type": "cancel", "id": 1})
+        self.assertEqual(cancelled, {"type": "cancelled", "id": 1})
+        error = await self.request(received, sent, {"type": "credit", "id": 1})
+        self.assertEqual(error["detail"], {"id": "Unknown query."})
+        await received.put({"type": "websocket.disconnect"})
+        await task
+
+    async def test_query_failure(self):
+        """Test a query failing mid-stream reports an error to the client"""
+        received, sent, task = await self.connect()
+        query = {"type": "query", "id": "q1", "chunk_size": 1, "credits": 2}
+        with mock.patch.object(
+            WeatherDetailsValuesSerializer,
+            "to_representation",
+            side_effect=[[{"id": 1}], DatabaseError("connection lost")],
+        ):
+            chunk = await self.request(received, sent, query)
+            self.assertEqual(chunk["records"], [{"id": 1}])
+            error = json.loads((await sent.get())["text"])
+        self.assertEqual(
+            error, {"type": "error", "id": "q1", "detail": "Query failed."}
+        )
+        await received.put({"type": "websocket.disconnect"})
+        await task
@@ -1,14 +1,102 @@
-async def websocket_application(scope, receive, send):
+"""Websocket subscriptions to the live feed of weather records and stats.
+
+Clients send JSON messages:
+    1. `{"type": "subscribe", "stations": ["00110072", ...]}`: Follow stations.
+    2. `{"type": "unsubscribe", "stations": [...]}`: Stop following them.
+    3. `{"type": "query", "id": ..., "filters": {...}}`: Stream the records
+       matching the filters in chunks, see `weather.query_stream`.
+    4. `{"type": "credit", "id": ..., "credits": n}`: Allow n more chunks.
+    5. `{"type": "cancel", "id": ...}`: Stop a query.
+
+and receive `{"type": "weather_details", "records": [...]}` and
+`{"type": "weather_stats", "stats": [...]}` as new data is committed, in the
+representation of the REST API. `ping` is still answered with `pong!`.
+"""
+# Standard Library
+import asyncio
+import json
+import logging
+
+from functools import partial
+
+# Project Libraries
+from weather.live_feed import Subscription, weather_feed
+from weather.query_stream import QuerySession
+from weather.renderers import ORJSONRenderer
+
+
+logger = logging.getLogger("corteva_api")
+
+# Close code sent to clients dropped for not keeping up with the feed.
+OVERFLOW_CLOSE_CODE = 1013
+# Messages are rendered as the JSON responses of the REST API.
+renderer = ORJSONRenderer()
+
+
+async def send_json(send, message):
+    text = renderer.render(message).decode()
+    await send({"type": "websocket.send", "text": text})
+
+
+async def forward(subscription, send):
+    """Send the queued messages of `subscription` until it overflows."""
     while True:
-        print(f"Got this {scope}")
-        event = await receive()
+        message = await subscription.queue.get()
+        if message is None:
+            await send_json(send, {"type": "overflow"})
+            await send({"type": "websocket.close", "code": OVERFLOW_CLOSE_CODE})
+            return
+        await send_json(send, message)
+
+
+async def receive_message(subscription, queries, text, send):
+    """Handle a text message of the client."""
+    if text == "ping":
+        await send({"type": "websocket.send", "text": "pong!"})
+        return
+    try:
+        message = json.loads(text)
+        action = message["type"]
+        if action in ("query", "credit", "cancel"):
+            await queries.handle(message)
+            return
+        stations = message["stations"]
+        if action not in ("subscribe", "unsubscribe") or not isinstance(stations, list):
+            raise ValueError(action)
+    except (TypeError, ValueError, KeyError):
+        await send_json(send, {"type": "error", "detail": "Invalid message."})
+        return
+    if action == "subscribe":
+        subscription.stations.update(map(str, stations))
+        weather_feed.start()
+    else:
+        subscription.stations.difference_update(map(str, stations))
+    await send_json(
+        send, {"type": "subscribed", "stations": sorted(subscription.stations)}
+    )
+
+
+async def websocket_application(scope, receive, send):
+    subscription = Subscription()
+    queries = QuerySession(partial(send_json, send))
+    sender = None
+    weather_feed.subscribe(subscription)
+    try:
+        while True:
+            event = await receive()
+            logger.debug("Websocket event %s on %s", event["type"], scope["path"])
 
-        if event["type"] == "websocket.connect":
-            await send({"type": "websocket.accept"})
+            if event["type"] == "websocket.connect":
+                await send({"type": "websocket.accept"})
+                sender = asyncio.create_task(forward(subscription, send))
 
-        if event["type"] == "websocket.disconnect":
-            break
+            if event["type"] == "websocket.disconnect":
+                break
 
-        if event["type"] == "websocket.receive":
-            if event["text"] == "ping":
-                await send({"type": "websocket.send", "text": "pong!"})
+            if event["type"] == "websocket.receive" and event.get("text"):
+                await receive_message(subscription, queries, event["text"], send)
+    finally:
+        weather_feed.unsubscribe(subscription)
+        await queries.close()
+        if sender is not None:
+            sender.cancel()
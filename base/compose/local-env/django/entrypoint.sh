@@ -11,4 +11,5 @@ python manage.py makemigrations
 python manage.py migrate
 python manage.py ingest_weather_data
 python manage.py analyze_weather
+python manage.py ingest_yield_data
 python manage.py runserver 0.0.0.0:8000
@@ -6,11 +6,18 @@ import time
 from datetime import timedelta
 
 # Django Libraries
-from django.core.management.base import BaseCommand
-from django.db.models import Avg, Max, Min, Sum
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 
 # Project Libraries
-from core.models import WeatherDetails, WeatherStats
+from core.models import CropYield, MaterializedWeatherStats, WeatherDetails
+from weather.analyze_weather_data import (
+    rebuild_weather_stats,
+    refresh_materialized_weather_stats,
+    refresh_weather_stats,
+)
+from weather.cache import bump_generation
+from weather.crop_yield_data import compute_yield_correlations
 
 
 logger = logging.getLogger("corteva_api")
@@ -20,63 +27,39 @@ logger.setLevel("INFO")
 class Command(BaseCommand):
     """Django command to populate the `WeatherStats` model on first boot."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only recompute station-years with new or changed records.",
+        )
+        parser.add_argument(
+            "--materialized-view",
+            action="store_true",
+            help="Refresh the PostgreSQL materialized view instead of the table.",
+        )
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
-        if WeatherDetails.objects.count():
+        if WeatherDetails.objects.exists():
             logger.info("Populating WeatherStats ......")
             start_time = time.monotonic()
 
-            start_year = WeatherDetails.objects.aggregate(Min("record_date"))[
-                "record_date__min"
-            ].year
-            end_year = WeatherDetails.objects.aggregate(Max("record_date"))[
-                "record_date__max"
-            ].year
-
-            objs = []
-
-            for station in (
-                _.get("weather_station")
-                for _ in WeatherDetails.objects.distinct("weather_station").values(
-                    "weather_station"
+            if options["materialized_view"]:
+                if connection.vendor != "postgresql":
+                    raise CommandError("Materialized view requires PostgreSQL.")
+                refresh_materialized_weather_stats()
+            elif options["incremental"]:
+                refresh_weather_stats()
+            else:
+                rebuild_weather_stats()
+            if CropYield.objects.exists():
+                compute_yield_correlations(
+                    MaterializedWeatherStats.objects.all()
+                    if options["materialized_view"]
+                    else None
                 )
-            ):
-                for year in range(start_year, end_year + 1):
-                    avg_max_temp = (
-                        WeatherDetails.objects.filter(
-                            weather_station=station, record_date__year=year
-                        )
-                        .exclude(max_temp=-9999)
-                        .aggregate(Avg("max_temp"))
-                        .get("max_temp__avg")
-                    )
-                    avg_min_temp = (
-                        WeatherDetails.objects.filter(
-                            weather_station=station, record_date__year=year
-                        )
-                        .exclude(min_temp=-9999)
-                        .aggregate(Avg("min_temp"))
-                        .get("min_temp__avg")
-                    )
-                    total_precip = (
-                        WeatherDetails.objects.filter(
-                            weather_station=station, record_date__year=year
-                        )
-                        .exclude(precip=-9999)
-                        .aggregate(Sum("precip"))
-                        .get("precip__sum")
-                    )
-                    objs.append(
-                        WeatherStats(
-                            weather_station=station,
-                            max_temp_avg=avg_max_temp,
-                            min_temp_avg=avg_min_temp,
-                            total_precip=total_precip,
-                            year=year,
-                        )
-                    )
-            WeatherStats.objects.all().delete()
-            WeatherStats.objects.bulk_create(objs, batch_size=1000)
+            bump_generation()
 
             end_time = time.monotonic()
             logger.info("Success................")
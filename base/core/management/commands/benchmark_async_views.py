@@ -0,0 +1,131 @@
+"""Django command to benchmark the async weather views against the DRF views."""
+# Standard Library
+import asyncio
+import logging
+import time
+import uuid
+
+# Django Libraries
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+# 3rd Party Libraries
+from rest_framework.settings import api_settings
+
+# Project Libraries
+from core.models import WeatherDetails
+
+
+logger = logging.getLogger("corteva_api")
+logger.setLevel("INFO")
+
+# Url names of the sync view and of its async counterpart, by endpoint.
+ENDPOINTS = {
+    "weather": ("weather:index", "weather:index_async"),
+    "stats": ("weather:weather_stats", "weather:weather_stats_async"),
+}
+
+
+def percentile(timings, fraction):
+    """Return the `fraction` percentile of sorted `timings`."""
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the async weather views against the DRF views.
+
+    Sends requests through the ASGI handler, as uvicorn does, with a growing
+    number of concurrent clients, and compares requests per second and p99
+    latency of the sync views, run in the sync-to-async thread, with the
+    native async views. Each request asks for another page, so responses are
+    read from the database rather than the response cache.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 10, 50, 100],
+            help="Concurrent clients to benchmark.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests sent per concurrency level.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Page size of the weather requests.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            choices=sorted(ENDPOINTS),
+            nargs="+",
+            default=sorted(ENDPOINTS, reverse=True),
+            help="Endpoints to benchmark.",
+        )
+
+    @staticmethod
+    async def run(url, params, concurrency, total):
+        """Send `total` requests with `concurrency` clients.
+
+        Returns:
+            :tuple: Wall time and sorted latencies of the requests, in seconds.
+        """
+        client, timings = AsyncClient(), []
+        semaphore = asyncio.Semaphore(concurrency)
+        # A query parameter unique to the run misses the responses cached by
+        # earlier runs, without evicting anything else from the shared cache.
+        params = {**params, "benchmark": uuid.uuid4().hex}
+        first = await client.get(url, params)
+        if first.status_code != 200:
+            raise CommandError(f"{url} returned {first.status_code}.")
+        page_size = params.get("page_size", api_settings.PAGE_SIZE)
+        pages = max(1, -(-first.json()["count"] // page_size))
+
+        async def request(page):
+            async with semaphore:
+                start_time = time.perf_counter()
+                response = await client.get(url, {**params, "page": page})
+                timings.append(time.perf_counter() - start_time)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}.")
+
+        start_time = time.perf_counter()
+        # Distinct pages miss the response cache, as long as there are enough.
+        await asyncio.gather(*(request(1 + index % pages) for index in range(total)))
+        return time.perf_counter() - start_time, sorted(timings)
+
+    # Requests of the test client are sent to `testserver`.
+    @override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"])
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if not WeatherDetails.objects.exists():
+            raise CommandError("Weather Data doesn't exists!, run ingest_weather_data.")
+
+        self.stdout.write(
+            f"{'endpoint':<10}{'view':>6}{'clients':>9}"
+            f"{'requests/s':>12}{'p50 ms':>9}{'p99 ms':>9}"
+        )
+        total = options["requests"]
+        for endpoint in options["endpoint"]:
+            params = (
+                {"page_size": options["page_size"]} if endpoint == "weather" else {}
+            )
+            for concurrency in options["concurrency"]:
+                for view, name in zip(("sync", "async"), ENDPOINTS[endpoint]):
+                    wall_time, timings = asyncio.run(
+                        self.run(reverse(name), params, concurrency, total)
+                    )
+                    self.stdout.write(
+                        f"{endpoint:<10}{view:>6}{concurrency:>9}"
+                        f"{total / wall_time:>12,.0f}"
+                        f"{percentile(timings, 0.5) * 1000:>9.1f}"
+                        f"{percentile(timings, 0.99) * 1000:>9.1f}"
+                    )
@@ -0,0 +1,139 @@
+"""Django command to benchmark the serialization of the weather list endpoints."""
+# Standard Library
+import logging
+import time
+
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+
+# 3rd Party Libraries
+from rest_framework.renderers import JSONRenderer
+
+# Project Libraries
+from core.models import WeatherDetails, WeatherStats
+from weather.renderers import ORJSONRenderer
+from weather.serializer import (
+    WeatherDetailsSerializer,
+    WeatherDetailsValuesSerializer,
+    WeatherStatsDetailsSerializer,
+    WeatherStatsValuesSerializer,
+)
+
+
+logger = logging.getLogger("corteva_api")
+logger.setLevel("INFO")
+
+ENDPOINTS = {
+    "weather": (
+        WeatherDetails.objects.select_related(
+            "station", "created_batch", "updated_batch"
+        ),
+        WeatherDetailsSerializer,
+        WeatherDetailsValuesSerializer,
+    ),
+    "stats": (
+        WeatherStats.objects.current(),
+        WeatherStatsDetailsSerializer,
+        WeatherStatsValuesSerializer,
+    ),
+}
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the serialization of the weather list endpoints.
+
+    Compares rows per second of `ModelSerializer` with `JSONRenderer` against
+    the `values_list` fast path with `ORJSONRenderer`, for one page of each
+    size read from the local database. The fast path can be narrowed to a
+    sparse fieldset with `--fields` and rendered as columns with `--shape`.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            type=int,
+            nargs="+",
+            default=[25, 1000, 10000],
+            help="Page sizes to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per page size, the fastest one is reported.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            choices=sorted(ENDPOINTS),
+            nargs="+",
+            default=sorted(ENDPOINTS, reverse=True),
+            help="Endpoints to benchmark.",
+        )
+        parser.add_argument(
+            "--fields",
+            nargs="+",
+            default=[],
+            help="Output fields of the fast path, as with `?fields=`.",
+        )
+        parser.add_argument(
+            "--shape",
+            choices=["records", "columns"],
+            default="records",
+            help="Response shape of the fast path, as with `?shape=`.",
+        )
+
+    @staticmethod
+    def best_time(func, repeat):
+        """Return the output and the fastest run time of `func`, in seconds."""
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            output = func()
+            timings.append(time.perf_counter() - start_time)
+        return output, min(timings)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if not WeatherDetails.objects.exists():
+            raise CommandError("Weather Data doesn't exists!, run ingest_weather_data.")
+
+        fields, shape = options["fields"], options["shape"]
+        self.stdout.write(
+            f"{'endpoint':<10}{'page size':>10}{'rows':>8}"
+            f"{'before rows/s':>16}{'after rows/s':>16}{'speedup':>10}"
+            f"{'before KiB':>12}{'after KiB':>12}"
+        )
+        for endpoint in options["endpoint"]:
+            queryset, serializer, values_serializer = ENDPOINTS[endpoint]
+            represent = (
+                values_serializer.to_columns
+                if shape == "columns"
+                else values_serializer.to_representation
+            )
+            for page_size in options["page_sizes"]:
+                before, before_time = self.best_time(
+                    lambda: JSONRenderer().render(
+                        serializer(queryset.all()[:page_size], many=True).data
+                    ),
+                    options["repeat"],
+                )
+                after, after_time = self.best_time(
+                    lambda: ORJSONRenderer().render(
+                        represent(
+                            values_serializer.values_list(queryset.all(), fields)[
+                                :page_size
+                            ],
+                            fields,
+                        )
+                    ),
+                    options["repeat"],
+                )
+                if not fields and shape == "records" and before != after:
+                    raise CommandError(f"Fast path output differs for {endpoint}.")
+                rows = min(page_size, queryset.count())
+                self.stdout.write(
+                    f"{endpoint:<10}{page_size:>10}{rows:>8}"
+                    f"{rows / before_time:>16,.0f}{rows / after_time:>16,.0f}"
+                    f"{before_time / after_time:>9.1f}x"
+                    f"{len(before) / 1024:>12,.1f}{len(after) / 1024:>12,.1f}"
+                )
@@ -12,8 +12,16 @@ from django.core.management.base import BaseCommand
 from tqdm import tqdm
 
 # Project Libraries
-from core.models import WeatherDetails
-from weather.process_weather_data import prepare_weather_records
+from weather.cache import bump_generation
+from weather.ingest_manifest import plan_ingestion
+from weather.load_weather_data import WEATHER_LOADERS, get_weather_loader
+from weather.process_weather_data import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MEMORY_BUDGET,
+    prepare_weather_records,
+    read_files,
+    stream_weather_records,
+)
 
 
 logger = logging.getLogger("corteva_api")
@@ -23,31 +31,86 @@ logger.setLevel("INFO")
 class Command(BaseCommand):
     """Django command to populate the `WeatherDetails` model on first boot."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            choices=["auto", *WEATHER_LOADERS],
+            default="auto",
+            help="Loader used to write records, `auto` picks `copy` on PostgreSQL.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Reload every file, ignoring the ingested files manifest.",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Write records batch by batch while the files are parsed.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Records per batch in streaming mode.",
+        )
+        parser.add_argument(
+            "--memory-budget",
+            type=int,
+            default=DEFAULT_MEMORY_BUDGET,
+            help="Memory (in MB) for batches in flight in streaming mode.",
+        )
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
         logger.info("Populating WeatherDetails ......")
         start_time = time.monotonic()
-        all_station_data = prepare_weather_records()
-        objs = []
-        for station in tqdm(
-            all_station_data,
-            total=len(all_station_data),
-            desc="Ingesting data.",
-        ):
-            for record in station:
-                file_name, r_date, max_t, min_t, precip = record
-                file_name = file_name.strip(".txt").strip("USC")
-                objs.append(
-                    WeatherDetails(
-                        weather_station=file_name,
-                        record_date=r_date,
-                        max_temp=max_t,
-                        min_temp=min_t,
-                        precip=precip,
-                    )
+        loader = get_weather_loader(options["backend"])
+        logger.info(f"Using {loader.name} loader")
+        plan = plan_ingestion(read_files(), full=options["full"])
+        if options["stream"]:
+            total = self.stream(
+                loader, plan, options["batch_size"], options["memory_budget"]
+            )
+        else:
+            all_station_data = prepare_weather_records(
+                [file_slice for file_slice, _ in plan], tenths=True
+            )
+            total = loader.load(
+                record
+                for station in tqdm(
+                    all_station_data,
+                    total=len(all_station_data),
+                    desc="Ingesting data.",
                 )
-
-        WeatherDetails.objects.bulk_create(objs, batch_size=1000, ignore_conflicts=True)
+                for record in station
+            )
+            for _, entry in plan:
+                entry.save()
+        # Cached responses and ETags stay valid when every file was skipped.
+        if total:
+            bump_generation()
         end_time = time.monotonic()
-        logger.info("Success................")
+        logger.info(f"Success, loaded {total} records................")
         logger.info("time taken %s" % timedelta(seconds=end_time - start_time))
+
+    @staticmethod
+    def stream(loader, plan, batch_size, memory_budget):
+        """Flush each batch of records to the database as soon as it is parsed.
+
+        The manifest entry of a file is saved once its last batch is written.
+        """
+        entries = {file_slice.file_path: entry for file_slice, entry in plan}
+        total = 0
+        with tqdm(total=len(plan), desc="Ingesting data.") as progress:
+            for batch in stream_weather_records(
+                [file_slice for file_slice, _ in plan],
+                batch_size=batch_size,
+                memory_budget=memory_budget,
+                tenths=True,
+            ):
+                total += loader.load(batch.records)
+                if batch.last:
+                    entries[batch.file_path].save()
+                    progress.update()
+        return total
@@ -0,0 +1,50 @@
+"""Django command to populate the `CropYield` model on first boot."""
+# Standard Library
+import logging
+import time
+
+from datetime import timedelta
+
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+
+# Project Libraries
+from weather.cache import bump_generation
+from weather.crop_yield_data import (
+    compute_yield_correlations,
+    load_crop_yield,
+    parse_yield_file,
+    read_yield_file,
+)
+
+
+logger = logging.getLogger("corteva_api")
+logger.setLevel("INFO")
+
+
+class Command(BaseCommand):
+    """Django command to populate the `CropYield` model on first boot."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=None,
+            help="Yield file to load, defaults to `yld_data/US_corn_grain_yield.txt`.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        file_path = options["file"] or read_yield_file()
+        if file_path is None:
+            raise CommandError("Yield data doesn't exists!")
+        logger.info("Populating CropYield ......")
+        start_time = time.monotonic()
+
+        total = load_crop_yield(parse_yield_file(file_path))
+        logger.info(f"Loaded {total} yearly yields")
+        compute_yield_correlations()
+        bump_generation()
+
+        end_time = time.monotonic()
+        logger.info("Success................")
+        logger.info("time taken %s" % timedelta(seconds=end_time - start_time))
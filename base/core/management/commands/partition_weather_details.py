@@ -0,0 +1,89 @@
+"""Django command to manage the yearly partitions of the `WeatherDetails` table."""
+# Standard Library
+import logging
+
+# Django Libraries
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+# Project Libraries
+from weather.cache import bump_generation
+from weather.partition_weather_data import (
+    PARTITION_INTERVALS,
+    create_weather_partitions,
+    detach_weather_partition,
+    is_partitioned,
+    partition_weather_details,
+)
+
+
+logger = logging.getLogger("corteva_api")
+logger.setLevel("INFO")
+
+
+class Command(BaseCommand):
+    """Django command to manage the yearly partitions of the `WeatherDetails` table.
+
+    By default partitions are created ahead of time for the coming years, so
+    new records never land in the default partition.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=sorted(PARTITION_INTERVALS),
+            default=settings.WEATHER_DETAILS_PARTITION or "year",
+            help="Years covered by each partition.",
+        )
+        parser.add_argument(
+            "--years-ahead",
+            type=int,
+            default=1,
+            help="Create partitions up to this many years after the current one.",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the table into a partitioned table first.",
+        )
+        parser.add_argument(
+            "--detach",
+            type=int,
+            metavar="YEAR",
+            help="Detach the partition holding this year instead.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the detached partition as well.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning requires PostgreSQL.")
+        interval = options["interval"]
+        if options["convert"] and not is_partitioned():
+            with connection.schema_editor() as schema_editor:
+                partition_weather_details(schema_editor, interval=interval)
+        if not is_partitioned():
+            raise CommandError(
+                "WeatherDetails is not partitioned, run with --convert first."
+            )
+
+        if options["detach"] is not None:
+            try:
+                detach_weather_partition(
+                    options["detach"], interval, drop=options["drop"]
+                )
+            except ValueError as exc:
+                raise CommandError(exc)
+            bump_generation()
+        else:
+            this_year = timezone.now().year
+            create_weather_partitions(
+                this_year, this_year + options["years_ahead"], interval
+            )
+        logger.info("Success................")
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_path', models.CharField(help_text='Weather record file path.', max_length=255, unique=True)),
+                ('size', models.BigIntegerField(help_text='File size (in bytes).')),
+                ('mtime', models.FloatField(help_text='File modification time (in seconds).')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the ingested content.', max_length=64)),
+                ('offset', models.BigIntegerField(help_text='Byte offset ingested up to.')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on.')),
+                ('last_updated', models.DateTimeField(auto_now=True, verbose_name='Last updated.')),
+            ],
+            options={
+                'ordering': ['file_path'],
+            },
+        ),
+    ]
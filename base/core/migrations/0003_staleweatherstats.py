@@ -0,0 +1,29 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_ingestedfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleWeatherStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weather_station', models.CharField(help_text='Station ID.', max_length=40)),
+                ('year', models.IntegerField(help_text='Year with new or changed records.')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on.')),
+            ],
+            options={
+                'ordering': ['weather_station', 'year'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='staleweatherstats',
+            constraint=models.UniqueConstraint(fields=('weather_station', 'year'), name='Stale stats by station and year.'),
+        ),
+    ]
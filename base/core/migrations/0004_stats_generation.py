@@ -0,0 +1,38 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_staleweatherstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Dataset name.', max_length=40, unique=True)),
+                ('generation', models.PositiveIntegerField(default=0, help_text='Generation readers are served.')),
+                ('last_updated', models.DateTimeField(auto_now=True, verbose_name='Last updated.')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name='weatherstats',
+            name='Valid Stats by station, record and weather details.',
+        ),
+        migrations.AddField(
+            model_name='weatherstats',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, help_text='Rebuild generation of the stats.'),
+        ),
+        migrations.AddConstraint(
+            model_name='weatherstats',
+            constraint=models.UniqueConstraint(fields=('weather_station', 'year', 'generation'), name='Valid Stats by station, year and generation.'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:53
+
+from django.db import migrations, models
+
+
+CREATE_MATERIALIZED_VIEW = """
+CREATE MATERIALIZED VIEW core_weatherstats_mv AS
+WITH stats AS (
+    SELECT
+        weather_station,
+        EXTRACT(YEAR FROM record_date)::integer AS year,
+        AVG(max_temp) FILTER (WHERE max_temp <> -999.9) AS max_temp_avg,
+        AVG(min_temp) FILTER (WHERE min_temp <> -999.9) AS min_temp_avg,
+        SUM(precip) FILTER (WHERE precip <> -999.9) AS total_precip
+    FROM core_weatherdetails
+    GROUP BY 1, 2
+),
+stations AS (SELECT DISTINCT weather_station FROM stats),
+years AS (SELECT generate_series(MIN(year), MAX(year)) AS year FROM stats)
+SELECT
+    row_number() OVER (ORDER BY stations.weather_station, years.year) AS id,
+    stations.weather_station,
+    years.year,
+    stats.max_temp_avg,
+    stats.min_temp_avg,
+    stats.total_precip,
+    now() AS created_on,
+    now() AS last_updated
+FROM stations
+CROSS JOIN years
+LEFT JOIN stats
+    ON stats.weather_station = stations.weather_station AND stats.year = years.year
+WITH DATA;
+CREATE UNIQUE INDEX core_weatherstats_mv_station_year
+    ON core_weatherstats_mv (weather_station, year);
+"""
+
+DROP_MATERIALIZED_VIEW = "DROP MATERIALIZED VIEW IF EXISTS core_weatherstats_mv;"
+
+
+def create_materialized_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_MATERIALIZED_VIEW)
+
+
+def drop_materialized_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_MATERIALIZED_VIEW)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_stats_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterializedWeatherStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weather_station', models.CharField(help_text='Station ID.', max_length=40)),
+                ('year', models.IntegerField(help_text='Stats done this year.')),
+                ('max_temp_avg', models.FloatField(help_text='Avg max temp (in °C).', null=True)),
+                ('min_temp_avg', models.FloatField(help_text='Avg min temp (in °C).', null=True)),
+                ('total_precip', models.FloatField(help_text='Total precip (in cm).', null=True)),
+                ('created_on', models.DateTimeField(verbose_name='Created on.')),
+                ('last_updated', models.DateTimeField(verbose_name='Last updated.')),
+            ],
+            options={
+                'db_table': 'core_weatherstats_mv',
+                'ordering': ['weather_station', 'year'],
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_materialized_view, drop_materialized_view),
+    ]
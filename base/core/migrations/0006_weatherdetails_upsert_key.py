@@ -0,0 +1,49 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:54
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_records(apps, schema_editor):
+    """Keep only the latest record for each station and day."""
+    WeatherDetails = apps.get_model("core", "WeatherDetails")
+    manager = WeatherDetails.objects.using(schema_editor.connection.alias)
+    duplicates = (
+        manager.order_by()
+        .values("weather_station", "record_date")
+        .annotate(records=Count("id"), latest=Max("id"))
+        .filter(records__gt=1)
+    )
+    for duplicate in list(duplicates):
+        manager.filter(
+            weather_station=duplicate["weather_station"],
+            record_date=duplicate["record_date"],
+            id__lt=duplicate["latest"],
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_weatherstats_materialized_view'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='weatherdetails',
+            options={'ordering': ['weather_station', 'record_date']},
+        ),
+        migrations.RemoveConstraint(
+            model_name='weatherdetails',
+            name='Valid record by station, record and weather details.',
+        ),
+        migrations.AddIndex(
+            model_name='weatherdetails',
+            index=models.Index(fields=['record_date', 'weather_station'], include=('id', 'max_temp', 'min_temp', 'precip'), name='weather_date_station_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_records, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='weatherdetails',
+            constraint=models.UniqueConstraint(fields=('weather_station', 'record_date'), include=('id', 'max_temp', 'min_temp', 'precip'), name='Valid record by station and record date.'),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:56
+
+from django.db import migrations, models
+from django.db.models import F, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Round
+import django.db.models.deletion
+
+
+def drop_materialized_view(apps, schema_editor):
+    # The view reads the columns being replaced, it is recreated by 0008.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP MATERIALIZED VIEW IF EXISTS core_weatherstats_mv;")
+
+
+def populate_compact_columns(apps, schema_editor):
+    """Fill station keys, integer tenths and audit batches of stored records."""
+    WeatherDetails = apps.get_model("core", "WeatherDetails")
+    Station = apps.get_model("core", "Station")
+    IngestBatch = apps.get_model("core", "IngestBatch")
+    alias = schema_editor.connection.alias
+    details = WeatherDetails.objects.using(alias)
+    if not details.exists():
+        return
+
+    codes = details.order_by("weather_station").values_list(
+        "weather_station", flat=True
+    ).distinct()
+    Station.objects.using(alias).bulk_create([Station(code=code) for code in codes])
+
+    bounds = details.aggregate(created=Min("created_on"), updated=Max("last_updated"))
+    created, updated = (
+        IngestBatch.objects.using(alias).create(),
+        IngestBatch.objects.using(alias).create(),
+    )
+    IngestBatch.objects.using(alias).filter(pk=created.pk).update(
+        created_on=bounds["created"]
+    )
+    IngestBatch.objects.using(alias).filter(pk=updated.pk).update(
+        created_on=bounds["updated"]
+    )
+
+    details.update(
+        station=Subquery(
+            Station.objects.using(alias)
+            .filter(code=OuterRef("weather_station"))
+            .values("id")[:1]
+        ),
+        created_batch=created,
+        updated_batch=updated,
+        max_temp=Round(F("max_temp") * 10),
+        min_temp=Round(F("min_temp") * 10),
+        precip=Round(F("precip") * 10),
+    )
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_weatherdetails_upsert_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_materialized_view, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='IngestBatch',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on.')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Station',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(help_text='Station ID.', max_length=40, unique=True)),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='weatherdetails',
+            name='created_batch',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.ingestbatch'),
+        ),
+        migrations.AddField(
+            model_name='weatherdetails',
+            name='station',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.station'),
+        ),
+        migrations.AddField(
+            model_name='weatherdetails',
+            name='updated_batch',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.ingestbatch'),
+        ),
+        migrations.RunPython(populate_compact_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 4.0.9 on 2026-10-18 09:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+CREATE_MATERIALIZED_VIEW = """
+CREATE MATERIALIZED VIEW core_weatherstats_mv AS
+WITH stats AS (
+    SELECT
+        station.code AS weather_station,
+        EXTRACT(YEAR FROM details.record_date)::integer AS year,
+        (AVG(details.max_temp) FILTER (WHERE details.max_temp <> -9999) / 10)::double precision
+            AS max_temp_avg,
+        (AVG(details.min_temp) FILTER (WHERE details.min_temp <> -9999) / 10)::double precision
+            AS min_temp_avg,
+        (SUM(details.precip) FILTER (WHERE details.precip <> -9999) / 10.0)::double precision
+            AS total_precip
+    FROM core_weatherdetails details
+    JOIN core_station station ON station.id = details.station_id
+    GROUP BY 1, 2
+),
+stations AS (SELECT DISTINCT weather_station FROM stats),
+years AS (SELECT generate_series(MIN(year), MAX(year)) AS year FROM stats)
+SELECT
+    row_number() OVER (ORDER BY stations.weather_station, years.year) AS id,
+    stations.weather_station,
+    years.year,
+    stats.max_temp_avg,
+    stats.min_temp_avg,
+    stats.total_precip,
+    now() AS created_on,
+    now() AS last_updated
+FROM stations
+CROSS JOIN years
+LEFT JOIN stats
+    ON stats.weather_station = stations.weather_station AND stats.year = years.year
+WITH DATA;
+CREATE UNIQUE INDEX core_weatherstats_mv_station_year
+    ON core_weatherstats_mv (weather_station, year);
+"""
+
+
+def create_materialized_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_MATERIALIZED_VIEW)
+
+
+def drop_materialized_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP MATERIALIZED VIEW IF EXISTS core_weatherstats_mv;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_compact_weather_details'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, drop_materialized_view),
+        migrations.AlterModelOptions(
+            name='weatherdetails',
+            options={'ordering': ['station_id', 'record_date']},
+        ),
+        migrations.RemoveConstraint(
+            model_name='weatherdetails',
+            name='Valid record by station and record date.',
+        ),
+        migrations.RemoveIndex(
+            model_name='weatherdetails',
+            name='weather_date_station_idx',
+        ),
+        migrations.RemoveField(
+            model_name='weatherdetails',
+            name='created_on',
+        ),
+        migrations.RemoveField(
+            model_name='weatherdetails',
+            name='last_updated',
+        ),
+        migrations.RemoveField(
+            model_name='weatherdetails',
+            name='weather_station',
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='created_batch',
+            field=models.ForeignKey(db_index=False, help_text='Batch which created the record.', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.ingestbatch'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='max_temp',
+            field=models.SmallIntegerField(help_text='Max temp (in 0.1°C).'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='min_temp',
+            field=models.SmallIntegerField(help_text='Min temp (in 0.1°C).'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='precip',
+            field=models.SmallIntegerField(help_text='Precipitation (in 0.1mm).'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='station',
+            field=models.ForeignKey(db_index=False, help_text='Station.', on_delete=django.db.models.deletion.PROTECT, related_name='weather_details', to='core.station'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdetails',
+            name='updated_batch',
+            field=models.ForeignKey(db_index=False, help_text='Batch which last updated the record.', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.ingestbatch'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdetails',
+            index=models.Index(fields=['record_date', 'station'], include=('id', 'max_temp', 'min_temp', 'precip'), name='weather_date_station_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='weatherdetails',
+            constraint=models.UniqueConstraint(fields=('station', 'record_date'), include=('id', 'max_temp', 'min_temp', 'precip'), name='Valid record by station and record date.'),
+        ),
+        migrations.RunPython(create_materialized_view, drop_materialized_view),
+    ]
@@ -0,0 +1,176 @@
+# Generated by Django 4.0.9 on 2026-10-18 10:12
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# The DDL helpers are frozen copies of `weather.partition_weather_data` as of
+# this migration, working on the historical model only, so later changes to
+# the application code or models never change what this migration does.
+
+PARTITION_INTERVALS = {"year": 1, "decade": 10}
+MATERIALIZED_VIEW = "core_weatherstats_mv"
+
+
+def partition_bounds(year, interval):
+    span = PARTITION_INTERVALS[interval]
+    start = year - year % span
+    return start, start + span
+
+
+def is_partitioned(connection, table):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s))",
+            [table],
+        )
+        return cursor.fetchone()[0]
+
+
+def create_partition(cursor, qn, table, start, end):
+    name, default = f"{table}_p{start}", f"{table}_default"
+    cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", [name, default])
+    exists, has_default = cursor.fetchone()
+    if exists:
+        return
+    cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)")
+    if has_default:
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(default)} "
+            "WHERE record_date >= %s AND record_date < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [f"{start:04d}-01-01", f"{end:04d}-01-01"],
+        )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+        f"FOR VALUES FROM ('{start:04d}-01-01') TO ('{end:04d}-01-01')"
+    )
+
+
+def drop_materialized_view(cursor, qn):
+    cursor.execute("SELECT to_regclass(%s)", [MATERIALIZED_VIEW])
+    if cursor.fetchone()[0] is None:
+        return []
+    cursor.execute("SELECT pg_get_viewdef(to_regclass(%s))", [MATERIALIZED_VIEW])
+    definition = cursor.fetchone()[0].strip().rstrip(";")
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s", [MATERIALIZED_VIEW]
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"DROP MATERIALIZED VIEW {qn(MATERIALIZED_VIEW)}")
+    return [f"CREATE MATERIALIZED VIEW {qn(MATERIALIZED_VIEW)} AS {definition}", *indexes]
+
+
+def rebuild_table(schema_editor, model, partition_by=None):
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    previous = f"{table}_previous"
+    pk = model._meta.pk.column
+    key = [pk, "record_date"] if partition_by else [pk]
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        views = drop_materialized_view(cursor, qn)
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(previous)}")
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')",
+            [previous],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {qn(previous)} DROP CONSTRAINT {qn(name)}")
+        for index in model._meta.indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {qn(index.name)}")
+
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(previous)} INCLUDING DEFAULTS "
+            "INCLUDING IDENTITY, "
+            f"PRIMARY KEY ({', '.join(map(qn, key))}))"
+            + (f" PARTITION BY RANGE ({qn('record_date')})" if partition_by else "")
+        )
+        for field in model._meta.concrete_fields:
+            if field.remote_field:
+                target = field.target_field
+                cursor.execute(
+                    f"ALTER TABLE {qn(table)} ADD CONSTRAINT "
+                    f"{qn(f'{table}_{field.column}_fk')} FOREIGN KEY "
+                    f"({qn(field.column)}) REFERENCES "
+                    f"{qn(target.model._meta.db_table)} ({qn(target.column)})"
+                    f"{connection.ops.deferrable_sql()}"
+                )
+        if partition_by:
+            cursor.execute(
+                f"CREATE TABLE {qn(f'{table}_default')} PARTITION OF {qn(table)} DEFAULT"
+            )
+            cursor.execute(
+                "SELECT EXTRACT(YEAR FROM MIN(record_date))::integer, "
+                f"EXTRACT(YEAR FROM MAX(record_date))::integer FROM {qn(previous)}"
+            )
+            first, last = cursor.fetchone()
+            this_year = timezone.now().year
+            for year in range(
+                partition_bounds(first or this_year, partition_by)[0],
+                max(last or this_year, this_year) + 2,
+                PARTITION_INTERVALS[partition_by],
+            ):
+                create_partition(cursor, qn, table, *partition_bounds(year, partition_by))
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(previous)}")
+        cursor.execute(
+            "SELECT pg_get_serial_sequence(%s, %s), attidentity <> '' "
+            "FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = %s",
+            [previous, pk, previous, pk],
+        )
+        sequence, identity = cursor.fetchone()
+        if sequence and identity:
+            cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, %s), %s, %s)",
+                [table, pk, *cursor.fetchone()],
+            )
+        elif sequence:
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.{qn(pk)}")
+        cursor.execute(f"DROP TABLE {qn(previous)}")
+
+    for constraint in model._meta.constraints:
+        schema_editor.add_constraint(model, constraint)
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        for statement in views:
+            cursor.execute(statement)
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+
+def partition_table(apps, schema_editor):
+    # Opt-in with `WEATHER_DETAILS_PARTITION`, see `partition_weather_details`.
+    interval = settings.WEATHER_DETAILS_PARTITION
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or not interval:
+        return
+    model = apps.get_model("core", "WeatherDetails")
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Unknown partition interval {interval!r}")
+    if not is_partitioned(connection, model._meta.db_table):
+        rebuild_table(schema_editor, model, partition_by=interval)
+
+
+def unpartition_table(apps, schema_editor):
+    model = apps.get_model("core", "WeatherDetails")
+    if is_partitioned(schema_editor.connection, model._meta.db_table):
+        rebuild_table(schema_editor, model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_compact_weather_details_schema'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.0.9 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+def create_view_index(apps, schema_editor):
+    # Year ranges across stations on the stats materialized view.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS core_weatherstats_mv_year_station "
+            "ON core_weatherstats_mv (year, weather_station);"
+        )
+
+
+def drop_view_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS core_weatherstats_mv_year_station;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_partition_weather_details'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weatherstats',
+            index=models.Index(fields=['generation', 'year', 'weather_station'], name='weather_stats_gen_year_idx'),
+        ),
+        migrations.RunPython(create_view_index, drop_view_index),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.1.13 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_weather_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CropYield",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.IntegerField(help_text="Harvest year.", unique=True)),
+                (
+                    "grain_yield",
+                    models.BigIntegerField(
+                        help_text="Corn grain yield (in 1000s of megatons)."
+                    ),
+                ),
+                (
+                    "created_on",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created on."),
+                ),
+                (
+                    "last_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="Last updated."),
+                ),
+            ],
+            options={
+                "ordering": ["year"],
+            },
+        ),
+        migrations.CreateModel(
+            name="YieldCorrelation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weather_station",
+                    models.CharField(help_text="Station ID.", max_length=40),
+                ),
+                (
+                    "years",
+                    models.IntegerField(help_text="Years with both stats and yield."),
+                ),
+                (
+                    "max_temp_avg",
+                    models.FloatField(
+                        help_text="Pearson correlation of the avg max temp and the yield.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "min_temp_avg",
+                    models.FloatField(
+                        help_text="Pearson correlation of the avg min temp and the yield.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "total_precip",
+                    models.FloatField(
+                        help_text="Pearson correlation of the total precip and the yield.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "last_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="Last updated."),
+                ),
+            ],
+            options={
+                "ordering": ["weather_station"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="yieldcorrelation",
+            constraint=models.UniqueConstraint(
+                fields=("weather_station",), name="Yield correlation by station."
+            ),
+        ),
+    ]
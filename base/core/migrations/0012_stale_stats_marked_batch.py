@@ -0,0 +1,26 @@
+# Generated by Django 4.1.13 on 2026-10-18 10:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_crop_yield"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="staleweatherstats",
+            name="marked_batch",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Batch which last marked the station-year as stale.",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.ingestbatch",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_stale_stats_marked_batch"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="datasetversion",
+            name="generation",
+            field=models.PositiveBigIntegerField(
+                default=0, help_text="Generation readers are served."
+            ),
+        ),
+    ]
@@ -1,5 +1,7 @@
 # Django Libraries
 from django.db import models
+from django.db.models import Subquery, Value
+from django.db.models.functions import Coalesce
 
 
 class WeatherStation(models.Model):
@@ -13,19 +15,147 @@ class WeatherStation(models.Model):
         abstract = True
 
 
-class WeatherDetails(WeatherStation):
+class Station(models.Model):
+    """
+    Model class to store weather stations behind a compact surrogate key.
+    """
+
+    id = models.AutoField(primary_key=True)
+    code = models.CharField(max_length=40, unique=True, help_text="Station ID.")
+
+    class Meta:
+        ordering = ["code"]
+
+
+class IngestBatch(models.Model):
+    """
+    Model class to store audit timestamps once per ingestion batch.
+    """
+
+    id = models.AutoField(primary_key=True)
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+        null=False,
+        verbose_name="Created on.",
+    )
+
+    class Meta:
+        ordering = ["id"]
+
+
+class WeatherDetails(models.Model):
+    """
+    Model class to store daily weather records in a compact layout.
+
+    Measurements are stored as integer tenths, the station is referenced by
+    its surrogate key and audit timestamps are kept once per `IngestBatch`.
+    """
+
+    station = models.ForeignKey(
+        Station,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name="weather_details",
+        help_text="Station.",
+    )
     record_date = models.DateField(
         help_text="Record date.", verbose_name="Record date."
     )
-    max_temp = models.FloatField(
+    max_temp = models.SmallIntegerField(
         help_text="Max temp (in 0.1°C).",
     )
-    min_temp = models.FloatField(
+    min_temp = models.SmallIntegerField(
         help_text="Min temp (in 0.1°C).",
     )
-    precip = models.FloatField(
+    precip = models.SmallIntegerField(
         help_text="Precipitation (in 0.1mm).",
     )
+    created_batch = models.ForeignKey(
+        IngestBatch,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name="+",
+        help_text="Batch which created the record.",
+    )
+    updated_batch = models.ForeignKey(
+        IngestBatch,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name="+",
+        help_text="Batch which last updated the record.",
+    )
+
+    class Meta:
+        ordering = ["station_id", "record_date"]
+        constraints = [
+            # Upsert key, covering the measurements for index-only scans by station.
+            models.UniqueConstraint(
+                fields=["station", "record_date"],
+                include=["id", "max_temp", "min_temp", "precip"],
+                name="Valid record by station and record date.",
+            )
+        ]
+        indexes = [
+            # Covering index for date filters across stations.
+            models.Index(
+                fields=["record_date", "station"],
+                include=["id", "max_temp", "min_temp", "precip"],
+                name="weather_date_station_idx",
+            )
+        ]
+
+
+class DatasetVersion(models.Model):
+    """
+    Model class to store the current generation of a dataset.
+    """
+
+    WEATHER_STATS = "weather_stats"
+    WEATHER_API = "weather_api"
+
+    name = models.CharField(max_length=40, unique=True, help_text="Dataset name.")
+    generation = models.PositiveBigIntegerField(
+        default=0, help_text="Generation readers are served."
+    )
+    last_updated = models.DateTimeField(
+        auto_now=True, verbose_name="Last updated.", null=False
+    )
+
+    class Meta:
+        ordering = ["name"]
+
+    @classmethod
+    def current_generation(cls, name):
+        """Subquery expression of the current generation of the dataset."""
+        return Coalesce(
+            Subquery(cls.objects.filter(name=name).values("generation")[:1]),
+            Value(0),
+        )
+
+
+class WeatherStatsQuerySet(models.QuerySet):
+    def current(self):
+        """Filter the stats of the generation readers are served."""
+        return self.filter(
+            generation=DatasetVersion.current_generation(DatasetVersion.WEATHER_STATS)
+        )
+
+
+class WeatherStats(WeatherStation):
+    year = models.IntegerField(help_text="Stats done this year.")
+    max_temp_avg = models.FloatField(
+        null=True,
+        help_text="Avg max temp (in °C).",
+    )
+    min_temp_avg = models.FloatField(
+        null=True,
+        help_text="Avg min temp (in °C).",
+    )
+    total_precip = models.FloatField(
+        null=True,
+        help_text="Total precip (in cm).",
+    )
+
     created_on = models.DateTimeField(
         auto_now_add=True,
         null=False,
@@ -34,24 +164,35 @@ class WeatherDetails(WeatherStation):
     last_updated = models.DateTimeField(
         auto_now=True, verbose_name="Last updated.", null=False
     )
+    generation = models.PositiveIntegerField(
+        default=0, help_text="Rebuild generation of the stats."
+    )
+
+    objects = WeatherStatsQuerySet.as_manager()
 
     class Meta:
-        ordering = ["weather_station"]
+        ordering = ["weather_station", "year"]
         constraints = [
             models.UniqueConstraint(
-                fields=[
-                    "weather_station",
-                    "record_date",
-                    "max_temp",
-                    "min_temp",
-                    "precip",
-                ],
-                name="Valid record by station, record and weather details.",
+                fields=["weather_station", "year", "generation"],
+                name="Valid Stats by station, year and generation.",
+            )
+        ]
+        indexes = [
+            # Year ranges across stations of the served generation.
+            models.Index(
+                fields=["generation", "year", "weather_station"],
+                name="weather_stats_gen_year_idx",
             )
         ]
 
 
-class WeatherStats(WeatherStation):
+class MaterializedWeatherStats(WeatherStation):
+    """
+    Unmanaged model reading `WeatherStats` aggregates from the PostgreSQL
+    materialized view `core_weatherstats_mv`.
+    """
+
     year = models.IntegerField(help_text="Stats done this year.")
     max_temp_avg = models.FloatField(
         null=True,
@@ -65,7 +206,29 @@ class WeatherStats(WeatherStation):
         null=True,
         help_text="Total precip (in cm).",
     )
+    created_on = models.DateTimeField(verbose_name="Created on.")
+    last_updated = models.DateTimeField(verbose_name="Last updated.")
+
+    class Meta:
+        managed = False
+        db_table = "core_weatherstats_mv"
+        ordering = ["weather_station", "year"]
 
+
+class IngestedFile(models.Model):
+    """
+    Model class to track weather record files already ingested.
+    """
+
+    file_path = models.CharField(
+        max_length=255, unique=True, help_text="Weather record file path."
+    )
+    size = models.BigIntegerField(help_text="File size (in bytes).")
+    mtime = models.FloatField(help_text="File modification time (in seconds).")
+    content_hash = models.CharField(
+        max_length=64, help_text="SHA-256 of the ingested content."
+    )
+    offset = models.BigIntegerField(help_text="Byte offset ingested up to.")
     created_on = models.DateTimeField(
         auto_now_add=True,
         null=False,
@@ -75,11 +238,90 @@ class WeatherStats(WeatherStation):
         auto_now=True, verbose_name="Last updated.", null=False
     )
 
+    class Meta:
+        ordering = ["file_path"]
+
+
+class StaleWeatherStats(WeatherStation):
+    """
+    Model class to track station-years whose `WeatherStats` need a refresh.
+    """
+
+    year = models.IntegerField(help_text="Year with new or changed records.")
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+        null=False,
+        verbose_name="Created on.",
+    )
+    marked_batch = models.ForeignKey(
+        IngestBatch,
+        on_delete=models.PROTECT,
+        null=True,
+        db_index=False,
+        related_name="+",
+        help_text="Batch which last marked the station-year as stale.",
+    )
+
     class Meta:
         ordering = ["weather_station", "year"]
         constraints = [
             models.UniqueConstraint(
                 fields=["weather_station", "year"],
-                name="Valid Stats by station, record and weather details.",
+                name="Stale stats by station and year.",
+            )
+        ]
+
+
+class CropYield(models.Model):
+    """
+    Model class to store the yearly US corn grain yield.
+    """
+
+    year = models.IntegerField(unique=True, help_text="Harvest year.")
+    grain_yield = models.BigIntegerField(
+        help_text="Corn grain yield (in 1000s of megatons)."
+    )
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+        null=False,
+        verbose_name="Created on.",
+    )
+    last_updated = models.DateTimeField(
+        auto_now=True, verbose_name="Last updated.", null=False
+    )
+
+    class Meta:
+        ordering = ["year"]
+
+
+class YieldCorrelation(WeatherStation):
+    """
+    Model class to store the correlation of the `WeatherStats` of a station
+    with the `CropYield` of the same years.
+    """
+
+    years = models.IntegerField(help_text="Years with both stats and yield.")
+    max_temp_avg = models.FloatField(
+        null=True,
+        help_text="Pearson correlation of the avg max temp and the yield.",
+    )
+    min_temp_avg = models.FloatField(
+        null=True,
+        help_text="Pearson correlation of the avg min temp and the yield.",
+    )
+    total_precip = models.FloatField(
+        null=True,
+        help_text="Pearson correlation of the total precip and the yield.",
+    )
+    last_updated = models.DateTimeField(
+        auto_now=True, verbose_name="Last updated.", null=False
+    )
+
+    class Meta:
+        ordering = ["weather_station"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["weather_station"],
+                name="Yield correlation by station.",
             )
         ]
@@ -266,3 +266,23 @@ SESSION_COOKIE_AGE = 600
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#migration-modules
 MIGRATION_MODULES = {"sites": "contrib.sites.migrations"}
+
+# ------------------------------------------------------------------------------
+# WEATHER API
+# ------------------------------------------------------------------------------
+# Source of `api/weather/stats/`: `table` for the `WeatherStats` model filled by
+# `analyze_weather`, `materialized_view` for the PostgreSQL materialized view.
+WEATHER_STATS_BACKEND = env("WEATHER_STATS_BACKEND", default="table")
+# Range partitioning of the `WeatherDetails` table on PostgreSQL: `year` or
+# `decade` partitions per `record_date`, empty to keep a single table.
+WEATHER_DETAILS_PARTITION = env("WEATHER_DETAILS_PARTITION", default="")
+# Seconds `api/weather/` and `api/weather/stats/` responses stay cached, cached
+# responses are invalidated as soon as weather data is ingested or analyzed.
+WEATHER_API_CACHE_TIMEOUT = env.int("WEATHER_API_CACHE_TIMEOUT", default=24 * 60 * 60)
+# Seconds the cache keeps its copy of the generation of cached responses, the
+# longest a bump the cache could not record goes unseen.
+WEATHER_API_GENERATION_TIMEOUT = env.int("WEATHER_API_GENERATION_TIMEOUT", default=30)
+# Records returned by one `api/weather/batch/` request, shared between its queries.
+WEATHER_BATCH_MAX_ROWS = env.int("WEATHER_BATCH_MAX_ROWS", default=100_000)
+# Messages queued per websocket subscription before a slow client is dropped.
+WEATHER_FEED_QUEUE_SIZE = env.int("WEATHER_FEED_QUEUE_SIZE", default=100)
@@ -0,0 +1,102 @@
+"""On the fly aggregates of the `WeatherDetails` model with flexible grouping."""
+# Standard Library
+import logging
+
+# Django Libraries
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    Max,
+    Min,
+    Q,
+    Sum,
+)
+from django.db.models.functions import Cast, ExtractMonth, ExtractYear
+
+# Project Libraries
+from weather.analyze_weather_data import MISSING_MEASUREMENT
+
+
+logger = logging.getLogger("corteva_api")
+
+
+class ExtractDayOfYear(Func):
+    """Day of the year of a date, from 1 to 366."""
+
+    template = "EXTRACT(DOY FROM %(expressions)s)::integer"
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="CAST(strftime('%%%%j', %(expressions)s) AS INTEGER)",
+            **extra_context,
+        )
+
+
+# Output field and expression of each grouping key.
+GROUP_BY = {
+    "station": ("weather_station", lambda: F("station__code")),
+    "year": ("year", lambda: ExtractYear("record_date")),
+    "month": ("month", lambda: ExtractMonth("record_date")),
+    "doy": ("doy", lambda: ExtractDayOfYear("record_date")),
+}
+
+MEASUREMENTS = ("max_temp", "min_temp", "precip")
+
+AGGREGATES = {"avg": Avg, "min": Min, "max": Max, "sum": Sum, "count": Count}
+
+DEFAULT_METRICS = ("max_temp_avg", "min_temp_avg", "precip_sum")
+
+
+def metric_expression(metric):
+    """Return the aggregate expression of a `<measurement>_<aggregate>` metric.
+
+    Missing measurements are excluded with `filter=`, and every aggregate but
+    `count` is scaled from tenths back to the unit of the measurement.
+
+    Raises:
+        ValueError: If `metric` is not a known measurement and aggregate.
+    """
+    measurement, _, name = metric.rpartition("_")
+    if measurement not in MEASUREMENTS or name not in AGGREGATES:
+        raise ValueError(f"Unknown metric {metric!r}")
+    aggregate = AGGREGATES[name](
+        measurement, filter=~Q(**{measurement: MISSING_MEASUREMENT})
+    )
+    if name == "count":
+        return aggregate
+    return Cast(aggregate, FloatField()) / 10
+
+
+def aggregate_weather_details(details, group_by, metrics=DEFAULT_METRICS):
+    """Aggregate weather details in a single `GROUP BY` of the given keys.
+
+    Args:
+        details (:QuerySet): Filtered `WeatherDetails` queryset.
+        group_by (:list): Grouping keys, any of `GROUP_BY`, e.g. `["month"]`
+            for a monthly climatology across all years.
+        metrics (:list): `<measurement>_<aggregate>` names, e.g. `precip_sum`.
+
+    Returns:
+        :QuerySet: Dicts of the grouping keys and metrics, ordered by keys.
+
+    Raises:
+        ValueError: If a grouping key or metric is unknown.
+    """
+    unknown = [key for key in group_by if key not in GROUP_BY]
+    if unknown or not group_by:
+        raise ValueError(f"Unknown grouping {', '.join(unknown) or '(none)'}")
+    keys = dict(GROUP_BY[key] for key in dict.fromkeys(group_by))
+    aggregates = {metric: metric_expression(metric) for metric in metrics}
+    return (
+        details.order_by()
+        .values(**{name: expression() for name, expression in keys.items()})
+        .annotate(**aggregates)
+        .order_by(*keys)
+    )
@@ -0,0 +1,244 @@
+"""Compute the `WeatherStats` aggregates from the `WeatherDetails` model."""
+# Standard Library
+import logging
+import time
+
+from datetime import date
+from functools import reduce
+from operator import or_
+
+# Django Libraries
+from django.db import connection, transaction
+from django.db.models import Avg, F, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Cast, ExtractYear
+
+# Project Libraries
+from core.models import (
+    DatasetVersion,
+    MaterializedWeatherStats,
+    StaleWeatherStats,
+    WeatherDetails,
+    WeatherStats,
+)
+from weather.live_feed import notify_weather_stats
+from weather.process_weather_data import MISSING_VALUE
+
+
+logger = logging.getLogger("corteva_api")
+
+# Measurements are stored in integer tenths, as found in the weather record files.
+MISSING_MEASUREMENT = MISSING_VALUE
+
+
+def weather_stats_queryset(details=None):
+    """Aggregate weather details per station and year in a single `GROUP BY`.
+
+    Missing measurements are excluded from each aggregate with `filter=`,
+    aggregates are scaled from tenths back to the unit of the measurement.
+
+    Args:
+        details (:QuerySet): `WeatherDetails` queryset to aggregate, defaults
+            to all records.
+
+    Returns:
+        :QuerySet: Dicts of station, year and aggregated stats.
+    """
+    details = WeatherDetails.objects.all() if details is None else details
+    return (
+        details.order_by()
+        .values(weather_station=F("station__code"), year=ExtractYear("record_date"))
+        .annotate(
+            max_temp_avg=Avg("max_temp", filter=~Q(max_temp=MISSING_MEASUREMENT)) / 10,
+            min_temp_avg=Avg("min_temp", filter=~Q(min_temp=MISSING_MEASUREMENT)) / 10,
+            total_precip=Cast(
+                Sum("precip", filter=~Q(precip=MISSING_MEASUREMENT)), FloatField()
+            )
+            / 10,
+        )
+    )
+
+
+def compute_weather_stats():
+    """Compute stats for every station and every year of the stored records.
+
+    Station-years without any record are included with `NULL` stats, so
+    every station covers the same range of years.
+
+    Returns:
+        :list: List of unsaved `WeatherStats` instances.
+    """
+    stats = {
+        (row.pop("weather_station"), row.pop("year")): row
+        for row in weather_stats_queryset()
+    }
+    if not stats:
+        return []
+    stations = sorted({station for station, _ in stats})
+    years = [year for _, year in stats]
+    return [
+        WeatherStats(
+            weather_station=station, year=year, **stats.get((station, year), {})
+        )
+        for station in stations
+        for year in range(min(years), max(years) + 1)
+    ]
+
+
+def clear_stale_stats(marks):
+    """Delete the `StaleWeatherStats` read before computing their stats.
+
+    Station-years marked again by an ingest since they were read keep their
+    mark, their new records may be missing from the stats just computed.
+
+    Args:
+        marks (:list): `(id, marked_batch_id)` of the rows read.
+    """
+    ids = {}
+    for id_, batch in marks:
+        ids.setdefault(batch, []).append(id_)
+    for batch, batch_ids in ids.items():
+        StaleWeatherStats.objects.filter(id__in=batch_ids, marked_batch=batch).delete()
+
+
+def rebuild_weather_stats():
+    """Rebuild every `WeatherStats` row into a shadow generation and swap it in.
+
+    The new generation is built next to the one readers are served, then
+    `DatasetVersion` is flipped to it in a short transaction and the old
+    generation is removed afterwards. Readers filter on the current
+    generation, so they never block and never see a half built generation.
+
+    Returns:
+        :int: Number of `WeatherStats` rows written.
+    """
+    stale = list(StaleWeatherStats.objects.values_list("id", "marked_batch"))
+    version, _ = DatasetVersion.objects.get_or_create(name=DatasetVersion.WEATHER_STATS)
+    generation = version.generation + 1
+    # Drop leftovers of interrupted rebuilds before building the shadow generation.
+    WeatherStats.objects.exclude(generation=version.generation).delete()
+
+    objs = compute_weather_stats()
+    for obj in objs:
+        obj.generation = generation
+    WeatherStats.objects.bulk_create(objs, batch_size=1000)
+
+    start_time = time.monotonic()
+    with transaction.atomic():
+        DatasetVersion.objects.filter(pk=version.pk).update(generation=generation)
+        clear_stale_stats(stale)
+        notify_weather_stats(generation)
+    logger.info(
+        f"Swapped in stats generation {generation} in "
+        f"{(time.monotonic() - start_time) * 1000:.2f} ms"
+    )
+    WeatherStats.objects.exclude(generation=generation).delete()
+    return len(objs)
+
+
+def _pairs_filter(pairs, year_field):
+    """Build a filter matching the given (station, year) pairs per station."""
+    years = {}
+    for station, year in pairs:
+        years.setdefault(station, set()).add(year)
+    if year_field == "year":
+        return reduce(or_, (Q(weather_station=s, year__in=y) for s, y in years.items()))
+    return reduce(
+        or_,
+        (
+            Q(
+                station__code=s,
+                record_date__gte=date(min(y), 1, 1),
+                record_date__lt=date(max(y) + 1, 1, 1),
+            )
+            for s, y in years.items()
+        ),
+    )
+
+
+def refresh_weather_stats():
+    """Recompute and upsert `WeatherStats` of the stale station-years only.
+
+    Rows of the generation readers are served are updated in place. Stations
+    and years which are new to `WeatherStats` are also filled in with `NULL`
+    stats, keeping the same station-year grid a full run builds.
+
+    Returns:
+        :int: Number of `WeatherStats` rows written.
+    """
+    stale = list(
+        StaleWeatherStats.objects.values_list(
+            "id", "marked_batch", "weather_station", "year"
+        )
+    )
+    if not stale:
+        return 0
+    pairs = {(station, year) for _, _, station, year in stale}
+    stations = {station for station, _ in pairs}
+    years = {year for _, year in pairs}
+
+    generation = (
+        DatasetVersion.objects.filter(name=DatasetVersion.WEATHER_STATS)
+        .values_list("generation", flat=True)
+        .first()
+        or 0
+    )
+    current = WeatherStats.objects.filter(generation=generation)
+    bounds = current.aggregate(start=Min("year"), end=Max("year"))
+    known_years = range(
+        bounds["start"] or min(years), (bounds["end"] or max(years)) + 1
+    )
+    all_years = range(
+        min(min(years), known_years.start), max(max(years) + 1, known_years.stop)
+    )
+    all_stations = stations.union(
+        current.values_list("weather_station", flat=True).distinct()
+    )
+    # Years new to `WeatherStats` need a row for every station.
+    new_years = years.union(set(all_years) - set(known_years))
+    grid = {(s, y) for s in stations for y in all_years}
+    grid |= {(s, y) for s in all_stations for y in new_years}
+    existing = set(
+        current.filter(
+            Q(weather_station__in=stations) | Q(year__in=new_years)
+        ).values_list("weather_station", "year")
+    )
+
+    rows = {
+        (row.pop("weather_station"), row.pop("year")): row
+        for row in weather_stats_queryset(
+            WeatherDetails.objects.filter(_pairs_filter(pairs, "record_date"))
+        )
+    }
+    objs = [
+        WeatherStats(
+            weather_station=station,
+            year=year,
+            generation=generation,
+            **rows.get((station, year), {}),
+        )
+        for station, year in sorted(pairs | (grid - existing))
+    ]
+    with transaction.atomic():
+        current.filter(_pairs_filter(pairs, "year")).delete()
+        WeatherStats.objects.bulk_create(objs, batch_size=1000)
+        clear_stale_stats([(id_, batch) for id_, batch, _, _ in stale])
+        notify_weather_stats(generation, stations)
+    logger.info(f"Refreshed {len(pairs)} stale station-years")
+    return len(objs)
+
+
+def refresh_materialized_weather_stats():
+    """Refresh the `core_weatherstats_mv` materialized view without locking readers.
+
+    The aggregation runs inside PostgreSQL, no records are pulled into Python.
+
+    Returns:
+        :int: Number of rows in the materialized view.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY "
+            + connection.ops.quote_name(MaterializedWeatherStats._meta.db_table)
+        )
+    notify_weather_stats(None)
+    return MaterializedWeatherStats.objects.count()
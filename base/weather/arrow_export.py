@@ -0,0 +1,216 @@
+"""Columnar Apache Arrow batches of weather details and stats for exports."""
+# Standard Library
+import io
+import logging
+
+from typing import NamedTuple
+
+# Django Libraries
+from django.db import connections
+from django.db.models import BigIntegerField, F, Func, IntegerField
+
+# 3rd Party Libraries
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+# Project Libraries
+from weather.pagination import RowComparison
+
+
+logger = logging.getLogger("corteva_api")
+
+# Station codes repeat on every record, they are stored once per batch.
+STATION_TYPE = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP_TYPE = pa.timestamp("us", tz="UTC")
+# Rows per record batch, each batch is read with a single query.
+DEFAULT_BATCH_SIZE = 65536
+
+
+class ArrowColumn(NamedTuple):
+    """Column of an export, read from `lookup` and stored as `type`."""
+
+    name: str
+    lookup: str
+    type: pa.DataType
+    tenths: bool = False
+
+
+WEATHER_DETAILS_COLUMNS = (
+    ArrowColumn("id", "id", pa.int64()),
+    ArrowColumn("weather_station", "station__code", STATION_TYPE),
+    ArrowColumn("record_date", "record_date", pa.date32()),
+    ArrowColumn("max_temp", "max_temp", pa.float64(), tenths=True),
+    ArrowColumn("min_temp", "min_temp", pa.float64(), tenths=True),
+    ArrowColumn("precip", "precip", pa.float64(), tenths=True),
+    ArrowColumn("created_on", "created_batch__created_on", TIMESTAMP_TYPE),
+    ArrowColumn("last_updated", "updated_batch__created_on", TIMESTAMP_TYPE),
+)
+
+WEATHER_STATS_COLUMNS = (
+    ArrowColumn("id", "id", pa.int64()),
+    ArrowColumn("weather_station", "weather_station", STATION_TYPE),
+    ArrowColumn("year", "year", pa.int32()),
+    ArrowColumn("max_temp_avg", "max_temp_avg", pa.float64()),
+    ArrowColumn("min_temp_avg", "min_temp_avg", pa.float64()),
+    ArrowColumn("total_precip", "total_precip", pa.float64()),
+    ArrowColumn("created_on", "created_on", TIMESTAMP_TYPE),
+    ArrowColumn("last_updated", "last_updated", TIMESTAMP_TYPE),
+)
+
+
+def arrow_schema(columns):
+    """Return the Arrow schema of an export with the given columns."""
+    return pa.schema([pa.field(column.name, column.type) for column in columns])
+
+
+def _read_type(column):
+    """Type a column is read as, before `_finish_column` converts it."""
+    if column.type == STATION_TYPE:
+        return pa.string()
+    if column.tenths:
+        return pa.int64()
+    if column.type == pa.date32():
+        return pa.int32()
+    if column.type == TIMESTAMP_TYPE:
+        return pa.int64()
+    return column.type
+
+
+def _copy_expression(column):
+    """Select `column` in a text form PyArrow parses without conversions."""
+    if column.type == pa.date32():
+        # Days since epoch, the storage of `date32`.
+        return Func(
+            F(column.lookup),
+            template="(%(expressions)s - DATE '1970-01-01')",
+            output_field=IntegerField(),
+        )
+    if column.type == TIMESTAMP_TYPE:
+        # Microseconds since epoch, the storage of `timestamp[us]`.
+        return Func(
+            F(column.lookup),
+            template="(EXTRACT(EPOCH FROM %(expressions)s) * 1000000)::bigint",
+            output_field=BigIntegerField(),
+        )
+    return F(column.lookup)
+
+
+def _finish_column(column, array):
+    """Convert an array read with `_read_type` to the type of `column`."""
+    if column.type == STATION_TYPE:
+        return pc.dictionary_encode(array)
+    if column.tenths:
+        return pc.divide(array.cast(pa.float64()), 10.0)
+    if array.type != column.type:
+        return array.cast(column.type)
+    return array
+
+
+def parse_copy_csv(buffer, columns):
+    """Parse the CSV output of `_copy_table` into a table of read types.
+
+    Args:
+        buffer (:file): CSV rows of the columns selected by `_copy_expression`.
+        columns (:tuple): `ArrowColumn` items of the export.
+
+    Returns:
+        :pa.Table: Table with one column per item of `columns`.
+    """
+    return pa_csv.read_csv(
+        buffer,
+        read_options=pa_csv.ReadOptions(
+            column_names=[column.name for column in columns]
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={column.name: _read_type(column) for column in columns},
+            null_values=[""],
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+
+def _copy_table(queryset, columns, limit):
+    """Read `queryset` with `COPY TO STDOUT` into a table of read types."""
+    aliases = [f"_c{index}" for index in range(len(columns))]
+    queryset = queryset.values(
+        **{alias: _copy_expression(column) for alias, column in zip(aliases, columns)}
+    )[:limit]
+    sql, params = queryset.query.sql_with_params()
+    buffer = io.BytesIO()
+    with connections[queryset.db].cursor() as cursor:
+        query = cursor.mogrify(sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", buffer)
+    if not buffer.getbuffer().nbytes:
+        # PyArrow refuses to parse an empty file, past the last batch.
+        return pa.schema(
+            [pa.field(column.name, _read_type(column)) for column in columns]
+        ).empty_table()
+    buffer.seek(0)
+    return parse_copy_csv(buffer, columns)
+
+
+def _fetch_table(queryset, columns, limit):
+    """Read `queryset` row by row into a table of read types.
+
+    Fallback for databases without `COPY`.
+    """
+    rows = list(queryset.values_list(*(column.lookup for column in columns))[:limit])
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = []
+    for column, column_values in zip(columns, values):
+        if column.type == pa.date32():
+            arrays.append(pa.array(column_values, pa.date32()))
+        elif column.type == TIMESTAMP_TYPE:
+            arrays.append(pa.array(column_values, TIMESTAMP_TYPE))
+        else:
+            arrays.append(pa.array(column_values, _read_type(column)))
+    return pa.Table.from_arrays(arrays, [column.name for column in columns])
+
+
+def _batch_ordering(model):
+    """Ordering of `model` records in exports, made unique with `id`."""
+    return (*(field for field in model._meta.ordering if field != "id"), "id")
+
+
+def iter_record_batches(queryset, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """Read `queryset` into Arrow record batches of at most `batch_size` rows.
+
+    Records come in the model ordering, like the other export formats, with
+    `id` breaking ties. Batches are read one query at a time, each query
+    starting right after the last record of the previous batch, as keyset
+    pages do. On PostgreSQL a batch is read with `COPY ... TO STDOUT` and
+    parsed by PyArrow, so no Python object is created per row.
+
+    Args:
+        queryset (:QuerySet): Filtered queryset of the exported model.
+        columns (:tuple): `ArrowColumn` items of the export, including `id`.
+        batch_size (:int): Maximum number of rows per batch.
+
+    Yields:
+        :pa.RecordBatch: Batch with the schema of `arrow_schema(columns)`.
+    """
+    read_table = (
+        _copy_table if connections[queryset.db].vendor == "postgresql" else _fetch_table
+    )
+    schema = arrow_schema(columns)
+    ordering = _batch_ordering(queryset.model)
+    records = queryset.model._base_manager.using(queryset.db)
+    position = None
+    while True:
+        chunk = queryset.order_by(*ordering)
+        if position is not None:
+            chunk = chunk.filter(RowComparison(ordering, position))
+        table = read_table(chunk, columns, batch_size)
+        if not table.num_rows:
+            return
+        arrays = [
+            _finish_column(column, table.column(index).combine_chunks())
+            for index, column in enumerate(columns)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+        if table.num_rows < batch_size:
+            return
+        # Columns may not hold the ordering fields, they are read by `id`.
+        last_id = table.column("id")[-1].as_py()
+        position = records.filter(id=last_id).values_list(*ordering).get()
@@ -0,0 +1,164 @@
+"""Native async views for the `api/weather` API endpoint.
+
+Served through the ASGI `app`, these views read with the async ORM instead of
+taking a thread of the sync-to-async pool for the whole request.
+"""
+# Standard Library
+import logging
+
+from collections import OrderedDict
+
+# Django Libraries
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+
+# 3rd Party Libraries
+from django_filters.utils import translate_validation
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Project Libraries
+from core.models import WeatherDetails, WeatherStats
+from weather.cache import aresponse_version
+from weather.filters import WeatherDetailsFilter, WeatherStatsFilter
+from weather.renderers import ORJSONRenderer
+from weather.serializer import (
+    WeatherDetailsValuesSerializer,
+    WeatherStatsValuesSerializer,
+)
+from weather.views import WeatherStatsBackendMixin
+
+
+logger = logging.getLogger("corteva_api")
+
+
+class AsyncValuesListView(View):
+    """Serve JSON list pages with `acount` and `aiterator`.
+
+    Gives the same JSON as the page number mode of the DRF list views:
+    records are filtered by `filterset_class`, read as `values_list` rows
+    and represented by `values_serializer`. Responses are cached and
+    validated like those of `CachedListMixin`, through the async cache API.
+    """
+
+    http_method_names = ["get"]
+    queryset = None
+    filterset_class = None
+    values_serializer = None
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    invalid_page_message = "Invalid page."
+    renderer = ORJSONRenderer()
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_page_size(self, request):
+        """Return the page size requested with `page_size`, if valid."""
+        try:
+            page_size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_page_link(self, request, number, last):
+        """Return the url of the page `number`, None when out of range."""
+        if not 1 <= number <= last:
+            return None
+        url = request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data),
+            content_type=self.renderer.media_type,
+            status=status_code,
+        )
+
+    async def get(self, request, *args, **kwargs):
+        version = await aresponse_version(request, type(self).__name__)
+        response = get_conditional_response(
+            request, etag=version.etag, last_modified=version.last_modified
+        )
+        if response is None:
+            cached = await cache.aget(version.cache_key)
+            if cached is not None:
+                response = HttpResponse(cached, content_type=self.renderer.media_type)
+            else:
+                response = await self.list(request)
+                if response.status_code == status.HTTP_200_OK:
+                    await cache.aset(
+                        version.cache_key,
+                        response.content,
+                        settings.WEATHER_API_CACHE_TIMEOUT,
+                    )
+        response["ETag"] = version.etag
+        response["Last-Modified"] = http_date(version.last_modified)
+        return response
+
+    async def list(self, request):
+        """Return the requested page, read with the async ORM."""
+        filterset = self.filterset_class(
+            request.GET, queryset=self.get_queryset(), request=request
+        )
+        if not filterset.is_valid():
+            errors = translate_validation(filterset.errors).detail
+            return self.render(errors, status_code=status.HTTP_400_BAD_REQUEST)
+        queryset = self.values_serializer.values_list(filterset.qs)
+        page_size = self.get_page_size(request)
+        count = await queryset.acount()
+        last = max(1, -(-count // page_size))
+        page = request.GET.get(self.page_query_param, "1")
+        try:
+            number = last if page == "last" else int(page)
+        except ValueError:
+            number = 0
+        if not 1 <= number <= last:
+            return self.render(
+                {"detail": self.invalid_page_message},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        start, end = (number - 1) * page_size, number * page_size
+        rows = [row async for row in queryset[start:end].aiterator()]
+        data = OrderedDict(
+            [
+                ("count", count),
+                ("next", self.get_page_link(request, number + 1, last)),
+                ("previous", self.get_page_link(request, number - 1, last)),
+                ("results", self.values_serializer.to_representation(rows)),
+            ]
+        )
+        return self.render(data)
+
+
+class AsyncWeatherDetailsView(AsyncValuesListView):
+    """Get the `WeatherDetails` details, async.
+
+    1. GET `api/weather/async/`: Same as `api/weather/` in page number mode.
+    """
+
+    queryset = WeatherDetails.objects.all()
+    filterset_class = WeatherDetailsFilter
+    values_serializer = WeatherDetailsValuesSerializer
+
+
+class AsyncWeatherStatsView(WeatherStatsBackendMixin, AsyncValuesListView):
+    """Get the `WeatherStats` details, async.
+
+    1. GET `api/weather/stats/async/`: Same as `api/weather/stats/`.
+    """
+
+    queryset = WeatherStats.objects.current()
+    filterset_class = WeatherStatsFilter
+    values_serializer = WeatherStatsValuesSerializer
+    page_size_query_param = None
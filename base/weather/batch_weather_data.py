@@ -0,0 +1,131 @@
+"""Answer many station and date range queries with a single SQL query."""
+# Standard Library
+import logging
+
+from datetime import date
+from typing import NamedTuple, Optional
+
+# Django Libraries
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Project Libraries
+from core.models import IngestBatch, Station, WeatherDetails
+
+
+logger = logging.getLogger("corteva_api")
+
+
+class WeatherQuery(NamedTuple):
+    """Records of a station, optionally within a record date range."""
+
+    weather_station: str
+    record_date__gte: Optional[date] = None
+    record_date__lte: Optional[date] = None
+
+
+class WeatherQueryResult(NamedTuple):
+    """Rows answering a `WeatherQuery`, cut at the row limit if `truncated`."""
+
+    rows: list
+    truncated: bool = False
+
+
+# Selected columns, in the order of `WeatherDetailsValuesSerializer.fields`.
+COLUMNS = (
+    ("details", WeatherDetails._meta.get_field("id")),
+    ("station", Station._meta.get_field("code")),
+    ("details", WeatherDetails._meta.get_field("record_date")),
+    ("details", WeatherDetails._meta.get_field("max_temp")),
+    ("details", WeatherDetails._meta.get_field("min_temp")),
+    ("details", WeatherDetails._meta.get_field("precip")),
+    ("created", IngestBatch._meta.get_field("created_on")),
+    ("updated", IngestBatch._meta.get_field("created_on")),
+)
+
+
+def _converters(connection):
+    """Return the database converters of `COLUMNS`, by column index.
+
+    Raw rows get the same Python values as rows read through the ORM, e.g.
+    dates and aware datetimes on SQLite.
+    """
+    converters = []
+    for index, (alias, field) in enumerate(COLUMNS):
+        column = field.get_col(alias)
+        functions = connection.ops.get_db_converters(column)
+        functions += column.get_db_converters(connection)
+        if functions:
+            converters.append((index, column, functions))
+    return converters
+
+
+def batch_weather_details(queries, limit, using=DEFAULT_DB_ALIAS):
+    """Read the first `limit` records of every query with one SQL query.
+
+    The queries are sent as a `VALUES` list joined to the stations and the
+    records, so each one is answered by a range scan of the
+    `(station, record_date)` key, and records matching several queries are
+    returned for each of them. Records are numbered per query with
+    `row_number()` and only the first `limit` are fetched, so the result
+    stays bounded whatever the number of records matched.
+
+    Args:
+        queries (:list): `WeatherQuery` items.
+        limit (:int): Most records returned per query.
+        using (:string): Database alias to read from.
+
+    Returns:
+        :list: One `WeatherQueryResult` per query, in query order. Rows hold
+            the values of `WeatherDetailsValuesSerializer.fields`, ordered by
+            date, `truncated` is set when the query matched more records.
+    """
+    if not queries:
+        return []
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    adapt = connection.ops.adapt_datefield_value
+    params = []
+    for position, query in enumerate(queries):
+        params += [
+            position,
+            query.weather_station,
+            adapt(query.record_date__gte or date.min),
+            adapt(query.record_date__lte or date.max),
+        ]
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(queries))
+    columns = ", ".join(
+        f"{alias}.{qn(field.column)} AS column_{index}"
+        for index, (alias, field) in enumerate(COLUMNS)
+    )
+    selected = ", ".join(f"column_{index}" for index in range(len(COLUMNS)))
+    batches = qn(IngestBatch._meta.db_table)
+    sql = (
+        f"WITH queries (query_index, code, start_date, end_date) AS (VALUES {values}), "
+        f"matched AS (SELECT queries.query_index, {columns}, row_number() OVER ("
+        "PARTITION BY queries.query_index ORDER BY details.record_date"
+        ") AS position FROM queries "
+        f"JOIN {qn(Station._meta.db_table)} station ON station.code = queries.code "
+        f"JOIN {qn(WeatherDetails._meta.db_table)} details "
+        "ON details.station_id = station.id "
+        "AND details.record_date BETWEEN queries.start_date AND queries.end_date "
+        f"JOIN {batches} created ON created.id = details.created_batch_id "
+        f"JOIN {batches} updated ON updated.id = details.updated_batch_id) "
+        f"SELECT query_index, position, {selected} FROM matched "
+        # One record past the limit tells whether a query was truncated.
+        "WHERE position <= %s ORDER BY query_index, position"
+    )
+    params.append(limit + 1)
+    converters = _converters(connection)
+    results = [WeatherQueryResult([]) for _ in queries]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for position, number, *row in cursor.fetchall():
+            if number > limit:
+                results[position] = results[position]._replace(truncated=True)
+                continue
+            for index, column, functions in converters:
+                for convert in functions:
+                    row[index] = convert(row[index], column, connection)
+            results[position].rows.append(row)
+    logger.debug(f"Answered {len(queries)} weather queries")
+    return results
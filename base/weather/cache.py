@@ -0,0 +1,165 @@
+"""Response cache of the `api/weather` API endpoints."""
+# Standard Library
+import hashlib
+import logging
+import time
+
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+# Django Libraries
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+# Project Libraries
+from core.models import DatasetVersion
+
+
+logger = logging.getLogger("corteva_api")
+
+# Cache key of the copy of the generation and of when it started.
+GENERATION_KEY = "weather-api:generation"
+
+
+class ResponseVersion(NamedTuple):
+    """Cache key and validators of a response in the current generation."""
+
+    cache_key: str
+    etag: str
+    last_modified: int
+
+
+def _initial_generation():
+    # Derived from the clock, so a generation lost with a recreated database
+    # is never handed out again while its responses may still be cached.
+    return time.time_ns() // 1_000_000
+
+
+def _generation_versions():
+    return DatasetVersion.objects.filter(name=DatasetVersion.WEATHER_API)
+
+
+def _generation(version):
+    return version.generation, int(version.last_updated.timestamp())
+
+
+def _read_generation():
+    """Read the generation from the `weather_api` row, creating it first."""
+    version = _generation_versions().first()
+    if version is None:
+        version, _ = DatasetVersion.objects.get_or_create(
+            name=DatasetVersion.WEATHER_API,
+            defaults={"generation": _initial_generation()},
+        )
+    return _generation(version)
+
+
+def get_generation():
+    """Return the dataset generation cached responses are valid for.
+
+    The `weather_api` row of `DatasetVersion` holds the generation, a copy
+    is kept in the cache for `WEATHER_API_GENERATION_TIMEOUT` seconds so
+    cached responses are served without any query. `bump_generation`
+    overwrites the copy, one it could not reach (a failed write, or the
+    per-process cache of another server) is stale for that long at most.
+
+    Returns:
+        :tuple: Current generation and when it started, in seconds since epoch.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = _read_generation()
+        # Never replaces the copy of a newer generation, set by a bump since.
+        cache.add(GENERATION_KEY, generation, settings.WEATHER_API_GENERATION_TIMEOUT)
+    return tuple(generation)
+
+
+def bump_generation():
+    """Invalidate every cached response at once by starting a new generation.
+
+    Returns:
+        :int: New generation.
+    """
+    _read_generation()
+    _generation_versions().update(
+        generation=F("generation") + 1, last_updated=timezone.now()
+    )
+    generation = _read_generation()
+    timeout = settings.WEATHER_API_GENERATION_TIMEOUT
+    cache.set(GENERATION_KEY, generation, timeout)
+    if cache.get(GENERATION_KEY) != generation:
+        logger.warning(
+            f"Weather API cache generation {generation[0]} could not be cached, "
+            f"previous responses may be served for {timeout} more seconds"
+        )
+    logger.info(f"Weather API cache generation is now {generation[0]}")
+    return generation[0]
+
+
+def _response_digest(request, params, prefix, renderer):
+    query = urlencode(sorted(params.lists()), doseq=True)
+    url = request.build_absolute_uri(request.path)
+    return hashlib.sha256(f"{prefix}|{url}?{query}|{renderer}".encode()).hexdigest()
+
+
+def _response_version(prefix, digest, generation, last_modified):
+    return ResponseVersion(
+        f"weather-api:{prefix}:{generation}:{digest}",
+        f'"{generation}-{digest[:32]}"',
+        last_modified,
+    )
+
+
+def response_version(request, prefix):
+    """Build the cache key and validators of a response.
+
+    Query parameters are sorted by name, so the same query written in a
+    different order shares the cached response and the ETag. The absolute
+    url is part of both since pagination links are absolute, and so is the
+    accepted media type with its parameters, as `indent` changes the body.
+
+    Args:
+        request (:Request): Request being served.
+        prefix (:string): Name of the cached endpoint.
+
+    Returns:
+        :ResponseVersion: Cache key, strong ETag and Last-Modified timestamp,
+            all bound to the current generation.
+    """
+    renderer = f"{request.accepted_renderer.format}|{request.accepted_media_type}"
+    digest = _response_digest(request, request.query_params, prefix, renderer)
+    return _response_version(prefix, digest, *get_generation())
+
+
+async def aget_generation():
+    """Async version of `get_generation`."""
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        version = await _generation_versions().afirst()
+        if version is None:
+            version, _ = await DatasetVersion.objects.aget_or_create(
+                name=DatasetVersion.WEATHER_API,
+                defaults={"generation": _initial_generation()},
+            )
+        generation = _generation(version)
+        await cache.aadd(
+            GENERATION_KEY, generation, settings.WEATHER_API_GENERATION_TIMEOUT
+        )
+    return tuple(generation)
+
+
+async def aresponse_version(request, prefix, renderer="json"):
+    """Async version of `response_version`, for plain Django requests.
+
+    Args:
+        request (:HttpRequest): Request being served.
+        prefix (:string): Name of the cached endpoint.
+        renderer (:string): Format of the response.
+
+    Returns:
+        :ResponseVersion: Cache key, strong ETag and Last-Modified timestamp.
+    """
+    digest = _response_digest(request, request.GET, prefix, renderer)
+    return _response_version(prefix, digest, *await aget_generation())
@@ -0,0 +1,178 @@
+"""Load the `CropYield` dataset and correlate it with the `WeatherStats`."""
+# Standard Library
+import logging
+import os
+
+# Django Libraries
+from django.db import transaction
+from django.db.models import Avg, Count, OuterRef, Subquery
+
+# 3rd Party Libraries
+import numpy as np
+
+# Project Libraries
+from core.models import CropYield, WeatherStats, YieldCorrelation
+
+
+logger = logging.getLogger("corteva_api")
+
+YIELD_FILE = "US_corn_grain_yield.txt"
+# `WeatherStats` metrics correlated with the yield.
+METRICS = ("max_temp_avg", "min_temp_avg", "total_precip")
+# Fewest years a correlation coefficient is computed from.
+MIN_YEARS = 3
+
+
+def read_yield_file():
+    """Return the path of the locally stored yield file, None if missing."""
+    for location in (".", "../"):
+        file_path = os.path.join(location, "yld_data", YIELD_FILE)
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def parse_yield_file(file_path):
+    """Parse the tab separated `year`, `yield` lines of a yield file.
+
+    Args:
+        file_path (:string): Actual file path of the yield file.
+
+    Returns:
+        :list: `(year, grain_yield)` tuples.
+    """
+    data = np.loadtxt(file_path, dtype=np.int64, ndmin=2)
+    return [(int(year), int(grain_yield)) for year, grain_yield in data]
+
+
+def load_crop_yield(records):
+    """Insert or update `CropYield` rows by year.
+
+    Args:
+        records (:list): `(year, grain_yield)` tuples.
+
+    Returns:
+        :int: Number of rows written.
+    """
+    rows = CropYield.objects.bulk_create(
+        [CropYield(year=year, grain_yield=value) for year, value in records],
+        update_conflicts=True,
+        unique_fields=["year"],
+        update_fields=["grain_yield", "last_updated"],
+    )
+    return len(rows)
+
+
+def reported(stats):
+    """Exclude the station-years without any record, whose stats are all null."""
+    return stats.exclude(**{name: None for name in METRICS})
+
+
+def yield_correlations(stations, metrics, yields):
+    """Correlate the metrics of every station with the yield, vectorized.
+
+    Rows are grouped by station, the sums of a Pearson coefficient are taken
+    per group with `np.add.reduceat`, excluding the years a metric is missing.
+
+    Args:
+        stations (:ndarray): Station of each row, rows grouped by station.
+        metrics (:dict): Metric values of the rows by name, NaN if missing.
+        yields (:ndarray): Yield of the year of each row.
+
+    Returns:
+        :tuple: Stations, row count of each station and the correlation
+            coefficients of each metric by name, NaN where undefined.
+    """
+    starts = np.flatnonzero(np.r_[True, stations[1:] != stations[:-1]])
+    counts = np.diff(np.r_[starts, len(stations)])
+    # Centered values keep the sums of squares accurate.
+    y = yields - yields.mean()
+    coefficients = {}
+    for name, values in metrics.items():
+        valid = ~np.isnan(values)
+        if not valid.any():
+            coefficients[name] = np.full(len(starts), np.nan)
+            continue
+        x = np.where(valid, values - np.nanmean(values), 0)
+        yv = np.where(valid, y, 0)
+        n = np.add.reduceat(valid.astype(np.float64), starts)
+        sx, sy = np.add.reduceat(x, starts), np.add.reduceat(yv, starts)
+        covariance = n * np.add.reduceat(x * yv, starts) - sx * sy
+        variance = (n * np.add.reduceat(x * x, starts) - sx**2) * (
+            n * np.add.reduceat(yv * yv, starts) - sy**2
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = covariance / np.sqrt(variance)
+        r[(n < MIN_YEARS) | ~(variance > 0)] = np.nan
+        coefficients[name] = np.clip(r, -1, 1)
+    return stations[starts], counts, coefficients
+
+
+def compute_yield_correlations(stats=None):
+    """Rebuild `YieldCorrelation` from the stats of the years with a yield.
+
+    Args:
+        stats (:QuerySet): Stats to correlate, defaults to the current
+            `WeatherStats`.
+
+    Returns:
+        :int: Number of stations correlated.
+    """
+    stats = WeatherStats.objects.current() if stats is None else stats
+    yields = dict(CropYield.objects.values_list("year", "grain_yield"))
+    rows = list(
+        reported(stats)
+        .filter(year__in=list(yields))
+        .order_by("weather_station", "year")
+        .values_list("weather_station", "year", *METRICS)
+    )
+    correlations = []
+    if rows:
+        stations, years, *values = zip(*rows)
+        stations, counts, coefficients = yield_correlations(
+            np.array(stations),
+            {
+                name: np.array(column, dtype=np.float64)
+                for name, column in zip(METRICS, values)
+            },
+            np.array([yields[year] for year in years], dtype=np.float64),
+        )
+        for index, station in enumerate(stations.tolist()):
+            correlation = YieldCorrelation(
+                weather_station=station, years=int(counts[index])
+            )
+            for name in METRICS:
+                value = coefficients[name][index]
+                setattr(correlation, name, None if np.isnan(value) else float(value))
+            correlations.append(correlation)
+    with transaction.atomic():
+        YieldCorrelation.objects.all().delete()
+        YieldCorrelation.objects.bulk_create(correlations)
+    logger.info(f"Correlated the yield with {len(correlations)} stations")
+    return len(correlations)
+
+
+def yearly_yield_queryset(stats):
+    """Join the yield of every year to the stats aggregated across stations.
+
+    Args:
+        stats (:QuerySet): Stats to aggregate.
+
+    Returns:
+        :QuerySet: Dicts of year, yield, number of stations and the average
+            `mean_<metric>` of each metric, for the years with a yield, in a
+            single SQL query.
+    """
+    grain_yield = CropYield.objects.filter(year=OuterRef("year")).values("grain_yield")
+    return (
+        reported(stats)
+        .order_by()
+        .values("year")
+        .annotate(
+            grain_yield=Subquery(grain_yield[:1]),
+            stations=Count("weather_station"),
+            **{f"mean_{name}": Avg(name) for name in METRICS},
+        )
+        .filter(grain_yield__isnull=False)
+        .order_by("year")
+    )
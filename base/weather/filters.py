@@ -0,0 +1,43 @@
+"""Filters for the `api/weather` API endpoint."""
+# 3rd Party Libraries
+from django_filters import rest_framework as filters
+
+# Project Libraries
+from core.models import WeatherDetails
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Filter matching any of a comma separated list of values."""
+
+
+class WeatherDetailsFilter(filters.FilterSet):
+    """Filter `WeatherDetails` by station codes and record date ranges.
+
+    Station filters use the `(station, record_date)` upsert key and date
+    filters across stations the `weather_date_station_idx` index, so each
+    combination is read with index range scans.
+    """
+
+    weather_station = filters.CharFilter(field_name="station__code")
+    weather_station__in = CharInFilter(field_name="station__code", lookup_expr="in")
+    record_date = filters.DateFilter()
+    record_date__gte = filters.DateFilter(field_name="record_date", lookup_expr="gte")
+    record_date__lte = filters.DateFilter(field_name="record_date", lookup_expr="lte")
+
+    class Meta:
+        model = WeatherDetails
+        fields = ()
+
+
+class WeatherStatsFilter(filters.FilterSet):
+    """Filter `WeatherStats` by station codes and year ranges.
+
+    Declared without a model, as stats are read either from `WeatherStats`
+    or from `MaterializedWeatherStats`.
+    """
+
+    weather_station = filters.CharFilter()
+    weather_station__in = CharInFilter(field_name="weather_station", lookup_expr="in")
+    year = filters.NumberFilter()
+    year__gte = filters.NumberFilter(field_name="year", lookup_expr="gte")
+    year__lte = filters.NumberFilter(field_name="year", lookup_expr="lte")
@@ -0,0 +1,80 @@
+"""Track ingested weather record files, so re-runs only load what changed."""
+# Standard Library
+import hashlib
+import logging
+import os
+
+# Project Libraries
+from core.models import IngestedFile
+from weather.process_weather_data import FileSlice
+
+
+logger = logging.getLogger("corteva_api")
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def plan_ingestion(file_paths, full=False):
+    """Work out which part of each weather record file still needs loading.
+
+    Files with the size and modification time stored in the manifest are
+    skipped without being read. Files which only grew, i.e. whose ingested
+    prefix still hashes to the stored content hash, are loaded from the
+    stored offset. Other changed files are loaded from the start. Only
+    complete lines are planned, a trailing partial line is left for the next
+    run.
+
+    Args:
+        file_paths (:list): Weather record file paths.
+        full (:bool): Ignore the manifest and plan every file from the start.
+
+    Returns:
+        :list: List of (`FileSlice`, `IngestedFile`) pairs. The manifest
+            entry is updated but not saved, save it once the slice is loaded.
+    """
+    manifest = {
+        entry.file_path: entry
+        for entry in IngestedFile.objects.filter(
+            file_path__in=[os.path.abspath(path) for path in file_paths]
+        )
+    }
+    plan, skipped = [], 0
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        entry = manifest.get(os.path.abspath(file_path))
+        if (
+            not full
+            and entry is not None
+            and (entry.size, entry.mtime) == (stat.st_size, stat.st_mtime)
+        ):
+            skipped += 1
+            continue
+
+        with open(file_path, "rb") as fp:
+            data = fp.read()
+        end = data.rfind(b"\n") + 1
+        content_hash = _digest(data[:end])
+        offset = 0
+        if not full and entry is not None:
+            if entry.content_hash == content_hash:
+                offset = end
+            elif entry.offset <= end and entry.content_hash == _digest(
+                data[: entry.offset]
+            ):
+                offset = entry.offset
+
+        if entry is None:
+            entry = IngestedFile(file_path=os.path.abspath(file_path))
+        entry.size, entry.mtime = stat.st_size, stat.st_mtime
+        entry.content_hash, entry.offset = content_hash, end
+        if offset == end:
+            # Content already ingested, only the file stats changed.
+            entry.save()
+            skipped += 1
+            continue
+        plan.append((FileSlice(file_path, offset, end), entry))
+
+    logger.info(f"Planned {len(plan)} files, skipped {skipped} unchanged files")
+    return plan
@@ -0,0 +1,248 @@
+"""Live feed of new weather records and stats, for websocket subscriptions.
+
+Writers send a PostgreSQL `NOTIFY` on `CHANNEL` in the transaction writing
+the data, so it is delivered once they commit. Each process runs a single
+`LISTEN` connection, fetches the new records of a notification once and fans
+them out to the subscriptions of their stations.
+"""
+# Standard Library
+import asyncio
+import logging
+
+# Django Libraries
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# 3rd Party Libraries
+import orjson
+
+from asgiref.sync import sync_to_async
+
+# Project Libraries
+from core.models import MaterializedWeatherStats, WeatherDetails, WeatherStats
+from weather.serializer import (
+    WeatherDetailsValuesSerializer,
+    WeatherStatsValuesSerializer,
+)
+
+
+logger = logging.getLogger("corteva_api")
+
+CHANNEL = "weather_updates"
+WEATHER_DETAILS = "weather_details"
+WEATHER_STATS = "weather_stats"
+# `NOTIFY` payloads must stay under 8000 bytes.
+MAX_PAYLOAD_SIZE = 7900
+# Seconds between attempts to (re)connect the listener.
+RECONNECT_DELAY = 5
+
+
+def notify(payload, using=DEFAULT_DB_ALIAS):
+    """Notify listeners of `CHANNEL` once the current transaction commits.
+
+    Station lists too long for a payload are dropped, listeners then treat
+    the update as touching every station.
+
+    Args:
+        payload (:dict): Notification, with a `type` and `stations` list.
+        using (:string): Database alias written to.
+
+    Returns:
+        :bool: True if a notification was sent, only on PostgreSQL.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    data = orjson.dumps(payload)
+    if len(data) > MAX_PAYLOAD_SIZE:
+        data = orjson.dumps({**payload, "stations": None})
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, data.decode()])
+    return True
+
+
+def notify_weather_details(batch, stations, start, end, using=DEFAULT_DB_ALIAS):
+    """Notify the records written by an `IngestBatch`.
+
+    Args:
+        batch (:int): Id of the batch which inserted or updated the records.
+        stations (:iterable): Codes of the stations written.
+        start (:date): First record date written.
+        end (:date): Last record date written.
+        using (:string): Database alias written to.
+    """
+    return notify(
+        {
+            "type": WEATHER_DETAILS,
+            "batch": batch,
+            "stations": sorted(stations),
+            "start": start,
+            "end": end,
+        },
+        using=using,
+    )
+
+
+def notify_weather_stats(generation, stations=None, using=DEFAULT_DB_ALIAS):
+    """Notify refreshed `WeatherStats`.
+
+    Args:
+        generation (:int): Generation of the stats, None for the materialized
+            view.
+        stations (:iterable): Codes of the stations refreshed, None for all.
+        using (:string): Database alias written to.
+    """
+    return notify(
+        {
+            "type": WEATHER_STATS,
+            "generation": generation,
+            "stations": None if stations is None else sorted(stations),
+        },
+        using=using,
+    )
+
+
+class Subscription:
+    """Stations a websocket client follows, with its bounded message queue.
+
+    A client too slow to drain its queue is not allowed to hold messages
+    back: once the queue is full it is cleared and ends with `None`, after
+    which the client is disconnected and should resync from the REST API.
+    """
+
+    def __init__(self, stations=(), queue_size=None):
+        self.stations = set(stations)
+        self.queue = asyncio.Queue(queue_size or settings.WEATHER_FEED_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, message):
+        """Queue `message` without waiting, overflowing when the queue is full."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+def _fetch_weather_details(event, stations):
+    queryset = WeatherDetails.objects.filter(
+        updated_batch_id=event["batch"],
+        station__code__in=stations,
+        record_date__gte=event["start"],
+        record_date__lte=event["end"],
+    )
+    serializer = WeatherDetailsValuesSerializer
+    return serializer.to_representation(serializer.values_list(queryset))
+
+
+def _fetch_weather_stats(event, stations):
+    if settings.WEATHER_STATS_BACKEND == "materialized_view":
+        queryset = MaterializedWeatherStats.objects.all()
+    else:
+        queryset = WeatherStats.objects.current()
+    queryset = queryset.filter(weather_station__in=stations)
+    serializer = WeatherStatsValuesSerializer
+    return serializer.to_representation(serializer.values_list(queryset))
+
+
+FETCHERS = {
+    WEATHER_DETAILS: (_fetch_weather_details, "records"),
+    WEATHER_STATS: (_fetch_weather_stats, "stats"),
+}
+
+
+class WeatherFeed:
+    """Fan out weather notifications to the subscriptions of this process."""
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.subscriptions = set()
+        self._listener = None
+
+    def subscribe(self, subscription):
+        """Start delivering messages to `subscription`."""
+        self.subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription):
+        """Stop delivering messages to `subscription`."""
+        self.subscriptions.discard(subscription)
+
+    def start(self):
+        """Start the `LISTEN` connection of this process, on PostgreSQL only."""
+        if self._listener is None and connections[self.using].vendor == "postgresql":
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def publish(self, event):
+        """Fetch the data of a notification once and push it to subscriptions.
+
+        Args:
+            event (:dict): Notification payload, see `notify`.
+        """
+        fetch, key = FETCHERS[event["type"]]
+        subscribed = set().union(*(s.stations for s in self.subscriptions))
+        if event["stations"] is not None:
+            subscribed &= set(event["stations"])
+        if not subscribed:
+            return
+        rows = await sync_to_async(fetch)(event, subscribed)
+        for subscription in list(self.subscriptions):
+            matched = [
+                row for row in rows if row["weather_station"] in subscription.stations
+            ]
+            if matched:
+                subscription.push({"type": event["type"], key: matched})
+
+    async def _listen(self):
+        """Listen to `CHANNEL`, reconnecting whenever the connection is lost."""
+        loop = asyncio.get_running_loop()
+        while True:
+            notified = asyncio.Queue()
+            try:
+                connection = await sync_to_async(self._connect)()
+            except Exception:
+                logger.exception(f"Failed to listen to {CHANNEL}")
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            def read():
+                try:
+                    connection.poll()
+                except Exception as error:
+                    notified.put_nowait(error)
+                    return
+                while connection.notifies:
+                    notified.put_nowait(connection.notifies.pop(0).payload)
+
+            loop.add_reader(connection.fileno(), read)
+            try:
+                while True:
+                    payload = await notified.get()
+                    if isinstance(payload, Exception):
+                        raise payload
+                    try:
+                        await self.publish(orjson.loads(payload))
+                    except Exception:
+                        logger.exception(f"Failed to publish {payload}")
+            except Exception:
+                logger.exception(f"Lost the {CHANNEL} listener connection")
+            finally:
+                loop.remove_reader(connection.fileno())
+                connection.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _connect(self):
+        wrapper = connections[self.using]
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        logger.info(f"Listening to {CHANNEL}")
+        return connection
+
+
+# Feed of the process, started by the first websocket subscription.
+weather_feed = WeatherFeed()
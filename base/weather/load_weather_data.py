@@ -0,0 +1,318 @@
+"""Loaders to write parsed weather records into the `WeatherDetails` model."""
+# Standard Library
+import logging
+
+# Django Libraries
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# Project Libraries
+from core.models import IngestBatch, StaleWeatherStats, Station, WeatherDetails
+from weather.live_feed import notify_weather_details
+
+
+logger = logging.getLogger("corteva_api")
+
+# Columns written from each parsed weather record, in record order.
+RECORD_COLUMNS = ("weather_station", "record_date", "max_temp", "min_temp", "precip")
+
+
+def station_id(file_name):
+    """Derive the station code from the name of a weather record file.
+
+    Args:
+        file_name (:string): Weather record file name, e.g. `USC00110072.txt`.
+
+    Returns:
+        :string: Station code stored in `Station.code`.
+    """
+    return file_name.strip(".txt").strip("USC")
+
+
+def mark_stale_stats(pairs, batch, using=DEFAULT_DB_ALIAS):
+    """Record station-years whose `WeatherStats` need to be recomputed.
+
+    Station-years already marked are marked again by `batch`, so a refresh
+    which read the previous mark keeps them for its next run.
+
+    Args:
+        pairs (:iterable): (station, year) pairs with new or changed records.
+        batch (:IngestBatch): Batch which wrote the records.
+        using (:string): Database alias to write to.
+    """
+    StaleWeatherStats.objects.using(using).bulk_create(
+        [
+            StaleWeatherStats(weather_station=s, year=y, marked_batch=batch)
+            for s, y in set(pairs)
+        ],
+        update_conflicts=True,
+        unique_fields=["weather_station", "year"],
+        update_fields=["marked_batch"],
+    )
+
+
+class RecordStream:
+    """Read-only file like object rendering records as `COPY` text rows.
+
+    Rows are rendered lazily while psycopg2 reads from the stream, so the
+    records never need to be held in memory all at once.
+    """
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self._buffer = ""
+        self.rows = 0
+
+    def _render(self, record):
+        file_name, r_date, max_t, min_t, precip = record
+        self.rows += 1
+        return f"{station_id(file_name)}\t{r_date}\t{max_t}\t{min_t}\t{precip}\n"
+
+    def read(self, size=-1):
+        """Return at most `size` characters of rendered rows."""
+        lines, length = [self._buffer], len(self._buffer)
+        for record in self._records:
+            line = self._render(record)
+            lines.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(lines)
+        if 0 <= size < len(data):
+            data, self._buffer = data[:size], data[size:]
+        else:
+            self._buffer = ""
+        return data
+
+
+class OrmWeatherLoader:
+    """Upsert weather records through the ORM, works on every database.
+
+    Records are written in chunks of `batch_size`: the stored records of a
+    chunk are fetched in one query, new records are inserted with
+    `bulk_create` and changed ones updated with `bulk_update`. Each chunk
+    writing rows is recorded as one `IngestBatch`.
+    """
+
+    name = "orm"
+    fields = ("max_temp", "min_temp", "precip")
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=1000):
+        self.using = using
+        self.batch_size = batch_size
+        self._stations = {}
+
+    def load(self, records):
+        """Insert new records and update the changed ones.
+
+        Args:
+            records (:iterable): Tuples of measurements in tenths, as returned
+                by `parse_weather_records(..., tenths=True)`.
+
+        Returns:
+            :int: Number of records written.
+        """
+        total, chunk = 0, {}
+        for file_name, r_date, max_t, min_t, precip in records:
+            # Later records for the same station and day replace earlier ones.
+            chunk[(station_id(file_name), r_date)] = (max_t, min_t, precip)
+            if len(chunk) == self.batch_size:
+                total += self._upsert(chunk)
+                chunk = {}
+        if chunk:
+            total += self._upsert(chunk)
+        return total
+
+    def station_ids(self, codes):
+        """Return the `Station` ids of the given codes, creating missing ones.
+
+        Args:
+            codes (:iterable): Station codes.
+
+        Returns:
+            :dict: Station id by station code.
+        """
+        missing = set(codes) - self._stations.keys()
+        if missing:
+            stations = Station.objects.using(self.using)
+            stations.bulk_create(
+                [Station(code=code) for code in sorted(missing)],
+                ignore_conflicts=True,
+            )
+            self._stations.update(
+                stations.filter(code__in=missing).values_list("code", "id")
+            )
+        return self._stations
+
+    def _upsert(self, chunk):
+        manager = WeatherDetails.objects.using(self.using)
+        stations = self.station_ids({code for code, _ in chunk})
+        dates = [r_date for _, r_date in chunk]
+        stored = {
+            (obj.station_id, obj.record_date): obj
+            for obj in manager.filter(
+                station__in={stations[code] for code, _ in chunk},
+                record_date__gte=min(dates),
+                record_date__lte=max(dates),
+            ).only("station", "record_date", *self.fields)
+        }
+        new, changed, stale = [], [], set()
+        for (code, r_date), values in chunk.items():
+            obj = stored.get((stations[code], r_date))
+            if obj is None:
+                new.append(
+                    WeatherDetails(
+                        station_id=stations[code],
+                        record_date=r_date,
+                        **dict(zip(self.fields, values)),
+                    )
+                )
+            elif tuple(getattr(obj, field) for field in self.fields) != values:
+                for field, value in zip(self.fields, values):
+                    setattr(obj, field, value)
+                changed.append(obj)
+            else:
+                continue
+            stale.add((code, r_date.year))
+        if not stale:
+            return len(chunk)
+
+        with transaction.atomic(using=self.using):
+            batch = IngestBatch.objects.using(self.using).create()
+            for obj in new:
+                obj.created_batch = batch
+            for obj in new + changed:
+                obj.updated_batch = batch
+            manager.bulk_create(new, batch_size=self.batch_size)
+            manager.bulk_update(
+                changed, [*self.fields, "updated_batch"], batch_size=self.batch_size
+            )
+            mark_stale_stats(stale, batch, using=self.using)
+            written = [obj.record_date for obj in new + changed]
+            notify_weather_details(
+                batch.pk,
+                {code for code, _ in stale},
+                min(written),
+                max(written),
+                using=self.using,
+            )
+        return len(chunk)
+
+
+class CopyWeatherLoader:
+    """Stream weather records into PostgreSQL with `COPY FROM STDIN`.
+
+    Records are copied into a temporary staging table and merged into the
+    `WeatherDetails` table with a single `INSERT ... ON CONFLICT DO UPDATE`,
+    which replaces the measurements of records already stored for the same
+    station and day. Station-years of the rows actually inserted or changed
+    are marked stale in the same statement, and the live feed is notified
+    of the batch when it commits.
+    """
+
+    name = "copy"
+    staging_table = "weather_details_staging"
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def load(self, records):
+        """Insert new records and update the changed ones.
+
+        Args:
+            records (:iterable): Tuples of measurements in tenths, as returned
+                by `parse_weather_records(..., tenths=True)`.
+
+        Returns:
+            :int: Number of records written.
+        """
+        connection = connections[self.using]
+        qn = connection.ops.quote_name
+        fields = [
+            Station._meta.get_field("code"),
+            *(WeatherDetails._meta.get_field(name) for name in RECORD_COLUMNS[1:]),
+        ]
+        columns = ", ".join(qn(name) for name in RECORD_COLUMNS)
+        table = qn(WeatherDetails._meta.db_table)
+        stations = qn(Station._meta.db_table)
+        stale = qn(StaleWeatherStats._meta.db_table)
+        code, record_date = qn("weather_station"), qn("record_date")
+        measurements = [qn(name) for name in OrmWeatherLoader.fields]
+        staging = qn(self.staging_table)
+        stream = RecordStream(records)
+
+        with transaction.atomic(using=self.using), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} ("
+                + ", ".join(
+                    f"{qn(name)} {field.db_type(connection)}"
+                    for name, field in zip(RECORD_COLUMNS, fields)
+                )
+                + ", line bigint GENERATED ALWAYS AS IDENTITY) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN", stream)
+            cursor.execute(
+                f"INSERT INTO {stations} (code) SELECT DISTINCT {code} "
+                f"FROM {staging} ORDER BY 1 ON CONFLICT (code) DO NOTHING"
+            )
+            batch = IngestBatch.objects.using(self.using).create()
+            # `DISTINCT ON` keeps the last line copied for each station and day.
+            cursor.execute(
+                f"WITH merged AS ("
+                f"INSERT INTO {table} AS stored (station_id, {record_date}, "
+                f"{', '.join(measurements)}, created_batch_id, updated_batch_id) "
+                f"SELECT DISTINCT ON (station.id, staged.{record_date}) station.id, "
+                f"staged.{record_date}, "
+                + ", ".join(f"staged.{c}" for c in measurements)
+                + f", %s, %s FROM {staging} staged "
+                f"JOIN {stations} station ON station.code = staged.{code} "
+                f"ORDER BY station.id, staged.{record_date}, staged.line DESC "
+                f"ON CONFLICT (station_id, {record_date}) DO UPDATE SET "
+                + ", ".join(f"{c} = EXCLUDED.{c}" for c in measurements)
+                + ", updated_batch_id = EXCLUDED.updated_batch_id "
+                f"WHERE ({', '.join(f'stored.{c}' for c in measurements)}) "
+                f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in measurements)}) "
+                f"RETURNING stored.station_id, stored.{record_date}"
+                f"), marked AS ("
+                f"INSERT INTO {stale} (weather_station, year, created_on, "
+                "marked_batch_id) "
+                f"SELECT DISTINCT station.code, EXTRACT(YEAR FROM merged.{record_date}), "
+                f"now(), %s FROM merged JOIN {stations} station "
+                f"ON station.id = merged.station_id "
+                "ON CONFLICT (weather_station, year) DO UPDATE "
+                "SET marked_batch_id = EXCLUDED.marked_batch_id"
+                f") SELECT count(*), array_agg(DISTINCT station.code), "
+                f"min(merged.{record_date}), max(merged.{record_date}) "
+                f"FROM merged JOIN {stations} station ON station.id = merged.station_id",
+                [batch.pk, batch.pk, batch.pk],
+            )
+            written, codes, start, end = cursor.fetchone()
+            if written:
+                notify_weather_details(batch.pk, codes, start, end, using=self.using)
+            else:
+                batch.delete()
+            logger.info(f"Copied {stream.rows} records")
+            cursor.execute(f"TRUNCATE {staging}")
+        return stream.rows
+
+
+WEATHER_LOADERS = {
+    OrmWeatherLoader.name: OrmWeatherLoader,
+    CopyWeatherLoader.name: CopyWeatherLoader,
+}
+
+
+def get_weather_loader(backend="auto", using=DEFAULT_DB_ALIAS):
+    """Return the loader for the given backend.
+
+    Args:
+        backend (:string): One of `auto`, `copy` or `orm`. `auto` uses `copy`
+            on PostgreSQL and falls back to `orm` on other databases.
+        using (:string): Database alias to write to.
+
+    Returns:
+        :object: Loader instance exposing `load(records)`.
+    """
+    if backend == "auto":
+        is_postgres = connections[using].vendor == "postgresql"
+        backend = CopyWeatherLoader.name if is_postgres else OrmWeatherLoader.name
+    return WEATHER_LOADERS[backend](using=using)
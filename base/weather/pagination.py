@@ -0,0 +1,188 @@
+"""Pagination for the `api/weather` API endpoint."""
+# Standard Library
+import base64
+import json
+
+from collections import OrderedDict
+from datetime import date
+
+# Django Libraries
+from django.db.models import BooleanField, F, Func, Value
+
+# 3rd Party Libraries
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowComparison(Func):
+    """Row value comparison, e.g. `(station_id, record_date, id) > (%s, %s, %s)`.
+
+    Compared as a whole, the row matches a multi-column index range scan
+    instead of the `OR` of per-column conditions.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, fields, values, operator=">"):
+        self.operator = operator
+        super().__init__(*map(F, fields), *map(Value, values))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        size = len(sqls) // 2
+        sql = f"({', '.join(sqls[:size])}) {self.operator} ({', '.join(sqls[size:])})"
+        return sql, params
+
+
+class WeatherDetailsPagination(PageNumberPagination):
+    """Page number pagination with an opt-in keyset (cursor) mode.
+
+    Page number mode is kept for existing clients. Passing
+    `?pagination=keyset`, or a `cursor` returned by a previous page, walks the
+    records ordered by `(station_id, record_date, id)` instead: each page
+    starts right after the last record of the previous one, so it costs the
+    same index range scan however deep it is. No total count is computed
+    unless asked for with `?count=true`.
+
+    Stations get increasing ids in code order as they are first ingested.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("station_id", "record_date", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def is_keyset(self, request):
+        """Check whether `request` asks for keyset pagination."""
+        return (
+            request.query_params.get(self.mode_query_param) == "keyset"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.is_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.count = None
+        if request.query_params.get(self.count_query_param) == "true":
+            self.count = queryset.count()
+
+        ordering = [f"-{field}" if reverse else field for field in self.ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            operator = "<" if reverse else ">"
+            queryset = queryset.filter(RowComparison(self.ordering, position, operator))
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        first, last = (results[0], results[-1]) if results else (None, None)
+        # Moving backwards always came from a later page, and forwards from
+        # an earlier one when a cursor was given.
+        has_next = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self.get_position(last) if has_next and last else None
+        self.previous_position = (
+            self.get_position(first) if has_previous and first else None
+        )
+        return results
+
+    def get_position(self, obj):
+        """Ordering values of `obj`, the position a cursor points at."""
+        return [getattr(obj, field) for field in self.ordering]
+
+    def encode_cursor(self, position, reverse=False):
+        """Return the url of the page after (or before) `position`."""
+        station, record_date, id_ = position
+        payload = json.dumps([station, record_date.isoformat(), id_, int(reverse)])
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return the position and direction of the cursor in `request`.
+
+        Raises:
+            NotFound: If the cursor can not be decoded.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            station, record_date, id_, reverse = payload
+            position = [int(station), date.fromisoformat(record_date), int(id_)]
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(reverse)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        response = OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+        if self.count is not None:
+            response["count"] = self.count
+            response.move_to_end("count", last=False)
+        return Response(response)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `keyset` for cursor pagination.",
+                "schema": {"type": "string", "enum": ["keyset"]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor of the page, from `next` or `previous`.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count in keyset mode.",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,331 @@
+"""Declarative range partitioning of the `WeatherDetails` table on PostgreSQL.
+
+The table is partitioned by `record_date`, one partition per year or decade,
+plus a default partition catching records outside of every partition. Range
+filters on `record_date` only scan the matching partitions, and old years can
+be detached as plain tables without rewriting the rest of the data.
+"""
+# Standard Library
+import logging
+
+# Django Libraries
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+# Project Libraries
+from core.models import MaterializedWeatherStats, WeatherDetails
+
+
+logger = logging.getLogger("corteva_api")
+
+# Years covered by a single partition, by partitioning interval.
+PARTITION_INTERVALS = {"year": 1, "decade": 10}
+
+
+def partition_bounds(year, interval="year"):
+    """Return the years bounding the partition which holds `year`.
+
+    Args:
+        year (:int): Year of a record date.
+        interval (:string): One of `PARTITION_INTERVALS`.
+
+    Returns:
+        :tuple: First year of the partition and first year after it.
+    """
+    span = PARTITION_INTERVALS[interval]
+    start = year - year % span
+    return start, start + span
+
+
+def partition_name(start, table=None):
+    """Name of the partition starting at the year `start`."""
+    return f"{table or WeatherDetails._meta.db_table}_p{start}"
+
+
+def default_partition_name(table=None):
+    """Name of the partition catching records outside of every partition."""
+    return f"{table or WeatherDetails._meta.db_table}_default"
+
+
+def is_partitioned(using=DEFAULT_DB_ALIAS, table=None):
+    """Check whether the `WeatherDetails` table is a partitioned table.
+
+    Args:
+        using (:string): Database alias to inspect.
+        table (:string): Table name, defaults to the `WeatherDetails` table.
+
+    Returns:
+        :bool: True on PostgreSQL once the table has been partitioned.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s))",
+            [table or WeatherDetails._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def _create_partition(cursor, qn, table, start, end):
+    """Create and attach the partition `[start, end)` unless it exists.
+
+    Records of the range already caught by the default partition are moved
+    into the new partition before it is attached.
+
+    Raises:
+        ValueError: If a table which is not a partition has the same name.
+    """
+    name, default = partition_name(start, table), default_partition_name(table)
+    cursor.execute(
+        "SELECT to_regclass(%s), to_regclass(%s), EXISTS (SELECT 1 FROM pg_inherits "
+        "WHERE inhrelid = to_regclass(%s) AND inhparent = to_regclass(%s))",
+        [name, default, name, table],
+    )
+    exists, has_default, attached = cursor.fetchone()
+    if attached:
+        return False
+    if exists:
+        raise ValueError(f"{name} exists but is not a partition of {table}")
+    cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)")
+    if has_default:
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(default)} "
+            "WHERE record_date >= %s AND record_date < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [f"{start:04d}-01-01", f"{end:04d}-01-01"],
+        )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+        f"FOR VALUES FROM ('{start:04d}-01-01') TO ('{end:04d}-01-01')"
+    )
+    return True
+
+
+def create_weather_partitions(
+    start_year, end_year, interval="year", using=DEFAULT_DB_ALIAS
+):
+    """Create the partitions covering `start_year` up to `end_year`.
+
+    Args:
+        start_year (:int): First year to cover.
+        end_year (:int): Last year to cover.
+        interval (:string): One of `PARTITION_INTERVALS`.
+        using (:string): Database alias to write to.
+
+    Returns:
+        :list: Names of the partitions created.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = WeatherDetails._meta.db_table
+    start, _ = partition_bounds(start_year, interval)
+    created = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for year in range(start, end_year + 1, PARTITION_INTERVALS[interval]):
+            start, end = partition_bounds(year, interval)
+            if _create_partition(cursor, qn, table, start, end):
+                created.append(partition_name(start, table))
+    logger.info(f"Created {len(created)} partitions of {table}")
+    return created
+
+
+def detach_weather_partition(year, interval="year", drop=False, using=DEFAULT_DB_ALIAS):
+    """Detach the partition holding `year` from the `WeatherDetails` table.
+
+    Detaching only updates the catalog, the records are kept in a standalone
+    table which can be archived or dropped. The table is renamed with the
+    detach time, so the partition can be created again for new records.
+    `WeatherStats` already computed for the detached years are kept until
+    the next full `analyze_weather`.
+
+    Args:
+        year (:int): Any year of the partition.
+        interval (:string): One of `PARTITION_INTERVALS`.
+        drop (:bool): Drop the detached table as well.
+        using (:string): Database alias to write to.
+
+    Returns:
+        :string: Name of the detached table.
+
+    Raises:
+        ValueError: If no partition holds `year`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = WeatherDetails._meta.db_table
+    name = partition_name(partition_bounds(year, interval)[0], table)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_inherits "
+            "WHERE inhrelid = to_regclass(%s) AND inhparent = to_regclass(%s))",
+            [name, table],
+        )
+        if not cursor.fetchone()[0]:
+            raise ValueError(f"No partition of {table} holds {year}")
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        else:
+            detached = f"{name}_detached_{timezone.now():%Y%m%d%H%M%S}"
+            cursor.execute(f"ALTER TABLE {qn(name)} RENAME TO {qn(detached)}")
+            name = detached
+    logger.info(f"Detached {name}{' and dropped it' if drop else ''}")
+    return name
+
+
+def _drop_materialized_view(cursor, qn):
+    """Drop the stats materialized view, returning the SQL to recreate it."""
+    view = MaterializedWeatherStats._meta.db_table
+    cursor.execute("SELECT to_regclass(%s)", [view])
+    if cursor.fetchone()[0] is None:
+        return []
+    cursor.execute("SELECT pg_get_viewdef(to_regclass(%s))", [view])
+    definition = cursor.fetchone()[0].strip().rstrip(";")
+    cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = %s", [view])
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"DROP MATERIALIZED VIEW {qn(view)}")
+    return [f"CREATE MATERIALIZED VIEW {qn(view)} AS {definition}", *indexes]
+
+
+def _rebuild_table(schema_editor, model, partition_by=None):
+    """Copy the records of `model` into a new table with the same columns.
+
+    The new table is partitioned by `record_date` when `partition_by` is set
+    and keeps the primary key, foreign keys, constraints, indexes and the id
+    sequence of the original table, which is dropped afterwards. Ids are
+    identity columns from Django 4.1 on, serial columns before: the identity
+    is recreated at the same position, a serial sequence changes owner.
+
+    Returns:
+        :int: Number of records copied.
+    """
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    previous = f"{table}_previous"
+    pk = model._meta.pk.column
+    key = [pk, "record_date"] if partition_by else [pk]
+
+    with connection.cursor() as cursor:
+        # Deferred foreign key checks pending on the table would block the
+        # DDL below, and the copied rows would leave checks pending for the
+        # constraints and indexes added afterwards.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        views = _drop_materialized_view(cursor, qn)
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(previous)}")
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')",
+            [previous],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {qn(previous)} DROP CONSTRAINT {qn(name)}")
+        for index in model._meta.indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {qn(index.name)}")
+
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(previous)} INCLUDING DEFAULTS "
+            "INCLUDING IDENTITY, "
+            f"PRIMARY KEY ({', '.join(map(qn, key))}))"
+            + (f" PARTITION BY RANGE ({qn('record_date')})" if partition_by else "")
+        )
+        for field in model._meta.concrete_fields:
+            if field.remote_field:
+                target = field.target_field
+                cursor.execute(
+                    f"ALTER TABLE {qn(table)} ADD CONSTRAINT "
+                    f"{qn(f'{table}_{field.column}_fk')} FOREIGN KEY "
+                    f"({qn(field.column)}) REFERENCES "
+                    f"{qn(target.model._meta.db_table)} ({qn(target.column)})"
+                    f"{connection.ops.deferrable_sql()}"
+                )
+        if partition_by:
+            cursor.execute(
+                f"CREATE TABLE {qn(default_partition_name(table))} "
+                f"PARTITION OF {qn(table)} DEFAULT"
+            )
+            cursor.execute(
+                "SELECT EXTRACT(YEAR FROM MIN(record_date))::integer, "
+                f"EXTRACT(YEAR FROM MAX(record_date))::integer FROM {qn(previous)}"
+            )
+            first, last = cursor.fetchone()
+            this_year = timezone.now().year
+            for year in range(
+                partition_bounds(first or this_year, partition_by)[0],
+                max(last or this_year, this_year) + 2,
+                PARTITION_INTERVALS[partition_by],
+            ):
+                _create_partition(
+                    cursor, qn, table, *partition_bounds(year, partition_by)
+                )
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(previous)}")
+        rows = cursor.rowcount
+        cursor.execute(
+            "SELECT pg_get_serial_sequence(%s, %s), attidentity <> '' "
+            "FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = %s",
+            [previous, pk, previous, pk],
+        )
+        sequence, identity = cursor.fetchone()
+        if sequence and identity:
+            # Identity sequences can't change owner, `LIKE` gave the new table
+            # its own: carry on from the position of the previous one.
+            cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, %s), %s, %s)",
+                [table, pk, *cursor.fetchone()],
+            )
+        elif sequence:
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.{qn(pk)}")
+        cursor.execute(f"DROP TABLE {qn(previous)}")
+
+    for constraint in model._meta.constraints:
+        schema_editor.add_constraint(model, constraint)
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        for statement in views:
+            cursor.execute(statement)
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+    return rows
+
+
+def partition_weather_details(schema_editor, model=WeatherDetails, interval="year"):
+    """Convert the `WeatherDetails` table into a range partitioned table.
+
+    Partitions are created for every stored year up to next year. The
+    primary key becomes `(id, record_date)`, as PostgreSQL requires the
+    partition key in unique constraints; ids stay unique through their
+    sequence.
+
+    Args:
+        schema_editor (:BaseDatabaseSchemaEditor): Schema editor to use.
+        model (:Model): `WeatherDetails` model, historical in migrations.
+        interval (:string): One of `PARTITION_INTERVALS`.
+
+    Returns:
+        :int: Number of records copied into the partitions.
+    """
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Unknown partition interval {interval!r}")
+    rows = _rebuild_table(schema_editor, model, partition_by=interval)
+    logger.info(f"Partitioned {model._meta.db_table} by {interval}, {rows} records")
+    return rows
+
+
+def unpartition_weather_details(schema_editor, model=WeatherDetails):
+    """Convert the partitioned `WeatherDetails` table back into a plain table.
+
+    Args:
+        schema_editor (:BaseDatabaseSchemaEditor): Schema editor to use.
+        model (:Model): `WeatherDetails` model, historical in migrations.
+
+    Returns:
+        :int: Number of records copied.
+    """
+    rows = _rebuild_table(schema_editor, model)
+    logger.info(f"Converted {model._meta.db_table} back to a plain table")
+    return rows
@@ -1,68 +1,355 @@
 """Script to process data received from the wrike api."""
 # Standard Library
+import io
 import logging
 import os
 
 from datetime import datetime
-from multiprocessing import Pool, cpu_count
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool, Process, Queue, cpu_count
+from typing import NamedTuple, Optional
+
+# 3rd Party Libraries
+import numpy as np
 
 
 logger = logging.getLogger("corteva_api")
 
+# Records per batch handed over by the streaming workers.
+DEFAULT_BATCH_SIZE = 5000
+# Memory (in MB) the batches in flight between workers and writer may use.
+DEFAULT_MEMORY_BUDGET = 64
+# Approximate size (in bytes) of one parsed record tuple, used to size queues.
+RECORD_SIZE = 200
+# Value used in weather record files for missing measurements.
+MISSING_VALUE = -9999
+
+
+class FileSlice(NamedTuple):
+    """Byte range of a weather record file to process."""
+
+    file_path: str
+    offset: int = 0
+    end: Optional[int] = None
+
+
+def as_file_slice(item):
+    """Return `item` as a `FileSlice`, plain paths cover the whole file."""
+    return FileSlice(item) if isinstance(item, str) else item
+
+
+class RecordBatch(NamedTuple):
+    """Batch of parsed records from a single weather record file."""
+
+    file_path: str
+    records: list
+    last: bool
+
+
+class WeatherColumns(NamedTuple):
+    """Column arrays parsed from a single weather record file."""
+
+    file_name: str
+    record_date: np.ndarray
+    max_temp: np.ndarray
+    min_temp: np.ndarray
+    precip: np.ndarray
+
+    @property
+    def size(self):
+        """Number of records held by the columns."""
+        return len(self.record_date)
+
+    def records(self, start=0, stop=None, tenths=False):
+        """Convert a slice of the columns to weather record tuples.
+
+        Args:
+            start (:int): Index of the first record.
+            stop (:int): Index after the last record, defaults to the end.
+            tenths (:bool): Keep measurements as integer tenths, as stored in
+                `WeatherDetails`, instead of scaling them down by 10.
+
+        Returns:
+            :list: List of tuple, as returned by `process_weather_record`.
+        """
+        window = slice(start, stop)
+        measurements = (self.max_temp, self.min_temp, self.precip)
+        if not tenths:
+            measurements = (column / 10 for column in measurements)
+        return [
+            (self.file_name, *record)
+            for record in zip(
+                self.record_date[window].tolist(),
+                *(column[window].tolist() for column in measurements),
+            )
+        ]
+
 
 def read_files():
-    """Fetch Locally stored weather files."""
-    return [
+    """Fetch Locally stored weather files, sorted by path."""
+    return sorted(
         os.path.join(location, file)
         for location in filter(
             lambda x: os.path.exists(x),
             map(lambda x: os.path.join(x, "wx_data"), (".", "../")),
         )
         for file in os.listdir(location)
-    ]
+    )
 
 
-def process_weather_record(file_path):
-    """Read and parse individual weather record file.
+def iter_weather_record(file_path):
+    """Read and parse individual weather record file line by line.
 
     Args:
         file_path (:string): Actual file path of weather record.
 
-    Returns:
-        :list: List of tuple for each line of weather record.
+    Yields:
+        :tuple: Parsed weather record for each line of the file.
     """
-    records_list = []
     if os.path.exists(file_path):
         file_name = file_path.split("/")[-1]
         with open(file_path) as fp:
             logger.info(f"Processing file: {file_path}")
-            for line in fp.readlines():
+            for line in fp:
                 year, max_t, min_t, p = line.split("\t")
-                records_list.append(
-                    (
-                        file_name,
-                        datetime.strptime(year, "%Y%m%d").date(),
-                        float(max_t) / 10,
-                        float(min_t) / 10,
-                        float(p) / 10,
-                    )
+                yield (
+                    file_name,
+                    datetime.strptime(year, "%Y%m%d").date(),
+                    float(max_t) / 10,
+                    float(min_t) / 10,
+                    float(p) / 10,
                 )
             logger.info(f"Finished processing {file_path}")
     else:
         logger.critical(f"File does not exists {file_path}")
-    return records_list
 
 
-def prepare_weather_records():
+def process_weather_record(file_path):
+    """Read and parse individual weather record file.
+
+    Args:
+        file_path (:string): Actual file path of weather record.
+
+    Returns:
+        :list: List of tuple for each line of weather record.
+    """
+    return list(iter_weather_record(file_path))
+
+
+def decode_dates(values):
+    """Convert `YYYYMMDD` integers to dates without parsing strings.
+
+    Args:
+        values (:np.ndarray): Integer array of `YYYYMMDD` values.
+
+    Returns:
+        :np.ndarray: `datetime64[D]` array of the same shape.
+    """
+    years = (values // 10000 - 1970).astype("datetime64[Y]")
+    months = years.astype("datetime64[M]") + (values // 100 % 100 - 1)
+    return months.astype("datetime64[D]") + (values % 100 - 1)
+
+
+def parse_weather_buffer(file_name, data):
+    """Parse the content of a weather record file in one vectorized pass.
+
+    Args:
+        file_name (:string): Weather record file name.
+        data (:bytes): Tab separated lines of date, max temp, min temp and
+            precipitation.
+
+    Returns:
+        :WeatherColumns: Column arrays, measurements in integer tenths as
+            found in the file.
+    """
+    if data.strip():
+        table = np.loadtxt(io.BytesIO(data), dtype=np.int64, ndmin=2)
+    else:
+        table = np.empty((0, 4), dtype=np.int64)
+    return WeatherColumns(
+        file_name, decode_dates(table[:, 0]), table[:, 1], table[:, 2], table[:, 3]
+    )
+
+
+def parse_weather_file(file_path, offset=0, end=None):
+    """Read and parse individual weather record file into column arrays.
+
+    Vectorized counterpart of `process_weather_record`, converting
+    `parse_weather_file(path).records()` gives the same list of tuples.
+
+    Args:
+        file_path (:string): Actual file path of weather record.
+        offset (:int): Byte offset to start reading from, must be at the
+            start of a line.
+        end (:int): Byte offset to stop reading at, defaults to end of file.
+
+    Returns:
+        :WeatherColumns: Column arrays for the weather record.
+    """
+    file_name = file_path.split("/")[-1]
+    if not os.path.exists(file_path):
+        logger.critical(f"File does not exists {file_path}")
+        return parse_weather_buffer(file_name, b"")
+    logger.info(f"Processing file: {file_path}")
+    with open(file_path, "rb") as fp:
+        fp.seek(offset)
+        data = fp.read() if end is None else fp.read(end - offset)
+    columns = parse_weather_buffer(file_name, data)
+    logger.info(f"Finished processing {file_path}")
+    return columns
+
+
+def iter_weather_columns(file_path, offset=0, end=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Read and parse a weather record file into column arrays, batch by batch.
+
+    Only `batch_size` lines of the file are read and parsed at a time, so
+    memory use does not depend on the size of the file.
+
+    Args:
+        file_path (:string): Actual file path of weather record.
+        offset (:int): Byte offset to start reading from, must be at the
+            start of a line.
+        end (:int): Byte offset to stop reading at, defaults to end of file.
+        batch_size (:int): Maximum number of records per batch.
+
+    Yields:
+        :tuple: `WeatherColumns` of at most `batch_size` records, and whether
+            they are the last of the file. A missing or empty file gives a
+            single batch of empty columns.
+    """
+    file_name = file_path.split("/")[-1]
+    if not os.path.exists(file_path):
+        logger.critical(f"File does not exists {file_path}")
+        yield parse_weather_buffer(file_name, b""), True
+        return
+    logger.info(f"Processing file: {file_path}")
+    with open(file_path, "rb") as fp:
+        fp.seek(offset)
+        remaining = (os.fstat(fp.fileno()).st_size if end is None else end) - offset
+        last = False
+        while not last:
+            data = b"".join(islice(fp, batch_size)) if remaining > 0 else b""
+            last = data.count(b"\n") < batch_size or len(data) >= remaining
+            data, remaining = data[: max(remaining, 0)], remaining - len(data)
+            yield parse_weather_buffer(file_name, data), last
+    logger.info(f"Finished processing {file_path}")
+
+
+def parse_weather_records(file_slice, tenths=False):
+    """Read and parse individual weather record file with the vectorized parser.
+
+    Args:
+        file_slice (:string or FileSlice): File path of weather record, or
+            the byte range of it to read.
+        tenths (:bool): Keep measurements as integer tenths.
+
+    Returns:
+        :list: List of tuple for each line of weather record.
+    """
+    return parse_weather_file(*as_file_slice(file_slice)).records(tenths=tenths)
+
+
+def prepare_weather_records(file_paths=None, tenths=False):
     """Read and process weather records from each station in parallel.
 
+    Args:
+        file_paths (:list): File paths or `FileSlice` items to process,
+            defaults to `read_files()`.
+        tenths (:bool): Keep measurements as integer tenths.
+
     Returns:
         :list: List of Lists of tuple for all weather records from each station.
     """
+    file_paths = read_files() if file_paths is None else file_paths
     total_process = cpu_count()
     logger.info(f"Using total: {total_process} of process")
     with Pool(total_process) as p:
         all_records_list = [
-            record for record in p.map(process_weather_record, read_files())
+            record
+            for record in p.map(
+                partial(parse_weather_records, tenths=tenths), file_paths
+            )
         ]
     return all_records_list
+
+
+def _stream_worker(file_paths, batch_size, queue, tenths=False):
+    """Parse weather record files and put fixed size batches on the queue.
+
+    Files are read one batch at a time, so a worker only holds the batch
+    being parsed. A `None` sentinel is always put last, so the reader knows
+    the worker is done even when parsing failed.
+    """
+    try:
+        for file_slice in map(as_file_slice, file_paths):
+            for columns, last in iter_weather_columns(*file_slice, batch_size):
+                records = columns.records(tenths=tenths)
+                queue.put(RecordBatch(file_slice.file_path, records, last))
+    except Exception as exc:
+        queue.put(exc)
+    finally:
+        queue.put(None)
+
+
+def stream_weather_records(
+    file_paths=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+    processes=None,
+    tenths=False,
+):
+    """Read and process weather records in parallel, yielding fixed size batches.
+
+    Workers read and parse `batch_size` lines at a time and put the batches
+    on a bounded queue sized from `memory_budget`, so they block once the
+    writer falls behind. Memory use stays constant however many and however
+    large the files are.
+
+    Args:
+        file_paths (:list): File paths or `FileSlice` items to process,
+            defaults to `read_files()`.
+        batch_size (:int): Maximum number of records per batch.
+        memory_budget (:int): Memory (in MB) batches in flight may use.
+        processes (:int): Number of worker processes, defaults to cpu count.
+        tenths (:bool): Keep measurements as integer tenths.
+
+    Yields:
+        :RecordBatch: Batch of records, `last` is set on the final batch of
+            each file.
+    """
+    file_paths = read_files() if file_paths is None else list(file_paths)
+    if not file_paths:
+        return
+    total_process = min(processes or cpu_count(), len(file_paths))
+    batch_memory = batch_size * RECORD_SIZE
+    # Every worker holds one batch being filled and the writer one being flushed.
+    queue_size = max(1, memory_budget * 2**20 // batch_memory - total_process - 1)
+    logger.info(f"Using total: {total_process} of process, queue of {queue_size}")
+
+    queue = Queue(maxsize=queue_size)
+    workers = [
+        Process(
+            target=_stream_worker,
+            args=(file_paths[index::total_process], batch_size, queue, tenths),
+            daemon=True,
+        )
+        for index in range(total_process)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        running = len(workers)
+        while running:
+            batch = queue.get()
+            if batch is None:
+                running -= 1
+            elif isinstance(batch, Exception):
+                raise batch
+            else:
+                yield batch
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
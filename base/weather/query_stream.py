@@ -0,0 +1,197 @@
+"""Websocket queries streaming large results in chunks, with flow control.
+
+A client sends `{"type": "query", "id": "q1", "filters": {...}}`, with the
+filters of `api/weather/` (or of `api/weather/stats/` for `"resource":
+"stats"`), and receives `{"type": "chunk", "id": "q1", "seq": 0, "records":
+[...]}` messages followed by `{"type": "done", "id": "q1", "records": total}`,
+or by `{"type": "error", "id": "q1", ...}` if the query fails.
+
+Records are read through a server-side cursor one chunk at a time, and a
+chunk is only read once the client granted a credit for it: queries start
+with `credits` chunks (1 by default), `{"type": "credit", "id": "q1",
+"credits": n}` grants more and `{"type": "cancel", "id": "q1"}` stops the
+query. Memory per query stays bounded by one chunk, whatever the size of
+the result.
+"""
+# Standard Library
+import asyncio
+import logging
+
+from itertools import islice
+
+# Django Libraries
+from django.conf import settings
+
+# 3rd Party Libraries
+from asgiref.sync import sync_to_async
+from django_filters.utils import translate_validation
+
+# Project Libraries
+from core.models import MaterializedWeatherStats, WeatherDetails, WeatherStats
+from weather.filters import WeatherDetailsFilter, WeatherStatsFilter
+from weather.serializer import (
+    WeatherDetailsValuesSerializer,
+    WeatherStatsValuesSerializer,
+)
+
+
+logger = logging.getLogger("corteva_api")
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+# Chunks a client may have granted but not yet received, per query.
+MAX_CREDITS = 16
+# Queries running at once on a connection.
+MAX_QUERIES = 4
+
+
+def _stats_queryset():
+    if settings.WEATHER_STATS_BACKEND == "materialized_view":
+        return MaterializedWeatherStats.objects.all()
+    return WeatherStats.objects.current()
+
+
+# Queryset, filters and representation of each resource.
+RESOURCES = {
+    "weather": (
+        WeatherDetails.objects.all,
+        WeatherDetailsFilter,
+        WeatherDetailsValuesSerializer,
+    ),
+    "stats": (_stats_queryset, WeatherStatsFilter, WeatherStatsValuesSerializer),
+}
+
+
+class QueryError(Exception):
+    """Invalid query message, reported to the client with `detail`."""
+
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def _positive_int(message, key, default, maximum):
+    value = message.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise QueryError({key: "Expected a positive integer."})
+    return min(value, maximum)
+
+
+class QueryStream:
+    """One query of a websocket client, streamed chunk by chunk."""
+
+    def __init__(self, query_id, message, send):
+        resource = message.get("resource", "weather")
+        if resource not in RESOURCES:
+            raise QueryError({"resource": f"Expected one of {', '.join(RESOURCES)}."})
+        get_queryset, filterset_class, self.values_serializer = RESOURCES[resource]
+        filters = message.get("filters", {})
+        if not isinstance(filters, dict):
+            raise QueryError({"filters": "Expected an object."})
+        filterset = filterset_class(data=filters, queryset=get_queryset())
+        if not filterset.is_valid():
+            raise QueryError(translate_validation(filterset.errors).detail)
+        self.queryset = filterset.qs
+        self.id = query_id
+        self.chunk_size = (
+            _positive_int(message, "chunk_size", DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE)
+            or DEFAULT_CHUNK_SIZE
+        )
+        self.credits = _positive_int(message, "credits", 1, MAX_CREDITS)
+        self.send = send
+        self._granted = asyncio.Event()
+
+    def grant(self, credits):
+        """Allow `credits` more chunks to be sent."""
+        self.credits = min(self.credits + credits, MAX_CREDITS)
+        self._granted.set()
+
+    def _chunks(self):
+        """Yield represented chunks of records read by a server-side cursor."""
+        rows = self.values_serializer.values_list(self.queryset).iterator(
+            chunk_size=self.chunk_size
+        )
+        try:
+            while chunk := list(islice(rows, self.chunk_size)):
+                yield self.values_serializer.to_representation(chunk)
+        finally:
+            rows.close()
+
+    async def run(self):
+        """Send the chunks of the query as credits are granted."""
+        chunks = self._chunks()
+        sent, seq = 0, 0
+        try:
+            while True:
+                while self.credits <= 0:
+                    self._granted.clear()
+                    await self._granted.wait()
+                records = await sync_to_async(next)(chunks, None)
+                if records is None:
+                    break
+                self.credits -= 1
+                await self.send(
+                    {"type": "chunk", "id": self.id, "seq": seq, "records": records}
+                )
+                sent, seq = sent + len(records), seq + 1
+            await self.send({"type": "done", "id": self.id, "records": sent})
+        except Exception:
+            # The client is told the query ended instead of waiting for chunks.
+            logger.exception(f"Query {self.id} failed after {seq} chunks")
+            await self.send({"type": "error", "id": self.id, "detail": "Query failed."})
+        finally:
+            await sync_to_async(chunks.close)()
+
+
+class QuerySession:
+    """Queries of a websocket connection, by id."""
+
+    def __init__(self, send):
+        self.send = send
+        self.queries = {}
+
+    async def handle(self, message):
+        """Handle a `query`, `credit` or `cancel` message of the client."""
+        query_id = message.get("id")
+        try:
+            if not isinstance(query_id, (str, int)) or isinstance(query_id, bool):
+                raise QueryError({"id": "Expected a string or an integer."})
+            if message["type"] == "query":
+                self.start(query_id, message)
+            elif query_id not in self.queries:
+                raise QueryError({"id": "Unknown query."})
+            elif message["type"] == "credit":
+                stream, _ = self.queries[query_id]
+                stream.grant(_positive_int(message, "credits", 1, MAX_CREDITS))
+            else:
+                await self.cancel(query_id)
+                await self.send({"type": "cancelled", "id": query_id})
+        except QueryError as error:
+            await self.send({"type": "error", "id": query_id, "detail": error.detail})
+
+    def start(self, query_id, message):
+        if query_id in self.queries:
+            raise QueryError({"id": "Query already running."})
+        if len(self.queries) >= MAX_QUERIES:
+            raise QueryError({"id": f"No more than {MAX_QUERIES} queries at once."})
+        stream = QueryStream(query_id, message, self.send)
+        task = asyncio.create_task(stream.run())
+        task.add_done_callback(lambda _: self._finished(query_id, task))
+        self.queries[query_id] = (stream, task)
+
+    def _finished(self, query_id, task):
+        if self.queries.get(query_id, (None, None))[1] is task:
+            del self.queries[query_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Query {query_id} failed", exc_info=task.exception())
+
+    async def cancel(self, query_id):
+        """Stop the query `query_id` and release its cursor."""
+        _, task = self.queries.pop(query_id)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def close(self):
+        """Cancel every running query."""
+        for query_id in list(self.queries):
+            await self.cancel(query_id)
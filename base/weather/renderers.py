@@ -0,0 +1,206 @@
+"""Renderers for the `api/weather` API endpoint."""
+# Standard Library
+import csv
+import io
+
+from datetime import date, datetime
+
+# 3rd Party Libraries
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render JSON with orjson, byte for byte the output of `JSONRenderer`.
+
+    Falls back to `JSONRenderer` for indented, non compact or ASCII only
+    output, which orjson does not produce.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options
+        )
+        # `JSONRenderer` always escapes U+2028 and U+2029.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+def csv_value(value):
+    """Format a representation value for a CSV cell, like `JSONRenderer` does."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+    """Render rows as CSV, the first line holds the field names."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+    # Characters buffered before a chunk is handed over when streaming.
+    buffer_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of dicts, or a single dict, into CSV."""
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(self.stream(rows, list(rows[0]) if rows else []))
+
+    def stream(self, rows, fields):
+        """Yield encoded chunks of the CSV lines of `rows`.
+
+        Args:
+            rows (:iterable): Dicts holding at least `fields`.
+            fields (:list): Field names, in column order.
+
+        Yields:
+            :bytes: Chunk of CSV lines.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([csv_value(row[field]) for field in fields])
+            if buffer.tell() >= self.buffer_size:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Render rows as newline delimited JSON, one object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    # Rows encoded before a chunk is handed over when streaming.
+    chunk_rows = 1000
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of dicts, or a single dict, into NDJSON."""
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(self.stream(rows, None))
+
+    def stream(self, rows, fields):
+        """Yield chunks of JSON lines of `rows`, `fields` are kept in order."""
+        chunk = []
+        for row in rows:
+            chunk.append(orjson.dumps(row, option=ORJSONRenderer.options))
+            if len(chunk) == self.chunk_rows:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+
+class ChunkSink(io.RawIOBase):
+    """Write only file collecting chunks, drained while a writer keeps going.
+
+    `tell()` keeps counting across drains, as the Parquet writer records
+    offsets in its footer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        """Return and forget the chunks written so far."""
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+class ColumnarRenderer(BaseRenderer):
+    """Base class of renderers writing Arrow record batches.
+
+    Views stream batches with `stream_batches`, `render` only covers plain
+    data such as error details.
+    """
+
+    charset = None
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of dicts, or a single dict, as a table."""
+        if data is None:
+            return b""
+        table = pa.Table.from_pylist(data if isinstance(data, list) else [data])
+        return b"".join(self.stream_batches(table.to_batches(), table.schema))
+
+    def stream_batches(self, batches, schema):
+        """Yield encoded chunks of `batches`, one or more per batch."""
+        sink = ChunkSink()
+        writer = self.open_writer(sink, schema)
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def open_writer(self, sink, schema):
+        """Return a writer of `schema` record batches into `sink`."""
+        raise NotImplementedError
+
+
+class ArrowStreamRenderer(ColumnarRenderer):
+    """Render record batches in the Arrow IPC streaming format."""
+
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+
+    def open_writer(self, sink, schema):
+        return pa.ipc.new_stream(sink, schema)
+
+
+class ParquetRenderer(ColumnarRenderer):
+    """Render record batches as a Parquet file, one row group per batch.
+
+    Station codes are dictionary encoded.
+    """
+
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+    def open_writer(self, sink, schema):
+        dictionary_columns = [
+            field.name for field in schema if pa.types.is_dictionary(field.type)
+        ]
+        return pq.ParquetWriter(
+            sink, schema, use_dictionary=dictionary_columns or False
+        )
@@ -2,6 +2,9 @@
 # Standard Library
 import logging
 
+# Django Libraries
+from django.utils import timezone
+
 # 3rd Party Libraries
 from rest_framework import serializers
 
@@ -12,16 +15,50 @@ from core.models import WeatherDetails, WeatherStats
 logger = logging.getLogger("corteva_api")
 
 
+def from_tenths(value):
+    """Scale a measurement stored in integer tenths to its own unit."""
+    return value / 10
+
+
+class TenthsField(serializers.ReadOnlyField):
+    """Represent a measurement stored in integer tenths in its own unit."""
+
+    def to_representation(self, value):
+        return from_tenths(value)
+
+
 class WeatherDetailsSerializer(serializers.ModelSerializer):
     """Serializer for the retrieving details from `WeatherDetails` model.
 
     Notes:
         1. Retrieve all details from `WeatherDetails` model.
+        2. Station code and timestamps are read from the related `Station`
+           and `IngestBatch`, measurements are scaled back from tenths.
     """
 
+    weather_station = serializers.CharField(source="station.code", read_only=True)
+    max_temp = TenthsField()
+    min_temp = TenthsField()
+    precip = TenthsField()
+    created_on = serializers.DateTimeField(
+        source="created_batch.created_on", read_only=True
+    )
+    last_updated = serializers.DateTimeField(
+        source="updated_batch.created_on", read_only=True
+    )
+
     class Meta:
         model = WeatherDetails
-        fields = "__all__"
+        fields = (
+            "id",
+            "weather_station",
+            "record_date",
+            "max_temp",
+            "min_temp",
+            "precip",
+            "created_on",
+            "last_updated",
+        )
 
 
 class WeatherStatsDetailsSerializer(serializers.ModelSerializer):
@@ -29,8 +66,205 @@ class WeatherStatsDetailsSerializer(serializers.ModelSerializer):
 
     Notes:
         1. Retrieve all details from `WeatherStats` model.
+        2. The rebuild `generation` is internal and not exposed.
     """
 
     class Meta:
         model = WeatherStats
-        fields = "__all__"
+        exclude = ("generation",)
+
+
+class WeatherAggregateSerializer(serializers.Serializer):
+    """Read-only representation of aggregate rows, already plain dicts."""
+
+    def to_representation(self, instance):
+        return instance
+
+
+class WeatherQuerySerializer(serializers.Serializer):
+    """One query of a batch: the records of a station within a date range."""
+
+    weather_station = serializers.CharField(max_length=40)
+    record_date__gte = serializers.DateField(required=False)
+    record_date__lte = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        start, end = attrs.get("record_date__gte"), attrs.get("record_date__lte")
+        if start and end and start > end:
+            raise serializers.ValidationError(
+                "record_date__gte must not be after record_date__lte."
+            )
+        return attrs
+
+
+class WeatherBatchSerializer(serializers.Serializer):
+    """Batch of weather queries, answered together."""
+
+    max_queries = 500
+
+    queries = WeatherQuerySerializer(many=True, allow_empty=False)
+
+    def validate_queries(self, queries):
+        if len(queries) > self.max_queries:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {self.max_queries} queries."
+            )
+        return queries
+
+
+class ValuesListSerializer:
+    """Fast read-only representation of rows fetched with `values_list`.
+
+    Subclasses list every output field with the lookup it is read from, in
+    the order of the matching `ModelSerializer`, and gives exactly its
+    representation without creating model instances or running DRF fields.
+
+    Notes:
+        1. `converters` map output fields to functions applied to their value.
+        2. `extra_lookups` are fetched for pagination but not represented.
+        3. A subset of `fields` can be selected, which narrows the `SELECT`.
+    """
+
+    fields = ()
+    extra_lookups = ()
+    converters = {}
+    datetime_fields = ()
+
+    @classmethod
+    def field_names(cls, fields=None):
+        """Return the names of the output fields selected by `fields`.
+
+        Args:
+            fields (:list): Names of output fields, all fields when empty.
+
+        Returns:
+            :list: Selected names, in the order of `fields`.
+
+        Raises:
+            ValidationError: If `fields` names an unknown field.
+        """
+        names = [name for name, _ in cls.fields]
+        if not fields:
+            return names
+        unknown = [name for name in fields if name not in names]
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown fields: {', '.join(unknown)}."]}
+            )
+        return list(dict.fromkeys(fields))
+
+    @classmethod
+    def values_list(cls, queryset, fields=None):
+        """Select the lookups of `fields` and `extra_lookups` from `queryset`.
+
+        Args:
+            queryset (:QuerySet): Queryset of the model.
+            fields (:list): Names of output fields, all fields when empty.
+
+        Returns:
+            :QuerySet: Named tuples, usable by the pagination classes.
+        """
+        lookups = dict(cls.fields)
+        selected = [lookups[name] for name in cls.field_names(fields)]
+        selected += [lookup for lookup in cls.extra_lookups if lookup not in selected]
+        return queryset.values_list(*selected, named=True)
+
+    @classmethod
+    def get_converters(cls, names):
+        """Return `(index, converter)` of the names needing a conversion."""
+        converters = dict(cls.converters)
+        if timezone.get_current_timezone_name() != "UTC":
+            # DRF renders datetimes in the current timezone.
+            converters.update(dict.fromkeys(cls.datetime_fields, timezone.localtime))
+        return [
+            (index, converters[name])
+            for index, name in enumerate(names)
+            if name in converters
+        ]
+
+    @classmethod
+    def to_representation(cls, rows, fields=None):
+        """Convert rows returned by `values_list` to the list representation.
+
+        Args:
+            rows (:iterable): Rows returned by `values_list`.
+            fields (:list): Output fields the rows were selected with.
+
+        Returns:
+            :list: List of dicts, as returned by `ModelSerializer(many=True)`.
+        """
+        names = cls.field_names(fields)
+        converted = cls.get_converters(names)
+        if not converted:
+            return [dict(zip(names, row)) for row in rows]
+        data = []
+        for row in rows:
+            values = list(row)
+            for index, convert in converted:
+                if values[index] is not None:
+                    values[index] = convert(values[index])
+            data.append(dict(zip(names, values)))
+        return data
+
+    @classmethod
+    def to_columns(cls, rows, fields=None):
+        """Convert rows returned by `values_list` to one list per field.
+
+        Args:
+            rows (:iterable): Rows returned by `values_list`.
+            fields (:list): Output fields the rows were selected with.
+
+        Returns:
+            :dict: List of values by field name, e.g. `{"max_temp": [...]}`.
+        """
+        names = cls.field_names(fields)
+        rows = list(rows)
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        data = {name: list(column) for name, column in zip(names, columns)}
+        for index, convert in cls.get_converters(names):
+            data[names[index]] = [
+                None if value is None else convert(value) for value in columns[index]
+            ]
+        return data
+
+
+class WeatherDetailsValuesSerializer(ValuesListSerializer):
+    """Fast path representation of `WeatherDetailsSerializer`."""
+
+    fields = (
+        ("id", "id"),
+        ("weather_station", "station__code"),
+        ("record_date", "record_date"),
+        ("max_temp", "max_temp"),
+        ("min_temp", "min_temp"),
+        ("precip", "precip"),
+        ("created_on", "created_batch__created_on"),
+        ("last_updated", "updated_batch__created_on"),
+    )
+    # Keyset pagination position.
+    extra_lookups = ("station_id", "record_date", "id")
+    converters = {
+        "max_temp": from_tenths,
+        "min_temp": from_tenths,
+        "precip": from_tenths,
+    }
+    datetime_fields = ("created_on", "last_updated")
+
+
+class WeatherStatsValuesSerializer(ValuesListSerializer):
+    """Fast path representation of `WeatherStatsDetailsSerializer`."""
+
+    fields = tuple(
+        (name, name)
+        for name in (
+            "id",
+            "weather_station",
+            "year",
+            "max_temp_avg",
+            "min_temp_avg",
+            "total_precip",
+            "created_on",
+            "last_updated",
+        )
+    )
+    datetime_fields = ("created_on", "last_updated")
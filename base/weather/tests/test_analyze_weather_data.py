@@ -0,0 +1,160 @@
+"""Test for computing the `WeatherStats` aggregates."""
+# Standard Library
+from datetime import date
+from unittest import mock
+
+# Django Libraries
+from django.test import TestCase
+
+# Project Libraries
+from core.models import DatasetVersion, StaleWeatherStats, WeatherDetails, WeatherStats
+from weather import analyze_weather_data
+from weather.analyze_weather_data import (
+    MISSING_MEASUREMENT,
+    compute_weather_stats,
+    rebuild_weather_stats,
+    refresh_weather_stats,
+)
+from weather.load_weather_data import OrmWeatherLoader
+
+
+class ComputeWeatherStatsTests(TestCase):
+    """Test stats are aggregated per station and year."""
+
+    def setUp(self):
+        OrmWeatherLoader().load(
+            [
+                ("USC00110072.txt", date(1985, 1, 1), 20, -10, 15),
+                ("USC00110072.txt", date(1985, 1, 2), 40, MISSING_MEASUREMENT, 25),
+                ("USC00110072.txt", date(1987, 1, 1), MISSING_MEASUREMENT, -30, 0),
+                ("USC00110187.txt", date(1986, 6, 1), 300, 200, MISSING_MEASUREMENT),
+            ]
+        )
+
+    def test_compute_weather_stats(self):
+        """Test stats exclude missing values and cover every station-year"""
+        stats = {
+            (obj.weather_station, obj.year): (
+                obj.max_temp_avg,
+                obj.min_temp_avg,
+                obj.total_precip,
+            )
+            for obj in compute_weather_stats()
+        }
+        self.assertEqual(
+            stats,
+            {
+                ("00110072", 1985): (3.0, -1.0, 4.0),
+                ("00110072", 1986): (None, None, None),
+                ("00110072", 1987): (None, -3.0, 0.0),
+                ("00110187", 1985): (None, None, None),
+                ("00110187", 1986): (30.0, 20.0, None),
+                ("00110187", 1987): (None, None, None),
+            },
+        )
+
+    def test_compute_weather_stats_without_records(self):
+        """Test no stats are computed without weather records"""
+        WeatherDetails.objects.all().delete()
+        self.assertEqual(compute_weather_stats(), [])
+
+
+class RefreshWeatherStatsTests(TestCase):
+    """Test incremental refresh matches a full computation."""
+
+    @staticmethod
+    def stats(objs):
+        return sorted(
+            (obj.weather_station, obj.year, obj.max_temp_avg, obj.total_precip)
+            for obj in objs
+        )
+
+    def test_refresh_weather_stats(self):
+        """Test only stale station-years are recomputed"""
+        loader = OrmWeatherLoader()
+        loader.load(
+            [
+                ("USC00110072.txt", date(1985, 1, 1), 20, -10, 15),
+                ("USC00110187.txt", date(1986, 1, 1), 30, -10, 5),
+            ]
+        )
+        self.assertEqual(StaleWeatherStats.objects.count(), 2)
+        self.assertEqual(refresh_weather_stats(), 4)
+        self.assertEqual(
+            self.stats(WeatherStats.objects.all()),
+            self.stats(compute_weather_stats()),
+        )
+
+        loader.load(
+            [
+                ("USC00110072.txt", date(1985, 1, 2), 40, -10, 15),
+                ("USC00110072.txt", date(1988, 1, 1), 50, -10, 15),
+                ("USC00110338.txt", date(1986, 1, 1), 60, -10, 15),
+            ]
+        )
+        refresh_weather_stats()
+        self.assertEqual(
+            self.stats(WeatherStats.objects.all()),
+            self.stats(compute_weather_stats()),
+        )
+        self.assertFalse(StaleWeatherStats.objects.exists())
+        self.assertEqual(refresh_weather_stats(), 0)
+
+    def test_marked_while_refreshing(self):
+        """Test station-years marked again during a refresh stay stale"""
+        loader = OrmWeatherLoader()
+        loader.load([("USC00110072.txt", date(1985, 1, 2), 40, -10, 15)])
+        compute = analyze_weather_data.weather_stats_queryset
+
+        def ingest_during_refresh(details):
+            # An ingest commits after the stale rows and records were read.
+            rows = list(compute(details))
+            loader.load([("USC00110072.txt", date(1985, 1, 3), 60, -10, 15)])
+            return rows
+
+        with mock.patch.object(
+            analyze_weather_data,
+            "weather_stats_queryset",
+            side_effect=ingest_during_refresh,
+        ):
+            refresh_weather_stats()
+        self.assertEqual(
+            list(StaleWeatherStats.objects.values_list("weather_station", "year")),
+            [("00110072", 1985)],
+        )
+        refresh_weather_stats()
+        self.assertFalse(StaleWeatherStats.objects.exists())
+        self.assertEqual(
+            self.stats(WeatherStats.objects.all()),
+            self.stats(compute_weather_stats()),
+        )
+
+
+class RebuildWeatherStatsTests(TestCase):
+    """Test full rebuilds are swapped in as a new generation."""
+
+    def setUp(self):
+        OrmWeatherLoader().load(
+            [
+                ("USC00110072.txt", date(1985, 1, 1), 20, -10, 15),
+                ("USC00110187.txt", date(1986, 1, 1), 30, -10, 5),
+            ]
+        )
+
+    def test_rebuild_weather_stats(self):
+        """Test only the current generation is served and kept"""
+        self.assertEqual(rebuild_weather_stats(), 4)
+        self.assertEqual(rebuild_weather_stats(), 4)
+        version = DatasetVersion.objects.get(name=DatasetVersion.WEATHER_STATS)
+        self.assertEqual(version.generation, 2)
+        self.assertEqual(
+            set(WeatherStats.objects.values_list("generation", flat=True)), {2}
+        )
+        self.assertFalse(StaleWeatherStats.objects.exists())
+
+        # A shadow generation being built is not served.
+        WeatherStats.objects.create(weather_station="00110338", year=1985, generation=3)
+        self.assertEqual(WeatherStats.objects.current().count(), 4)
+        self.assertFalse(
+            WeatherStats.objects.current().filter(weather_station="00110338").exists()
+        )
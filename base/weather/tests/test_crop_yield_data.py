@@ -0,0 +1,45 @@
+"""Test for the crop yield dataset and its correlations."""
+# Standard Library
+import os
+
+# Django Libraries
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# 3rd Party Libraries
+import numpy as np
+
+# Project Libraries
+from weather.crop_yield_data import YIELD_FILE, parse_yield_file, yield_correlations
+
+
+YLD_DATA = os.path.join(settings.BASE_DIR, "..", "yld_data")
+
+
+class YieldCorrelationTests(SimpleTestCase):
+    """Test vectorized correlations match `np.corrcoef` station by station."""
+
+    def test_parse_yield_file(self):
+        """Test the yield file is parsed into yearly yields"""
+        records = parse_yield_file(os.path.join(YLD_DATA, YIELD_FILE))
+        self.assertEqual(records[0], (1985, 225447))
+        self.assertEqual(len(records), 30)
+
+    def test_correlations_match_corrcoef(self):
+        """Test grouped correlations, missing values and short series"""
+        rng = np.random.default_rng(0)
+        stations = np.array(["a"] * 10 + ["b"] * 8 + ["c"] * 2)
+        yields = rng.normal(200000, 20000, len(stations))
+        values = yields / 10000 + rng.normal(0, 1, len(stations))
+        values[12] = np.nan
+        names, counts, coefficients = yield_correlations(
+            stations, {"metric": values}, yields
+        )
+        self.assertEqual(names.tolist(), ["a", "b", "c"])
+        self.assertEqual(counts.tolist(), [10, 8, 2])
+        for index, (start, end) in enumerate([(0, 10), (10, 18)]):
+            x, y = values[start:end], yields[start:end]
+            valid = ~np.isnan(x)
+            expected = np.corrcoef(x[valid], y[valid])[0, 1]
+            self.assertAlmostEqual(coefficients["metric"][index], expected)
+        self.assertTrue(np.isnan(coefficients["metric"][2]))
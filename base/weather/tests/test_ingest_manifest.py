@@ -0,0 +1,79 @@
+"""Test for the ingested weather record files manifest."""
+# Standard Library
+import os
+import tempfile
+
+from unittest import mock
+
+# Django Libraries
+from django.core.management import call_command
+from django.test import TestCase
+
+# Project Libraries
+from core.models import IngestedFile, WeatherDetails
+from weather.ingest_manifest import plan_ingestion
+from weather.process_weather_data import FileSlice
+
+
+LINES = b"19850101\t  -22\t -128\t   94\n19850102\t -122\t -217\t    0\n"
+
+
+class PlanIngestionTests(TestCase):
+    """Test only new or changed content is planned for ingestion."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "USC00110072.txt")
+        self.write(LINES)
+
+    def write(self, data, mode="wb"):
+        with open(self.file_path, mode) as fp:
+            fp.write(data)
+
+    def ingest(self, **kwargs):
+        plan = plan_ingestion([self.file_path], **kwargs)
+        for _, entry in plan:
+            entry.save()
+        return [file_slice for file_slice, _ in plan]
+
+    def test_new_file_is_planned_from_start(self):
+        """Test files missing from the manifest are loaded completely"""
+        self.assertEqual(self.ingest(), [FileSlice(self.file_path, 0, len(LINES))])
+        self.assertEqual(IngestedFile.objects.get().offset, len(LINES))
+
+    def test_unchanged_file_is_skipped(self):
+        """Test files already ingested are skipped"""
+        self.ingest()
+        self.assertEqual(self.ingest(), [])
+        os.utime(self.file_path)
+        self.assertEqual(self.ingest(), [])
+
+    def test_grown_file_loads_tail(self):
+        """Test only complete lines appended since last run are loaded"""
+        self.ingest()
+        tail = b"19850103\t -106\t -244\t    0\n"
+        self.write(tail + b"1985010", mode="ab")
+        end = len(LINES) + len(tail)
+        self.assertEqual(self.ingest(), [FileSlice(self.file_path, len(LINES), end)])
+
+    def test_rewritten_file_and_full_reload(self):
+        """Test changed content and `full` reload files from the start"""
+        self.ingest()
+        self.write(LINES.replace(b"-22", b"-23"))
+        self.assertEqual(self.ingest(), [FileSlice(self.file_path, 0, len(LINES))])
+        self.assertEqual(
+            self.ingest(full=True), [FileSlice(self.file_path, 0, len(LINES))]
+        )
+
+    def test_command_bumps_generation_when_loading(self):
+        """Test the cache generation is only bumped when records were loaded"""
+        command = "core.management.commands.ingest_weather_data"
+        with mock.patch(
+            f"{command}.read_files", return_value=[self.file_path]
+        ), mock.patch(f"{command}.bump_generation") as bump_generation:
+            call_command("ingest_weather_data", backend="orm")
+            self.assertEqual(WeatherDetails.objects.count(), 2)
+            bump_generation.assert_called_once()
+            call_command("ingest_weather_data", backend="orm")
+            bump_generation.assert_called_once()
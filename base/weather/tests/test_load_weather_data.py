@@ -0,0 +1,84 @@
+"""Test for loading weather records into the `WeatherDetails` model."""
+# Standard Library
+from datetime import date
+from unittest import skipUnless
+
+# Django Libraries
+from django.db import connection
+from django.test import TestCase
+
+# Project Libraries
+from core.models import IngestBatch, StaleWeatherStats, Station, WeatherDetails
+from weather.load_weather_data import CopyWeatherLoader, OrmWeatherLoader, station_id
+
+
+RECORDS = [
+    ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+    ("USC00110072.txt", date(1985, 1, 2), -122, -217, 0),
+    ("USC00110187.txt", date(1986, 1, 1), 33, -33, 10),
+]
+
+
+class OrmWeatherLoaderTests(TestCase):
+    """Test records are upserted by station and record date."""
+
+    def setUp(self):
+        self.loader = OrmWeatherLoader(batch_size=2)
+
+    def test_station_id(self):
+        """Test station id is derived from the file name"""
+        self.assertEqual(station_id("USC00110072.txt"), "00110072")
+
+    def test_load_records(self):
+        """Test records are inserted and station-years marked stale"""
+        self.assertEqual(self.loader.load(RECORDS), len(RECORDS))
+        self.assertEqual(WeatherDetails.objects.count(), len(RECORDS))
+        self.assertEqual(
+            list(Station.objects.values_list("code", flat=True)),
+            ["00110072", "00110187"],
+        )
+        self.assertEqual(
+            set(StaleWeatherStats.objects.values_list("weather_station", "year")),
+            {("00110072", 1985), ("00110187", 1986)},
+        )
+
+    def test_reload_updates_changed_records_only(self):
+        """Test corrected readings replace stored ones"""
+        self.loader.load(RECORDS)
+        StaleWeatherStats.objects.all().delete()
+        batches = IngestBatch.objects.count()
+
+        self.loader.load(RECORDS)
+        self.assertFalse(StaleWeatherStats.objects.exists())
+        self.assertEqual(IngestBatch.objects.count(), batches)
+
+        self.loader.load([("USC00110187.txt", date(1986, 1, 1), 44, -33, 10)])
+        self.assertEqual(WeatherDetails.objects.count(), len(RECORDS))
+        record = WeatherDetails.objects.get(station__code="00110187")
+        self.assertEqual(record.max_temp, 44)
+        self.assertEqual(record.updated_batch, IngestBatch.objects.last())
+        self.assertNotEqual(record.created_batch, record.updated_batch)
+        self.assertEqual(
+            list(StaleWeatherStats.objects.values_list("weather_station", "year")),
+            [("00110187", 1986)],
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY requires PostgreSQL.")
+class CopyWeatherLoaderTests(OrmWeatherLoaderTests):
+    """Test records are merged from the `COPY` staging table like the ORM does."""
+
+    def setUp(self):
+        self.loader = CopyWeatherLoader()
+
+    def test_last_copied_line_wins(self):
+        """Test the last line of a station and day is kept"""
+        self.loader.load([*RECORDS, ("USC00110072.txt", date(1985, 1, 1), 1, 2, 3)])
+        record = WeatherDetails.objects.get(
+            station__code="00110072", record_date=date(1985, 1, 1)
+        )
+        self.assertEqual((record.max_temp, record.min_temp, record.precip), (1, 2, 3))
+        self.assertEqual(
+            StaleWeatherStats.objects.get(weather_station="00110072").marked_batch,
+            record.updated_batch,
+        )
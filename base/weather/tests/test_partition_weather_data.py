@@ -0,0 +1,109 @@
+"""Test for the range partitioning of the `WeatherDetails` table."""
+# Standard Library
+import importlib
+
+from datetime import date
+from unittest import skipUnless
+
+# Django Libraries
+from django.apps import apps
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+# Project Libraries
+from core.models import WeatherDetails
+from weather.load_weather_data import CopyWeatherLoader, OrmWeatherLoader
+from weather.partition_weather_data import (
+    create_weather_partitions,
+    detach_weather_partition,
+    is_partitioned,
+    partition_bounds,
+    partition_name,
+    partition_weather_details,
+    unpartition_weather_details,
+)
+
+
+RECORDS = [
+    ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+    ("USC00110072.txt", date(1986, 1, 1), 11, -11, -9999),
+]
+
+
+class PartitionBoundsTests(SimpleTestCase):
+    """Test records are assigned to yearly or decade partitions."""
+
+    def test_partition_bounds(self):
+        """Test partition bounds are aligned to the interval"""
+        self.assertEqual(partition_bounds(1985), (1985, 1986))
+        self.assertEqual(partition_bounds(1985, "decade"), (1980, 1990))
+        self.assertEqual(partition_bounds(2000, "decade"), (2000, 2010))
+
+    def test_partition_name(self):
+        """Test partitions are named after their first year"""
+        self.assertEqual(partition_name(1980), "core_weatherdetails_p1980")
+
+
+@skipUnless(connection.vendor == "postgresql", "Partitioning requires PostgreSQL.")
+class PartitionWeatherDetailsTests(TestCase):
+    """Test records are written and read through the ORM once partitioned."""
+
+    def setUp(self):
+        if is_partitioned():
+            # Test database migrated with `WEATHER_DETAILS_PARTITION` set.
+            with connection.schema_editor() as schema_editor:
+                unpartition_weather_details(schema_editor)
+        OrmWeatherLoader().load(RECORDS)
+
+    def assertWritable(self):
+        """Check both loaders insert after the copied records, by their id."""
+        OrmWeatherLoader().load([("USC00110072.txt", date(1987, 1, 1), 1, 1, 1)])
+        CopyWeatherLoader().load([("USC00110187.txt", date(2090, 1, 1), 2, 2, 2)])
+        rows = list(WeatherDetails.objects.order_by("id").values_list("record_date"))
+        self.assertEqual(
+            [row[0].year for row in rows], [1985, 1986, 1987, 2090], "id order"
+        )
+        self.assertEqual(
+            WeatherDetails.objects.filter(record_date__year=1986).get().max_temp, 11
+        )
+
+    def test_partition_and_unpartition(self):
+        """Test the table converts both ways keeping records and ids"""
+        ids = list(WeatherDetails.objects.values_list("id", flat=True))
+        with connection.schema_editor() as schema_editor:
+            self.assertEqual(partition_weather_details(schema_editor), len(RECORDS))
+        self.assertTrue(is_partitioned())
+        self.assertEqual(list(WeatherDetails.objects.values_list("id", flat=True)), ids)
+        self.assertWritable()
+
+        with connection.schema_editor() as schema_editor:
+            unpartition_weather_details(schema_editor)
+        self.assertFalse(is_partitioned())
+        self.assertEqual(WeatherDetails.objects.count(), 4)
+
+    def test_detach_and_recreate(self):
+        """Test a detached year is renamed and can be partitioned again"""
+        with connection.schema_editor() as schema_editor:
+            partition_weather_details(schema_editor)
+        detached = detach_weather_partition(1985)
+        self.assertTrue(detached.startswith(f"{partition_name(1985)}_detached_"))
+        self.assertEqual(WeatherDetails.objects.count(), 1)
+
+        self.assertEqual(create_weather_partitions(1985, 1985), [partition_name(1985)])
+        OrmWeatherLoader().load(RECORDS[:1])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {partition_name(1985)}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute(f"SELECT count(*) FROM {detached}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    @override_settings(WEATHER_DETAILS_PARTITION="decade")
+    def test_migration(self):
+        """Test the frozen migration helpers partition the table"""
+        migration = importlib.import_module(
+            "core.migrations.0009_partition_weather_details"
+        )
+        with connection.schema_editor() as schema_editor:
+            migration.partition_table(apps, schema_editor)
+        self.assertTrue(is_partitioned())
+        self.assertWritable()
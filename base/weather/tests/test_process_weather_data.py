@@ -0,0 +1,105 @@
+"""Test for parsing weather record files."""
+# Standard Library
+import os
+
+from datetime import date
+
+# Django Libraries
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# 3rd Party Libraries
+import numpy as np
+
+# Project Libraries
+from weather.process_weather_data import (
+    decode_dates,
+    iter_weather_columns,
+    parse_weather_buffer,
+    parse_weather_file,
+    process_weather_record,
+    stream_weather_records,
+)
+
+
+WX_DATA = os.path.join(settings.BASE_DIR, "..", "wx_data")
+
+
+class ParseWeatherRecordTests(SimpleTestCase):
+    """Test vectorized parser matches the line by line parser."""
+
+    def setUp(self):
+        self.file_paths = [
+            os.path.join(WX_DATA, file) for file in sorted(os.listdir(WX_DATA))[:5]
+        ]
+
+    def test_vectorized_parser_matches_line_parser(self):
+        """Test both parsers return exactly the same records"""
+        for file_path in self.file_paths:
+            expected = process_weather_record(file_path)
+            self.assertEqual(parse_weather_file(file_path).records(), expected)
+
+    def test_records_in_tenths(self):
+        """Test measurements can be kept as integer tenths"""
+        columns = parse_weather_buffer(
+            "USC00110072.txt", b"19850101\t-22\t-128\t94\n19850102\t11\t-11\t-9999\n"
+        )
+        self.assertEqual(
+            columns.records(tenths=True),
+            [
+                ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+                ("USC00110072.txt", date(1985, 1, 2), 11, -11, -9999),
+            ],
+        )
+        self.assertEqual(columns.records(stop=1)[0][2:], (-2.2, -12.8, 9.4))
+
+    def test_decode_dates(self):
+        """Test `YYYYMMDD` integers are decoded to dates"""
+        values = np.array([19850101, 20000229, 20141231])
+        self.assertEqual(
+            decode_dates(values).tolist(),
+            [date(1985, 1, 1), date(2000, 2, 29), date(2014, 12, 31)],
+        )
+
+    def test_parse_empty_buffer(self):
+        """Test empty file content gives empty columns"""
+        columns = parse_weather_buffer("USC00110072.txt", b"")
+        self.assertEqual(columns.size, 0)
+        self.assertEqual(columns.records(), [])
+
+    def test_iter_columns_in_batches(self):
+        """Test files are parsed batch by batch, within the byte range"""
+        file_path = self.file_paths[0]
+        with open(file_path, "rb") as fp:
+            lines = fp.readlines()
+        offset, end = len(b"".join(lines[:10])), len(b"".join(lines[:2510]))
+        batches = list(iter_weather_columns(file_path, offset, end, batch_size=1000))
+        self.assertEqual([columns.size for columns, _ in batches], [1000, 1000, 500])
+        self.assertEqual([last for _, last in batches], [False, False, True])
+        self.assertEqual(
+            [record for columns, _ in batches for record in columns.records()],
+            parse_weather_file(file_path, offset, end).records(),
+        )
+
+        batches = list(iter_weather_columns(file_path, end, end, batch_size=1000))
+        self.assertEqual(
+            [(columns.size, last) for columns, last in batches], [(0, True)]
+        )
+
+    def test_stream_batches(self):
+        """Test streamed batches hold all records of every file"""
+        batches = list(
+            stream_weather_records(self.file_paths, batch_size=1000, processes=2)
+        )
+        self.assertTrue(all(len(batch.records) <= 1000 for batch in batches))
+        self.assertEqual(sum(batch.last for batch in batches), len(self.file_paths))
+        for file_path in self.file_paths:
+            self.assertEqual(
+                [
+                    record
+                    for batch in batches
+                    if batch.file_path == file_path
+                    for record in batch.records
+                ],
+                process_weather_record(file_path),
+            )
@@ -0,0 +1,452 @@
+"""Test for the `api/weather` API endpoints."""
+# Standard Library
+import io
+import json
+
+from datetime import date
+
+# Django Libraries
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+# 3rd Party Libraries
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+# Project Libraries
+from core.models import DatasetVersion, WeatherDetails, WeatherStats
+from weather.analyze_weather_data import rebuild_weather_stats
+from weather.arrow_export import (
+    WEATHER_DETAILS_COLUMNS,
+    iter_record_batches,
+    parse_copy_csv,
+)
+from weather.cache import GENERATION_KEY, bump_generation, get_generation
+from weather.crop_yield_data import compute_yield_correlations, load_crop_yield
+from weather.load_weather_data import OrmWeatherLoader
+from weather.renderers import ORJSONRenderer
+from weather.serializer import (
+    WeatherDetailsSerializer,
+    WeatherDetailsValuesSerializer,
+    WeatherStatsDetailsSerializer,
+    WeatherStatsValuesSerializer,
+)
+
+
+RECORDS = [
+    ("USC00110072.txt", date(1985, 1, 1), -22, -128, 94),
+    ("USC00110072.txt", date(1985, 1, 2), -122, -217, 0),
+    ("USC00110072.txt", date(1986, 1, 1), 11, -11, -9999),
+    ("USC00110187.txt", date(1985, 1, 1), 33, -33, 10),
+]
+
+
+class WeatherApiTests(TestCase):
+    """Test the weather details and stats endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        OrmWeatherLoader().load(RECORDS)
+        rebuild_weather_stats()
+
+    def assertBadRequest(self, url, params):
+        # Like `ATOMIC_REQUESTS`, the error marks the test transaction for
+        # rollback, the savepoint keeps it usable for the next requests.
+        with transaction.atomic():
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_weather_details(self):
+        """Test weather details are listed and filtered by station"""
+        res = self.client.get(reverse("weather:index"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], len(RECORDS))
+
+        res = self.client.get(reverse("weather:index"), {"weather_station": "00110187"})
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(res.data["results"][0]["weather_station"], "00110187")
+        self.assertEqual(res.data["results"][0]["max_temp"], 3.3)
+
+    def test_range_filters(self):
+        """Test station lists and date / year ranges filter both endpoints"""
+        res = self.client.get(
+            reverse("weather:index"),
+            {
+                "weather_station__in": "00110072,00110187",
+                "record_date__gte": "1985-01-01",
+                "record_date__lte": "1985-01-01",
+            },
+        )
+        self.assertEqual(res.data["count"], 2)
+        res = self.client.get(
+            reverse("weather:index"), {"record_date__gte": "1986-01-01"}
+        )
+        self.assertEqual(res.data["count"], 1)
+
+        res = self.client.get(
+            reverse("weather:weather_stats"),
+            {"weather_station__in": "00110187", "year__gte": 1986},
+        )
+        self.assertEqual(
+            [(row["weather_station"], row["year"]) for row in res.data["results"]],
+            [("00110187", 1986)],
+        )
+
+    def test_sparse_fields_and_columns(self):
+        """Test `fields` narrows the records and `shape=columns` transposes them"""
+        url = reverse("weather:index")
+        res = self.client.get(url, {"fields": "record_date,max_temp"})
+        self.assertEqual(
+            res.json()["results"][0], {"record_date": "1985-01-01", "max_temp": -2.2}
+        )
+
+        res = self.client.get(
+            url,
+            {
+                "fields": "record_date,max_temp",
+                "shape": "columns",
+                "weather_station": "00110072",
+                "pagination": "keyset",
+                "page_size": 2,
+            },
+        )
+        data = res.json()
+        self.assertEqual(
+            data["results"],
+            {"record_date": ["1985-01-01", "1985-01-02"], "max_temp": [-2.2, -12.2]},
+        )
+        res = self.client.get(data["next"])
+        self.assertEqual(res.json()["results"]["record_date"], ["1986-01-01"])
+
+        self.assertBadRequest(url, {"fields": "max_temp,unknown"})
+        self.assertBadRequest(url, {"shape": "rows"})
+
+    def test_responses_cached_until_generation_bump(self):
+        """Test repeated queries are served from the cache until data changes"""
+        url = reverse("weather:index")
+        query = {"weather_station": "00110072", "page": 1}
+        res = self.client.get(url, query)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, dict(reversed(query.items())))
+        self.assertEqual(cached.content, res.content)
+        self.assertEqual(cached["Content-Type"], "application/json")
+
+        OrmWeatherLoader().load([("USC00110072.txt", date(1987, 1, 1), 1, 1, 1)])
+        self.assertEqual(self.client.get(url, query).json()["count"], 3)
+        bump_generation()
+        self.assertEqual(self.client.get(url, query).json()["count"], 4)
+
+    def test_generation_survives_cache_flush(self):
+        """Test the database holds the generation, the cache a copy of it"""
+        generation, _ = get_generation()
+        cache.clear()
+        self.assertEqual(get_generation()[0], generation)
+        self.assertEqual(bump_generation(), generation + 1)
+        self.assertEqual(get_generation()[0], generation + 1)
+
+        # Bumped where the cache could not be updated, e.g. in another process.
+        DatasetVersion.objects.filter(name=DatasetVersion.WEATHER_API).update(
+            generation=F("generation") + 1
+        )
+        self.assertEqual(get_generation()[0], generation + 1)
+        cache.delete(GENERATION_KEY)
+        self.assertEqual(get_generation()[0], generation + 2)
+
+    def test_conditional_get(self):
+        """Test unchanged data is revalidated with a 304 and no query"""
+        url = reverse("weather:weather_stats")
+        res = self.client.get(url)
+        self.assertTrue(res["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", res)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+        bump_generation()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_indented_responses_cached_apart(self):
+        """Test indented JSON has a cache entry and an ETag of its own"""
+        url = reverse("weather:weather_stats")
+        compact = self.client.get(url)
+        indented = self.client.get(url, HTTP_ACCEPT="application/json; indent=4")
+        self.assertIn(b'\n    "count"', indented.content)
+        self.assertNotEqual(indented.content, compact.content)
+        self.assertNotEqual(indented["ETag"], compact["ETag"])
+        self.assertEqual(self.client.get(url).content, compact.content)
+
+    def test_keyset_pagination(self):
+        """Test keyset pages walk every record forwards and backwards"""
+        res = self.client.get(
+            reverse("weather:index"), {"pagination": "keyset", "page_size": 3}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertIsNone(res.data["previous"])
+        first_page = [row["id"] for row in res.data["results"]]
+
+        res = self.client.get(res.data["next"])
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(len(first_page) + len(res.data["results"]), len(RECORDS))
+
+        res = self.client.get(res.data["previous"])
+        self.assertEqual([row["id"] for row in res.data["results"]], first_page)
+
+        res = self.client.get(reverse("weather:index"), {"cursor": "invalid"})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export(self):
+        """Test the filtered records are streamed as CSV and NDJSON"""
+        url = reverse("weather:export")
+        res = self.client.get(url, {"weather_station": "00110072"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0],
+            "id,weather_station,record_date,max_temp,"
+            "min_temp,precip,created_on,last_updated",
+        )
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(
+            lines[1].split(",")[1:6], ["00110072", "1985-01-01", "-2.2", "-12.8", "9.4"]
+        )
+
+        res = self.client.get(url, {"format": "ndjson", "record_date": "1985-01-01"})
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line) for line in b"".join(res.streaming_content).splitlines()
+        ]
+        listed = self.client.get(
+            reverse("weather:index"), {"record_date": "1985-01-01"}
+        )
+        self.assertEqual(rows, listed.json()["results"])
+
+    def test_columnar_export(self):
+        """Test Arrow and Parquet exports read back as the listed records"""
+        # Loaded last, the record has the highest id but is not listed last.
+        OrmWeatherLoader().load([("USC00110072.txt", date(1985, 6, 1), 5, 4, 3)])
+        url = reverse("weather:export")
+        listed = self.client.get(reverse("weather:index")).json()["results"]
+        res = self.client.get(url, {"format": "arrow"})
+        self.assertEqual(res["Content-Type"], "application/vnd.apache.arrow.stream")
+        table = pa.ipc.open_stream(b"".join(res.streaming_content)).read_all()
+        self.assertTrue(pa.types.is_dictionary(table.schema.field(1).type))
+        self.assertEqual(table.num_rows, len(listed))
+        self.assertEqual(
+            table.column("weather_station").to_pylist(),
+            [row["weather_station"] for row in listed],
+        )
+        self.assertEqual(
+            table.column("max_temp").to_pylist(), [row["max_temp"] for row in listed]
+        )
+        batches = iter_record_batches(
+            WeatherDetails.objects.all(), WEATHER_DETAILS_COLUMNS, batch_size=2
+        )
+        self.assertEqual(
+            [id for batch in batches for id in batch.column("id").to_pylist()],
+            [row["id"] for row in listed],
+        )
+
+        res = self.client.get(url, {"format": "arrow", "weather_station": "00000000"})
+        table = pa.ipc.open_stream(b"".join(res.streaming_content)).read_all()
+        self.assertEqual(table.num_rows, 0)
+
+        res = self.client.get(url, {"format": "parquet", "record_date": "1985-01-01"})
+        table = pq.read_table(io.BytesIO(b"".join(res.streaming_content)))
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column("record_date")[0].as_py(), date(1985, 1, 1))
+
+        rebuild_weather_stats()
+        res = self.client.get(reverse("weather:stats_export"), {"format": "arrow"})
+        table = pa.ipc.open_stream(b"".join(res.streaming_content)).read_all()
+        self.assertEqual(table.num_rows, 4)
+
+    def test_parse_copy_csv(self):
+        """Test `COPY` output is parsed into the read types of the columns"""
+        table = parse_copy_csv(
+            io.BytesIO(b"1,00110072,5479,-22,-128,,1672531200000000,\n"),
+            WEATHER_DETAILS_COLUMNS,
+        )
+        self.assertEqual(table.column("weather_station")[0].as_py(), "00110072")
+        self.assertEqual(table.column("max_temp")[0].as_py(), -22)
+        self.assertIsNone(table.column("precip")[0].as_py())
+        self.assertIsNone(table.column("last_updated")[0].as_py())
+
+    def test_aggregate(self):
+        """Test details are aggregated by the requested keys and metrics"""
+        url = reverse("weather:aggregate")
+        res = self.client.get(url, {"group_by": "station,year"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"][0],
+            {
+                "weather_station": "00110072",
+                "year": 1985,
+                "max_temp_avg": -7.2,
+                "min_temp_avg": -17.25,
+                "precip_sum": 9.4,
+            },
+        )
+
+        res = self.client.get(
+            url,
+            {
+                "group_by": "month,doy",
+                "metrics": "max_temp_max,precip_count",
+                "record_date__lte": "1985-12-31",
+            },
+        )
+        self.assertEqual(
+            res.data["results"],
+            [
+                {"month": 1, "doy": 1, "max_temp_max": 3.3, "precip_count": 2},
+                {"month": 1, "doy": 2, "max_temp_max": -12.2, "precip_count": 1},
+            ],
+        )
+
+        self.assertBadRequest(url, {"group_by": "week"})
+        self.assertBadRequest(url, {"metrics": "max_temp_median"})
+
+    def test_batch_queries(self):
+        """Test batch queries are answered by one SQL query, in query order"""
+        url = reverse("weather:batch")
+        queries = [
+            {"weather_station": "00110187"},
+            {
+                "weather_station": "00110072",
+                "record_date__gte": "1985-01-02",
+                "record_date__lte": "1986-01-01",
+            },
+            {"weather_station": "unknown"},
+        ]
+        with self.assertNumQueries(1):
+            res = self.client.post(url, {"queries": queries}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = res.json()["results"]
+        self.assertEqual([len(result["results"]) for result in results], [1, 2, 0])
+        self.assertEqual(results[1]["record_date__gte"], "1985-01-02")
+        self.assertFalse(any(result["truncated"] for result in results))
+
+        listed = self.client.get(
+            reverse("weather:index"), {"weather_station": "00110187"}
+        )
+        self.assertEqual(results[0]["results"], listed.json()["results"])
+
+        with self.settings(WEATHER_BATCH_MAX_ROWS=4):
+            res = self.client.post(url, {"queries": queries[:2]}, format="json")
+        results = res.json()["results"]
+        self.assertEqual([len(result["results"]) for result in results], [1, 2])
+        with self.settings(WEATHER_BATCH_MAX_ROWS=2):
+            res = self.client.post(url, {"queries": queries[1:]}, format="json")
+        results = res.json()["results"]
+        self.assertEqual(
+            [(len(result["results"]), result["truncated"]) for result in results],
+            [(1, True), (0, False)],
+        )
+        self.assertEqual(results[0]["results"][0]["record_date"], "1985-01-02")
+
+        res = self.client.post(url, {"queries": []}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.post(
+            url,
+            {"queries": [{**queries[1], "record_date__lte": "1985-01-01"}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_yield(self):
+        """Test yearly yields are joined to stats, with station correlations"""
+        load_crop_yield([(1985, 225447), (1986, 208944)])
+        compute_yield_correlations()
+        res = self.client.get(reverse("weather:yield"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (row["year"], row["grain_yield"], row["stations"])
+                for row in res.data["years"]
+            ],
+            [(1985, 225447, 2), (1986, 208944, 1)],
+        )
+        self.assertAlmostEqual(res.data["years"][1]["mean_max_temp_avg"], 1.1)
+        self.assertEqual(
+            res.data["correlations"][0],
+            {
+                "weather_station": "00110072",
+                "years": 2,
+                "max_temp_avg": None,
+                "min_temp_avg": None,
+                "total_precip": None,
+            },
+        )
+
+        res = self.client.get(reverse("weather:yield"), {"weather_station": "00110187"})
+        self.assertEqual([row["year"] for row in res.data["years"]], [1985])
+        self.assertEqual(
+            [row["weather_station"] for row in res.data["correlations"]], ["00110187"]
+        )
+
+    def test_list_weather_stats(self):
+        """Test only the current stats generation is listed"""
+        rebuild_weather_stats()
+        res = self.client.get(reverse("weather:weather_stats"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 4)
+        self.assertNotIn("generation", res.data["results"][0])
+
+    async def test_async_views_match_sync_views(self):
+        """Test the async views give the JSON of the DRF list views"""
+        client = AsyncClient()
+        for name, params in (
+            ("index", {"page_size": 2, "page": 2}),
+            (
+                "index",
+                {"weather_station__in": "00110072", "record_date__gte": "1986-01-01"},
+            ),
+            ("weather_stats", {"year__lte": 1985}),
+        ):
+            res = await client.get(reverse(f"weather:{name}_async"), params)
+            expected = await sync_to_async(self.client.get)(
+                reverse(f"weather:{name}"), params
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            # Page links only differ by the path of the view.
+            content = res.content.replace(b"async/", b"")
+            self.assertEqual(json.loads(content), expected.json())
+
+        res = await client.get(reverse("weather:index_async"), {"page": 9})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = await client.get(reverse("weather:index_async"), {"record_date": "x"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_values_list_matches_serializer(self):
+        """Test the fast path renders exactly the serializer output"""
+        for queryset, serializer, values_serializer in (
+            (
+                WeatherDetails.objects.all(),
+                WeatherDetailsSerializer,
+                WeatherDetailsValuesSerializer,
+            ),
+            (
+                WeatherStats.objects.current(),
+                WeatherStatsDetailsSerializer,
+                WeatherStatsValuesSerializer,
+            ),
+        ):
+            rows = values_serializer.values_list(queryset)
+            self.assertEqual(
+                ORJSONRenderer().render(values_serializer.to_representation(rows)),
+                JSONRenderer().render(serializer(queryset, many=True).data),
+            )
@@ -1,19 +1,71 @@
 """Url Patterns for api endpoint `api/weather/`.
 """
 # Django Libraries
+from django.db.transaction import non_atomic_requests
 from django.urls import path
 
 # Project Libraries
-from weather.views import WeatherDetailsView, WeatherStatsDetailsView
+from weather.async_views import AsyncWeatherDetailsView, AsyncWeatherStatsView
+from weather.views import (
+    WeatherAggregateView,
+    WeatherBatchView,
+    WeatherDetailsView,
+    WeatherExportView,
+    WeatherStatsDetailsView,
+    WeatherStatsExportView,
+    WeatherYieldView,
+)
 
 
 app_name = "weather"
 
+# The endpoints are read only, batch queries included. Cached responses are
+# served without a transaction so they never reach the database, and exports
+# stream after the view has returned.
 urlpatterns = [
-    path("", WeatherDetailsView.as_view(actions={"get": "list"}), name="index"),
+    path(
+        "",
+        non_atomic_requests(WeatherDetailsView.as_view(actions={"get": "list"})),
+        name="index",
+    ),
+    path(
+        "async/",
+        non_atomic_requests(AsyncWeatherDetailsView.as_view()),
+        name="index_async",
+    ),
+    path(
+        "export/",
+        non_atomic_requests(WeatherExportView.as_view()),
+        name="export",
+    ),
+    path(
+        "aggregate/",
+        non_atomic_requests(WeatherAggregateView.as_view()),
+        name="aggregate",
+    ),
+    path(
+        "batch/",
+        non_atomic_requests(WeatherBatchView.as_view()),
+        name="batch",
+    ),
     path(
         "stats/",
-        WeatherStatsDetailsView.as_view(actions={"get": "list"}),
+        non_atomic_requests(WeatherStatsDetailsView.as_view(actions={"get": "list"})),
         name="weather_stats",
     ),
+    path(
+        "stats/async/",
+        non_atomic_requests(AsyncWeatherStatsView.as_view()),
+        name="weather_stats_async",
+    ),
+    path(
+        "stats/export/",
+        non_atomic_requests(WeatherStatsExportView.as_view()),
+        name="stats_export",
+    ),
+    path(
+        "yield/",
+        non_atomic_requests(WeatherYieldView.as_view()),
+        name="yield",
+    ),
 ]
@@ -2,24 +2,166 @@
 # Standard Library
 import logging
 
+from itertools import islice
+
+# Django Libraries
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
 # 3rd Party Libraries
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.mixins import ListModelMixin
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 # Project Libraries
-from core.models import WeatherDetails, WeatherStats
-from weather.serializer import WeatherDetailsSerializer, WeatherStatsDetailsSerializer
+from core.models import (
+    MaterializedWeatherStats,
+    WeatherDetails,
+    WeatherStats,
+    YieldCorrelation,
+)
+from weather.aggregate_weather_data import DEFAULT_METRICS, aggregate_weather_details
+from weather.arrow_export import (
+    DEFAULT_BATCH_SIZE,
+    WEATHER_DETAILS_COLUMNS,
+    WEATHER_STATS_COLUMNS,
+    arrow_schema,
+    iter_record_batches,
+)
+from weather.batch_weather_data import WeatherQuery, batch_weather_details
+from weather.cache import response_version
+from weather.crop_yield_data import METRICS, yearly_yield_queryset
+from weather.filters import WeatherDetailsFilter, WeatherStatsFilter
+from weather.pagination import WeatherDetailsPagination
+from weather.renderers import (
+    ArrowStreamRenderer,
+    CSVRenderer,
+    NDJSONRenderer,
+    ORJSONRenderer,
+    ParquetRenderer,
+)
+from weather.serializer import (
+    WeatherAggregateSerializer,
+    WeatherBatchSerializer,
+    WeatherDetailsSerializer,
+    WeatherDetailsValuesSerializer,
+    WeatherStatsDetailsSerializer,
+    WeatherStatsValuesSerializer,
+)
 
 
 logger = logging.getLogger("corteva_api")
 
 
-class WeatherDetailsView(ReadOnlyModelViewSet):
+class CachedListMixin:
+    """Cache rendered JSON list responses until the dataset changes.
+
+    Responses are cached under the normalized query and the current dataset
+    generation, which `ingest_weather_data` and `analyze_weather` bump when
+    they finish, so repeated queries are served with a single read of the
+    generation. Responses carry a strong `ETag` and `Last-Modified` bound to
+    the generation, conditional requests get a `304` before any lookup.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return super().list(request, *args, **kwargs)
+        version = response_version(request, type(self).__name__)
+        response = get_conditional_response(
+            request, etag=version.etag, last_modified=version.last_modified
+        )
+        if response is None:
+            response = self.cached_list(version.cache_key, request, *args, **kwargs)
+        response["ETag"] = version.etag
+        response["Last-Modified"] = http_date(version.last_modified)
+        return response
+
+    def cached_list(self, key, request, *args, **kwargs):
+        """Return the response cached under `key`, caching it on a miss."""
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        def cache_response(response):
+            if response.status_code == 200:
+                cached = (response.content, response["Content-Type"])
+                cache.set(key, cached, settings.WEATHER_API_CACHE_TIMEOUT)
+
+        response = super().list(request, *args, **kwargs)
+        response.add_post_render_callback(cache_response)
+        return response
+
+
+class ValuesListMixin:
+    """Serve JSON list pages straight from `values_list` rows.
+
+    Pages rendered as JSON skip model instances and `serializer_class`, the
+    rows are represented by `values_serializer` with the same output. Other
+    renderers, like the browsable API, go through `serializer_class`.
+
+    JSON pages also accept:
+        1. `?fields=record_date,max_temp`: Only select and return these fields.
+        2. `?shape=columns`: Return one list per field instead of one object
+           per record, e.g. `{"record_date": [...], "max_temp": [...]}`.
+    """
+
+    values_serializer = None
+    fields_query_param = "fields"
+    shape_query_param = "shape"
+    shapes = ("records", "columns")
+
+    def get_selected_fields(self, request):
+        """Return the output fields requested with `?fields=`, if any."""
+        fields = request.query_params.get(self.fields_query_param, "")
+        return [name.strip() for name in fields.split(",") if name.strip()]
+
+    def get_shape(self, request):
+        """Return the response shape requested with `?shape=`."""
+        shape = request.query_params.get(self.shape_query_param, self.shapes[0])
+        if shape not in self.shapes:
+            raise ValidationError(
+                {self.shape_query_param: [f"Expected one of {', '.join(self.shapes)}."]}
+            )
+        return shape
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer is None or not isinstance(
+            request.accepted_renderer, JSONRenderer
+        ):
+            return super().list(request, *args, **kwargs)
+        fields = self.get_selected_fields(request)
+        represent = (
+            self.values_serializer.to_columns
+            if self.get_shape(request) == "columns"
+            else self.values_serializer.to_representation
+        )
+        queryset = self.values_serializer.values_list(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        page = self.paginate_queryset(queryset)
+        data = represent(queryset if page is None else page, fields)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class WeatherDetailsView(CachedListMixin, ValuesListMixin, ReadOnlyModelViewSet):
     """Get the `WeatherDetails` details.
 
     1. GET `api/weather/`: List all `WeatherDetails` stored in local database.
+    2. GET `api/weather/?pagination=keyset`: Walk them page by page with cursors.
+    3. GET `api/weather/?weather_station__in=00110072,00113335&record_date__gte=
+       1985-01-01&record_date__lte=1985-12-31`: Records of stations over a range.
 
     See Also:
         1. https://docs.djangoproject.com/en/4.0/ref/contrib/auth/#fields
@@ -28,18 +170,255 @@ class WeatherDetailsView(ReadOnlyModelViewSet):
 
     permission_classes = [AllowAny]
     lookup_fields = ("weather_station", "record_date")
-    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    pagination_class = WeatherDetailsPagination
+    queryset = WeatherDetails.objects.select_related(
+        "station", "created_batch", "updated_batch"
+    )
+    http_method_names = ["get"]
+    serializer_class = WeatherDetailsSerializer
+    values_serializer = WeatherDetailsValuesSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = WeatherDetailsFilter
+
+
+class WeatherStatsBackendMixin:
+    """Read stats from the backend selected by `settings.WEATHER_STATS_BACKEND`."""
+
+    def get_queryset(self):
+        if settings.WEATHER_STATS_BACKEND == "materialized_view":
+            return MaterializedWeatherStats.objects.all()
+        return super().get_queryset()
+
+
+class WeatherExportView(GenericAPIView):
+    """Export the filtered `WeatherDetails` in a single streamed response.
+
+    1. GET `api/weather/export/`: All `WeatherDetails` as CSV.
+    2. GET `api/weather/export/?format=ndjson`: As newline delimited JSON.
+    3. GET `api/weather/export/?format=arrow`: As an Arrow IPC stream.
+    4. GET `api/weather/export/?format=parquet`: As a Parquet file.
+
+    Accepts the filters of `WeatherDetailsView`. Records are read in chunks
+    of `chunk_size` through a server-side cursor and written out as they
+    are read, so memory use does not grow with the size of the export.
+    Arrow and Parquet are written from columnar record batches of
+    `batch_size` rows instead.
+    """
+
+    permission_classes = [AllowAny]
     queryset = WeatherDetails.objects.all()
     http_method_names = ["get"]
     serializer_class = WeatherDetailsSerializer
+    values_serializer = WeatherDetailsValuesSerializer
+    arrow_columns = WEATHER_DETAILS_COLUMNS
+    renderer_classes = [
+        CSVRenderer,
+        NDJSONRenderer,
+        ArrowStreamRenderer,
+        ParquetRenderer,
+    ]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = WeatherDetailsFilter
+    pagination_class = None
+    chunk_size = 2000
+    batch_size = DEFAULT_BATCH_SIZE
+    file_name = "weather"
+
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        queryset = self.filter_queryset(self.get_queryset())
+        if getattr(renderer, "columnar", False):
+            content = renderer.stream_batches(
+                iter_record_batches(queryset, self.arrow_columns, self.batch_size),
+                arrow_schema(self.arrow_columns),
+            )
+        else:
+            rows = self.values_serializer.values_list(queryset).iterator(
+                chunk_size=self.chunk_size
+            )
+            fields = [name for name, _ in self.values_serializer.fields]
+            content = renderer.stream(self.represent(rows), fields)
+        response = StreamingHttpResponse(content, content_type=renderer.media_type)
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{self.file_name}.{renderer.format}"'
+        return response
+
+    def represent(self, rows):
+        """Yield the representation of `rows`, converted a chunk at a time."""
+        for chunk in iter(lambda: list(islice(rows, self.chunk_size)), []):
+            yield from self.values_serializer.to_representation(chunk)
+
+
+class WeatherStatsExportView(WeatherStatsBackendMixin, WeatherExportView):
+    """Export the filtered `WeatherStats` in a single streamed response.
+
+    1. GET `api/weather/stats/export/`: All `WeatherStats` as CSV.
+
+    Supports the formats of `WeatherExportView` and the filters of
+    `WeatherStatsDetailsView`.
+    """
+
+    queryset = WeatherStats.objects.current()
+    serializer_class = WeatherStatsDetailsSerializer
+    values_serializer = WeatherStatsValuesSerializer
+    arrow_columns = WEATHER_STATS_COLUMNS
+    filterset_class = WeatherStatsFilter
+    file_name = "weather_stats"
+
+
+class WeatherAggregateView(CachedListMixin, ListModelMixin, GenericAPIView):
+    """Aggregate the filtered `WeatherDetails` on the fly.
+
+    1. GET `api/weather/aggregate/?group_by=station,year`: Yearly stats of
+       every station, like `WeatherStats` without running `analyze_weather`.
+    2. GET `api/weather/aggregate/?group_by=month&weather_station=00110072&
+       metrics=max_temp_avg,precip_sum`: Monthly climatology of a station.
+
+    Groups by any of `station`, `year`, `month` and `doy` (day of the year)
+    and computes `<measurement>_<aggregate>` metrics, where measurement is
+    one of `max_temp`, `min_temp`, `precip` and aggregate one of `avg`, `min`,
+    `max`, `sum`, `count`. Missing measurements are excluded. Accepts the
+    filters of `WeatherDetailsView`, responses are cached per query.
+    """
+
+    permission_classes = [AllowAny]
+    queryset = WeatherDetails.objects.all()
+    http_method_names = ["get"]
+    serializer_class = WeatherAggregateSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ("weather_station", "record_date")
+    filterset_class = WeatherDetailsFilter
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    group_by_query_param = "group_by"
+    metrics_query_param = "metrics"
+
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
+    def get_query_list(self, param, default=()):
+        """Return the comma separated values of the query parameter `param`."""
+        values = self.request.query_params.get(param, "")
+        return [value.strip() for value in values.split(",") if value.strip()] or list(
+            default
+        )
 
-class WeatherStatsDetailsView(ReadOnlyModelViewSet):
+    def filter_queryset(self, queryset):
+        try:
+            return aggregate_weather_details(
+                super().filter_queryset(queryset),
+                self.get_query_list(self.group_by_query_param, ["station"]),
+                self.get_query_list(self.metrics_query_param, DEFAULT_METRICS),
+            )
+        except ValueError as error:
+            raise ValidationError({"detail": [str(error)]})
+
+
+class WeatherBatchView(GenericAPIView):
+    """Get the `WeatherDetails` of many queries in one request.
+
+    1. POST `api/weather/batch/` with
+       `{"queries": [{"weather_station": "00110072", "record_date__gte":
+       "1985-01-01", "record_date__lte": "1985-12-31"}, ...]}`.
+
+    Every query is answered by the same SQL query, results are returned in
+    query order as `{"results": [{**query, "results": [...], "truncated":
+    false}, ...]}` with records represented as in `WeatherDetailsView`,
+    without pagination. A request returns at most
+    `settings.WEATHER_BATCH_MAX_ROWS` records, shared evenly between its
+    queries; `truncated` queries continue from the day after their last
+    record.
+    """
+
+    permission_classes = [AllowAny]
+    http_method_names = ["post"]
+    serializer_class = WeatherBatchSerializer
+    values_serializer = WeatherDetailsValuesSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queries = serializer.validated_data["queries"]
+        limit = max(settings.WEATHER_BATCH_MAX_ROWS // len(queries), 1)
+        results = batch_weather_details(
+            [WeatherQuery(**query) for query in queries], limit
+        )
+        return Response(
+            {
+                "results": [
+                    {
+                        **query,
+                        "results": self.values_serializer.to_representation(
+                            result.rows
+                        ),
+                        "truncated": result.truncated,
+                    }
+                    for query, result in zip(serializer.data["queries"], results)
+                ]
+            }
+        )
+
+
+class YieldListMixin:
+    """List the yearly yields and yield correlations of the filtered stats."""
+
+    def list(self, request, *args, **kwargs):
+        stats = self.filter_queryset(self.get_queryset())
+        correlations = YieldCorrelation.objects.filter(
+            weather_station__in=stats.values("weather_station")
+        ).values("weather_station", "years", *METRICS)
+        return Response(
+            {
+                "years": list(yearly_yield_queryset(stats)),
+                "correlations": list(correlations),
+            }
+        )
+
+
+class WeatherYieldView(
+    WeatherStatsBackendMixin, CachedListMixin, YieldListMixin, GenericAPIView
+):
+    """Get the `CropYield` alongside the `WeatherStats`.
+
+    1. GET `api/weather/yield/`: Yield of every year with the stats averaged
+       across stations, and the correlation of the stats of every station
+       with the yield.
+    2. GET `api/weather/yield/?weather_station=00110072&year__gte=1990`: Yield
+       with the stats of a station over a range of years.
+
+    Years are joined to the stats aggregated in the same SQL query, under
+    `mean_<metric>`. Correlations are Pearson coefficients computed by
+    `ingest_yield_data` and `analyze_weather` over every year with a yield,
+    null with fewer than 3 years. Accepts the filters of
+    `WeatherStatsDetailsView`, correlations are listed for the stations of
+    the filtered stats. Responses are cached per query.
+    """
+
+    permission_classes = [AllowAny]
+    queryset = WeatherStats.objects.current()
+    http_method_names = ["get"]
+    serializer_class = WeatherAggregateSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = WeatherStatsFilter
+
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+
+class WeatherStatsDetailsView(
+    WeatherStatsBackendMixin, CachedListMixin, ValuesListMixin, ReadOnlyModelViewSet
+):
     """Get the `WeatherStats` details.
 
     1. GET `api/weather/stats`: List all `WeatherStats` stored in local database.
+    2. GET `api/weather/stats?weather_station__in=00110072,00113335&year__gte=1990`:
+       Stats of stations over a range of years.
+
+    Stats are read from the `WeatherStats` table, or from the materialized view
+    when `settings.WEATHER_STATS_BACKEND` is `materialized_view`.
 
     See Also:
         1. https://docs.djangoproject.com/en/4.0/ref/contrib/auth/#fields
@@ -49,8 +428,10 @@ class WeatherStatsDetailsView(ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     lookup_fields = ("weather_station", "year")
     pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
-    queryset = WeatherStats.objects.all()
+    queryset = WeatherStats.objects.current()
     http_method_names = ["get"]
     serializer_class = WeatherStatsDetailsSerializer
+    values_serializer = WeatherStatsValuesSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ("weather_station", "year")
+    filterset_class = WeatherStatsFilter